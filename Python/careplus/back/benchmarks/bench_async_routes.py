@@ -0,0 +1,190 @@
+"""Benchmark: ruta síncrona (threadpool) vs ruta asíncrona con 500+ conexiones concurrentes.
+
+PostgREST/GoTrue se simulan con un transporte httpx que responde tras una latencia fija,
+así que el resultado mide solo el modelo de concurrencia de la API:
+
+- **sync**: réplica de la versión anterior: handler ``def`` (threadpool de ~40 hilos),
+  ``create_client`` por petición, ``auth.get_user`` remoto y ``.execute()`` bloqueante.
+- **async**: la app real (``main.app``) con ``async def``, cliente compartido y
+  verificación local del JWT.
+
+Además mide la latencia de ``GET /`` mientras la carga está en curso.
+
+Uso (desde ``back/``):
+    python -m benchmarks.bench_async_routes --concurrency 500 --requests 2000 --latency 0.05
+"""
+
+import os
+
+os.environ.setdefault('PROD_SUPABASE_KEY', 'bench')
+os.environ.setdefault('PROD_SUPABASE_URL', 'http://supabase.bench')
+os.environ.setdefault('PROD_SUPABASE_PUBLIC_API_KEY', 'bench')
+os.environ.setdefault('PROD_SUPABASE_SERVICE_ROLE_KEY', 'bench')
+os.environ.setdefault('TEST_SUPABASE_KEY', 'bench')
+os.environ.setdefault('TEST_SUPABASE_URL', 'http://supabase.bench')
+os.environ.setdefault('TEST_SUPABASE_JWT_SECRET', 'bench-secret')
+os.environ.setdefault('FASTAPI_ENV', 'local')
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import jwt
+from fastapi import FastAPI
+from supabase import create_client, ClientOptions
+
+from src._settings import settings
+from src.database import init_client_factory, close_client_factory
+
+PATIENTS = [
+    {
+        'id': f'00000000-0000-0000-0000-{i:012d}',
+        'first_name': 'Paciente',
+        'last_name': str(i),
+        'date_of_birth': '1990-01-01',
+        'gender': 'otro',
+        'document_type': 'cedula',
+        'document_number': f'DOC-{i}',
+        'is_active': True,
+    }
+    for i in range(20)
+]
+
+WATERMARK = '2026-01-01T00:00:00+00:00'
+
+USER = {
+    'id': 'bench-user',
+    'aud': 'authenticated',
+    'app_metadata': {},
+    'user_metadata': {},
+    'created_at': '2026-01-01T00:00:00Z',
+}
+
+
+def _mock_response(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith('/auth/v1/user'):
+        return httpx.Response(200, json=USER)
+    if request.url.path.endswith('/rpc/table_watermark'):
+        # Marca de los GET condicionales de los listados
+        return httpx.Response(200, content=json.dumps(WATERMARK), headers={'content-type': 'application/json'})
+    return httpx.Response(200, content=json.dumps(PATIENTS), headers={'content-type': 'application/json'})
+
+
+def _token() -> str:
+    return jwt.encode(
+        {'sub': USER['id'], 'aud': 'authenticated', 'iat': int(time.time()), 'exp': int(time.time()) + 3600},
+        settings.supabase_jwt_secrets[0],
+        algorithm='HS256',
+    )
+
+
+def build_sync_app(latency: float) -> FastAPI:
+    """Réplica del camino síncrono original."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return _mock_response(request)
+
+    app = FastAPI()
+
+    @app.get('/')
+    def home():
+        return {'status': 'OK'}
+
+    @app.get('/patients/')
+    def get_patients(token: str):
+        http = httpx.Client(transport=httpx.MockTransport(handler))
+        options = ClientOptions(httpx_client=http)
+        options.headers['Authorization'] = f'Bearer {token}'
+        client = create_client(settings.supabase_url, settings.supabase_key, options)
+        client.auth.get_user(token)
+        return client.table('patients').select('*').eq('is_active', True).order('created_at', desc=True).execute().data
+
+    return app
+
+
+def build_async_app(latency: float) -> FastAPI:
+    """La app real con el cliente compartido apuntando a un PostgREST simulado."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return _mock_response(request)
+
+    init_client_factory(transport=httpx.MockTransport(handler))
+
+    import main
+    return main.app
+
+
+async def run_load(app: FastAPI, total: int, concurrency: int, token: str) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    probes: list[float] = []
+    errors: list[str] = []
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://api.bench', limits=limits, timeout=None) as client:
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(
+                    '/patients/',
+                    params={'token': token},
+                    headers={'Authorization': f'Bearer {token}'},
+                )
+                latencies.append(time.perf_counter() - started)
+                if not response.is_success:
+                    errors.append(f'{response.status_code} {response.text[:200]}')
+
+        async def probe():
+            await asyncio.sleep(0.05)
+            for _ in range(10):
+                started = time.perf_counter()
+                await client.get('/')
+                probes.append(time.perf_counter() - started)
+                await asyncio.sleep(0.02)
+
+        started = time.perf_counter()
+        await asyncio.gather(probe(), *(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    if errors:
+        # Los tiempos de respuestas con error no miden nada
+        raise RuntimeError(f"{len(errors)}/{total} requests failed, first: {errors[0]}")
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'seconds': round(elapsed, 3),
+        'req_per_s': round(total / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 1),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        'health_p50_ms': round(statistics.median(probes) * 1000, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    token = _token()
+
+    results = {
+        'sync': await run_load(build_sync_app(args.latency), args.requests, args.concurrency, token),
+        'async': await run_load(build_async_app(args.latency), args.requests, args.concurrency, token),
+    }
+    await close_client_factory()
+
+    print(f"concurrency={args.concurrency} upstream_latency={args.latency * 1000:.0f}ms")
+    for mode, result in results.items():
+        print(f"{mode:>6}: {result}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
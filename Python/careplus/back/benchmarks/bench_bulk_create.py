@@ -0,0 +1,125 @@
+"""Benchmark: alta de pacientes fila a fila (``POST /patients/``) vs ``POST /patients/bulk``.
+
+Se ejecuta contra un Supabase local (``supabase start``) con las migraciones aplicadas.
+Las peticiones pasan por las rutas reales (``PATIENTS_ROUTER`` sobre ASGI, con validación
+y serialización) y el contexto de autenticación usa el cliente service_role
+(TEST_SUPABASE_URL / TEST_SUPABASE_SERVICE_ROLE_KEY). Los pacientes sintéticos llevan
+``document_number`` con prefijo ``BENCH-BULK-`` y se borran con ``--cleanup``.
+
+- **single**: ``--rows`` peticiones ``POST /patients/`` con ``--concurrency`` en vuelo.
+- **bulk**: ``POST /patients/bulk`` con ``--bulk-size`` registros por petición
+  (``BULK_BATCH_SIZE`` filas por INSERT).
+
+Uso (desde ``back/``):
+    python -m benchmarks.bench_bulk_create --rows 5000 --concurrency 16 --bulk-size 1000
+    python -m benchmarks.bench_bulk_create --cleanup
+"""
+
+import os
+
+os.environ.setdefault('FASTAPI_ENV', 'local')
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+
+from routers.patients import PATIENTS_ROUTER
+from src.database import SupabaseClient, init_client_factory, close_client_factory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+
+PREFIX = 'BENCH-BULK-'
+
+
+def _patients(label: str, count: int) -> list[dict]:
+    run = uuid.uuid4().hex[:8]
+    return [
+        {
+            'first_name': 'Paciente',
+            'last_name': f'Bulk {i}',
+            'date_of_birth': '1985-06-15',
+            'gender': ('masculino', 'femenino', 'otro')[i % 3],
+            'document_number': f'{PREFIX}{label}-{run}-{i}',
+            'city': 'Santiago',
+        }
+        for i in range(count)
+    ]
+
+
+def build_app() -> FastAPI:
+    admin = SupabaseClient.generate_admin_client()
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=admin, user=None, token='bench')
+    return app
+
+
+async def single(client: httpx.AsyncClient, rows: list[dict], concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def post(row: dict):
+        nonlocal failures
+        async with semaphore:
+            response = await client.post('/patients/', json=row)
+            failures += response.status_code != 201
+
+    started = time.perf_counter()
+    await asyncio.gather(*(post(row) for row in rows))
+    elapsed = time.perf_counter() - started
+    return {'requests': len(rows), 'failed': failures, 'seconds': round(elapsed, 2), 'rows_per_s': round(len(rows) / elapsed)}
+
+
+async def bulk(client: httpx.AsyncClient, rows: list[dict], bulk_size: int) -> dict:
+    failures = 0
+    requests = 0
+
+    started = time.perf_counter()
+    for start in range(0, len(rows), bulk_size):
+        response = await client.post('/patients/bulk', json=rows[start:start + bulk_size])
+        response.raise_for_status()
+        failures += response.json()['failed']
+        requests += 1
+    elapsed = time.perf_counter() - started
+    return {'requests': requests, 'failed': failures, 'seconds': round(elapsed, 2), 'rows_per_s': round(len(rows) / elapsed)}
+
+
+async def cleanup() -> None:
+    admin = SupabaseClient.generate_admin_client()
+    await admin.table('patients').delete(returning='minimal').like('document_number', f'{PREFIX}%').execute()
+    print("benchmark patients removed")
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_client_factory()
+    try:
+        if args.cleanup:
+            await cleanup()
+            return
+
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=None) as client:
+            results = {
+                'single': await single(client, _patients('single', args.rows), args.concurrency),
+                'bulk': await bulk(client, _patients('bulk', args.rows), args.bulk_size),
+            }
+
+        print(f"rows={args.rows} concurrency={args.concurrency} bulk_size={args.bulk_size}")
+        for name, result in results.items():
+            print(f"{name:>7}: {result}")
+        print(f"speedup: {results['bulk']['rows_per_s'] / results['single']['rows_per_s']:.1f}x")
+    finally:
+        await close_client_factory()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=16, help="Peticiones individuales en vuelo")
+    parser.add_argument('--bulk-size', type=int, default=1000, help="Registros por petición bulk")
+    parser.add_argument('--cleanup', action='store_true')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,153 @@
+"""Benchmark: listado sin límite vs OFFSET vs paginación por cursor sobre 1M pacientes.
+
+Se ejecuta contra un Supabase local (``supabase start``) con las migraciones aplicadas,
+usando el cliente service_role (TEST_SUPABASE_URL / TEST_SUPABASE_SERVICE_ROLE_KEY).
+Los pacientes sintéticos llevan ``document_number`` con prefijo ``BENCH-`` y se borran
+con ``--cleanup``.
+
+Consultas medidas (``patients`` activos, orden ``created_at DESC``):
+
+- **unbounded**: la consulta anterior (``select('*')`` sin límite). PostgREST la corta
+  en ``max_rows`` (1000 en ``config.toml``) pero Postgres ordena la tabla completa.
+- **offset_deep**: página de 50 filas con ``OFFSET`` en la posición ``--deep``.
+- **keyset_first** / **keyset_deep**: ``paginate`` en la primera página y con un cursor
+  en la posición ``--deep``.
+
+Uso (desde ``back/``):
+    python -m benchmarks.bench_pagination --seed 1000000 --deep 900000 --repeat 20
+    python -m benchmarks.bench_pagination --cleanup
+"""
+
+import os
+
+os.environ.setdefault('FASTAPI_ENV', 'local')
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.database import SupabaseClient, init_client_factory, close_client_factory
+from src.utils.database import paginate, encode_cursor
+
+PREFIX = 'BENCH-'
+PAGE_SIZE = 50
+
+
+def _rows(start: int, count: int, now: datetime) -> list[dict]:
+    return [
+        {
+            'first_name': 'Paciente',
+            'last_name': f'Bench {i}',
+            'date_of_birth': '1990-01-01',
+            'gender': ('masculino', 'femenino', 'otro')[i % 3],
+            'document_type': 'cedula',
+            'document_number': f'{PREFIX}{i}',
+            'city': 'Santo Domingo',
+            'address': 'Calle Falsa 123, Ensanche Piantini',
+            'allergies': 'Ninguna conocida',
+            'created_at': (now - timedelta(seconds=i)).isoformat(),
+            'is_active': True,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+async def seed(total: int, batch: int, concurrency: int) -> None:
+    admin = SupabaseClient.generate_admin_client()
+    now = datetime.now(timezone.utc)
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    async def insert(start: int):
+        async with semaphore:
+            await admin.table('patients').insert(
+                _rows(start, min(batch, total - start), now), returning='minimal'
+            ).execute()
+
+    await asyncio.gather(*(insert(start) for start in range(0, total, batch)))
+    print(f"seeded {total} patients in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    admin = SupabaseClient.generate_admin_client()
+    await admin.table('patients').delete(returning='minimal').like('document_number', f'{PREFIX}%').execute()
+    print("benchmark patients removed")
+
+
+async def _timed(repeat: int, run) -> dict:
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await run()
+        samples.append(time.perf_counter() - started)
+
+    samples.sort()
+    return {
+        'rows': rows,
+        'p50_ms': round(statistics.median(samples) * 1000, 1),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+    }
+
+
+async def measure(deep: int, repeat: int) -> dict:
+    admin = SupabaseClient.generate_admin_client()
+
+    def base():
+        return admin.table('patients').select('*').eq('is_active', True)
+
+    # Cursor equivalente a la posición `deep` (preparación, no se mide)
+    anchor = await admin.table('patients').select('id, created_at').eq('is_active', True).order(
+        'created_at', desc=True
+    ).order('id', desc=True).range(deep - 1, deep - 1).execute()
+    cursor = encode_cursor(anchor.data[0]['created_at'], anchor.data[0]['id'])
+
+    async def unbounded():
+        return len((await base().order('created_at', desc=True).execute()).data)
+
+    async def offset_deep():
+        query = base().order('created_at', desc=True).order('id', desc=True).range(deep, deep + PAGE_SIZE - 1)
+        return len((await query.execute()).data)
+
+    async def keyset_first():
+        return len((await paginate(base(), 'created_at', PAGE_SIZE))['items'])
+
+    async def keyset_deep():
+        return len((await paginate(base(), 'created_at', PAGE_SIZE, cursor))['items'])
+
+    return {
+        'unbounded': await _timed(repeat, unbounded),
+        'offset_deep': await _timed(repeat, offset_deep),
+        'keyset_first': await _timed(repeat, keyset_first),
+        'keyset_deep': await _timed(repeat, keyset_deep),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_client_factory()
+    try:
+        if args.cleanup:
+            await cleanup()
+            return
+        if args.seed:
+            await seed(args.seed, args.batch, args.concurrency)
+
+        results = await measure(args.deep, args.repeat)
+        print(f"page_size={PAGE_SIZE} deep={args.deep} repeat={args.repeat}")
+        for name, result in results.items():
+            print(f"{name:>13}: {result}")
+    finally:
+        await close_client_factory()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, default=0, help="Pacientes a insertar antes de medir")
+    parser.add_argument('--batch', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--deep', type=int, default=900_000, help="Posición de la página profunda")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--cleanup', action='store_true')
+    asyncio.run(main(parser.parse_args()))
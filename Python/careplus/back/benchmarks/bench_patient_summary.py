@@ -0,0 +1,182 @@
+"""Benchmark: ``v_patient_summary`` con JOIN en abanico vs contadores por paciente.
+
+Se ejecuta contra un Supabase local (``supabase start``) con el cliente service_role
+(TEST_SUPABASE_URL / TEST_SUPABASE_SERVICE_ROLE_KEY). Siembra pacientes "crónicos" con
+muchas consultas, diagnósticos y tratamientos (``document_number`` con prefijo
+``BENCH-SUMMARY-``; se borran con ``--cleanup``) y mide:
+
+- **one_patient**: el resumen de un paciente crónico (``eq('patient_id', ...)``).
+- **page**: una página de 50 resúmenes ordenados por ``created_at DESC``.
+
+Para comparar, se mide la misma base antes y después de la migración
+``20260217000001_create_patient_counters``:
+
+    supabase db reset --version 20260216000001
+    python -m benchmarks.bench_patient_summary --seed 200 --label join
+    supabase migration up
+    python -m benchmarks.bench_patient_summary --label counters --verify
+
+``--verify`` comprueba que los contadores coinciden con ``count=exact`` de cada tabla.
+
+Uso (desde ``back/``):
+    python -m benchmarks.bench_patient_summary --seed 200 --consultations 300 --diagnostics 100 --treatments 200
+    python -m benchmarks.bench_patient_summary --cleanup
+"""
+
+import os
+
+os.environ.setdefault('FASTAPI_ENV', 'local')
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.database import SupabaseClient, init_client_factory, close_client_factory
+
+PREFIX = 'BENCH-SUMMARY-'
+PAGE_SIZE = 50
+BATCH = 1000
+
+
+def _patient(i: int) -> dict:
+    return {
+        'first_name': 'Paciente',
+        'last_name': f'Crónico {i}',
+        'date_of_birth': '1960-01-01',
+        'gender': ('masculino', 'femenino', 'otro')[i % 3],
+        'document_type': 'cedula',
+        'document_number': f'{PREFIX}{i}',
+        'is_active': True,
+    }
+
+
+def _children(patient_id: str, consultations: int, diagnostics: int, treatments: int) -> dict[str, list[dict]]:
+    return {
+        'consultations': [{'patient_id': patient_id, 'reason': f'Control {i}'} for i in range(consultations)],
+        'diagnostics': [{'patient_id': patient_id, 'name': f'Diagnóstico {i}'} for i in range(diagnostics)],
+        'treatments': [{'patient_id': patient_id, 'name': f'Tratamiento {i}'} for i in range(treatments)],
+    }
+
+
+async def seed(total: int, consultations: int, diagnostics: int, treatments: int, concurrency: int) -> None:
+    admin = SupabaseClient.generate_admin_client()
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    response = await admin.table('patients').insert([_patient(i) for i in range(total)]).execute()
+
+    async def insert(table: str, rows: list[dict]):
+        async with semaphore:
+            await admin.table(table).insert(rows, returning='minimal').execute()
+
+    tasks = []
+    for patient in response.data:
+        for table, rows in _children(patient['id'], consultations, diagnostics, treatments).items():
+            tasks.extend(insert(table, rows[start:start + BATCH]) for start in range(0, len(rows), BATCH))
+
+    await asyncio.gather(*tasks)
+    print(
+        f"seeded {total} patients x ({consultations} consultations, {diagnostics} diagnostics, "
+        f"{treatments} treatments) in {time.perf_counter() - started:.1f}s"
+    )
+
+
+async def cleanup() -> None:
+    admin = SupabaseClient.generate_admin_client()
+    # ON DELETE CASCADE borra consultas, diagnósticos y tratamientos
+    await admin.table('patients').delete(returning='minimal').like('document_number', f'{PREFIX}%').execute()
+    print("benchmark patients removed")
+
+
+async def _timed(repeat: int, run) -> dict:
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await run()
+        samples.append(time.perf_counter() - started)
+
+    samples.sort()
+    return {
+        'rows': rows,
+        'p50_ms': round(statistics.median(samples) * 1000, 1),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+    }
+
+
+async def _bench_patient_ids() -> list[str]:
+    admin = SupabaseClient.generate_admin_client()
+    response = await admin.table('patients').select('id').like('document_number', f'{PREFIX}%').execute()
+    return [row['id'] for row in response.data]
+
+
+async def measure(repeat: int) -> dict:
+    admin = SupabaseClient.generate_admin_client()
+    patient_id = (await _bench_patient_ids())[0]
+
+    async def one_patient():
+        response = await admin.table('v_patient_summary').select('*').eq('patient_id', patient_id).execute()
+        return len(response.data)
+
+    async def page():
+        response = await admin.table('v_patient_summary').select('*').order(
+            'created_at', desc=True
+        ).limit(PAGE_SIZE).execute()
+        return len(response.data)
+
+    return {
+        'one_patient': await _timed(repeat, one_patient),
+        'page': await _timed(repeat, page),
+    }
+
+
+async def verify() -> int:
+    '''Compare the summary totals with exact counts; return the number of mismatches'''
+
+    admin = SupabaseClient.generate_admin_client()
+    mismatches = 0
+
+    for patient_id in await _bench_patient_ids():
+        summary = (await admin.table('v_patient_summary').select('*').eq('patient_id', patient_id).single().execute()).data
+        for table in ('consultations', 'diagnostics', 'treatments'):
+            exact = (await admin.table(table).select('id', count='exact', head=True).eq('patient_id', patient_id).execute()).count
+            if summary[f'total_{table}'] != exact:
+                mismatches += 1
+                print(f"mismatch {patient_id} {table}: summary={summary[f'total_{table}']} exact={exact}")
+
+    return mismatches
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_client_factory()
+    try:
+        if args.cleanup:
+            await cleanup()
+            return
+        if args.seed:
+            await seed(args.seed, args.consultations, args.diagnostics, args.treatments, args.concurrency)
+
+        results = await measure(args.repeat)
+        print(f"label={args.label} page_size={PAGE_SIZE} repeat={args.repeat}")
+        for name, result in results.items():
+            print(f"{name:>12}: {result}")
+
+        if args.verify:
+            print(f"mismatches: {await verify()}")
+    finally:
+        await close_client_factory()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, default=0, help="Pacientes crónicos a insertar antes de medir")
+    parser.add_argument('--consultations', type=int, default=300)
+    parser.add_argument('--diagnostics', type=int, default=100)
+    parser.add_argument('--treatments', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--label', default='current', help="Etiqueta de la medición (join / counters)")
+    parser.add_argument('--verify', action='store_true', help="Comparar los contadores con count=exact")
+    parser.add_argument('--cleanup', action='store_true')
+    asyncio.run(main(parser.parse_args()))
@@ -3,47 +3,79 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
 from contextlib import asynccontextmanager
-# import redis.asyncio as asyncredis
 
-from routers import ROUTERS #, api_identifier
-
-# from fastapi_limiter import FastAPILimiter
-# from fastapi_limiter.depends import RateLimiter
+from routers import ROUTERS
+from src.database import init_client_factory, close_client_factory
+from src._cache import close_redis
+from src._settings import settings
+from src.utils import reference_catalog
+from src.utils.mail import email_dispatcher
+from src.utils.importer import import_jobs
+from src.utils.stats import dashboard_stats, patient_counters
+from src.utils.realtime import realtime
+from src.utils.otp import get_otp_store, TableOtpStore, verification_code_purger
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# @asynccontextmanager
-# async def lifespan(_: FastAPI):
-#     redis_connection = asyncredis.from_url("redis://localhost:6379", encoding='utf8')
-#     await FastAPILimiter.init(redis_connection, identifier=api_identifier)
-#     yield
-#     await FastAPILimiter.close()
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Clientes de Supabase compartidos sobre un pool de conexiones keep-alive
+    init_client_factory()
+    # Tablas de referencia en memoria (roles, tipos de documento)
+    await reference_catalog.start(settings.reference_catalog_refresh_seconds)
+    # Workers de envío de correos (OTP)
+    await email_dispatcher.start()
+    # Refresco incremental de los rollups del dashboard (/stats)
+    await dashboard_stats.start(settings.stats_refresh_seconds, settings.stats_full_rebuild_at)
+    # Corrección diaria de los desvíos de patient_counters (v_patient_summary)
+    await patient_counters.start(settings.patient_counters_reconcile_at)
+    # Purga por lotes de los códigos OTP usados o expirados de verification_codes
+    if isinstance(get_otp_store(), TableOtpStore):
+        await verification_code_purger.start(
+            settings.otp_purge_interval_seconds, settings.otp_purge_batch_size, settings.otp_purge_max_batches
+        )
+    yield
+    await verification_code_purger.stop()
+    await patient_counters.stop()
+    await dashboard_stats.stop()
+    await import_jobs.stop()
+    await email_dispatcher.stop()
+    await reference_catalog.stop()
+    await close_client_factory()
+    await close_redis()
 
 app: FastAPI = FastAPI(
     title="POMARAY API",
     description="API of POMARAY",
     version="0.1.0",
     docs_url="/docs",
-    #lifespan=lifespan
+    lifespan=lifespan
 )
 
+ALLOWED_ORIGINS = ["https://careplus-front.vercel.app", "http://localhost:3000"]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["https://careplus-front.vercel.app", "http://localhost:3000"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Validadores de los GET condicionales (If-None-Match / If-Modified-Since)
+    expose_headers=["ETag", "Last-Modified"],
 )
 
-@app.get("/")#, dependencies=[Depends(RateLimiter(times=2, seconds=30))])
-def home():
+@app.get("/")
+async def home():
     return {"status": "OK"}
 
 for router in ROUTERS:
     app.include_router(router)
 
+# Cambios de los recursos clínicos en tiempo real (socket.io en /ws/socket.io)
+realtime.mount(app, ALLOWED_ORIGINS)
+
 # if __name__ == "__main__":
 #     import uvicorn
     
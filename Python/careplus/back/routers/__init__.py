@@ -3,6 +3,13 @@ from .patients import PATIENTS_ROUTER
 from .diagnostics import DIAGNOSTICS_ROUTER
 from .treatments import TREATMENTS_ROUTER
 from .queries import CONSULTATIONS_ROUTER
+from .metrics import METRICS_ROUTER
+from .catalog import CATALOG_ROUTER
+from .medical_history import MEDICAL_HISTORY_ROUTER
+from .export import EXPORT_ROUTER
+from .imports import IMPORTS_ROUTER
+from .vitals import VITALS_ROUTER
+from .stats import STATS_ROUTER
 from fastapi.routing import APIRouter
 
 ROUTERS: list[APIRouter] = [
@@ -11,4 +18,11 @@ ROUTERS: list[APIRouter] = [
     DIAGNOSTICS_ROUTER,
     TREATMENTS_ROUTER,
     CONSULTATIONS_ROUTER,
+    MEDICAL_HISTORY_ROUTER,
+    EXPORT_ROUTER,
+    IMPORTS_ROUTER,
+    VITALS_ROUTER,
+    STATS_ROUTER,
+    CATALOG_ROUTER,
+    METRICS_ROUTER,
 ]
\ No newline at end of file
@@ -1,8 +1,10 @@
 from fastapi import HTTPException, Depends
+from typing import Optional
 from .. import AUTH_ROUTER
 from src.database.classes import AuthContext
 from src.database.supabase import SupabaseClient
-from src.utils import get_auth_context
+from src.utils import get_auth_context, revoke_user_tokens, get_user_roles, invalidate_user_roles
+from src.utils.response_cache import response_cache
 
 
 # Jerarquía de roles: menor número = mayor rango
@@ -19,20 +21,18 @@ SUPERADMIN_DELETABLE_ROLES = {'admin', 'medico', 'enfermero', 'recepcionista'}
 ADMIN_DELETABLE_ROLES = {'medico', 'enfermero', 'recepcionista'}
 
 
-def _get_role_name(auth: AuthContext, user_id: str) -> str:
-    """Obtiene el nombre del rol de un usuario dado."""
-    result = auth.client.table('user_roles').select(
-        'roles(name)'
-    ).eq('user_id', user_id).single().execute()
+async def _get_role_names(auth: AuthContext, caller_id: str, target_user_id: str) -> tuple[str, Optional[str]]:
+    """Obtiene en una sola consulta (o desde caché) el rol del caller y del usuario objetivo."""
+    roles = await get_user_roles(auth, [caller_id, target_user_id])
 
-    if not result.data:
+    if caller_id not in roles:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    return result.data['roles']['name']
+    return roles[caller_id], roles.get(target_user_id)
 
 
 @AUTH_ROUTER.delete('/users/{target_user_id}')
-def delete_user(
+async def delete_user(
     target_user_id: str,
     auth: AuthContext = Depends(get_auth_context)
 ) -> dict:
@@ -51,7 +51,7 @@ def delete_user(
         if caller_id == target_user_id:
             raise HTTPException(status_code=403, detail="No puedes eliminarte a ti mismo")
 
-        caller_role = _get_role_name(auth, caller_id)
+        caller_role, target_role = await _get_role_names(auth, caller_id, target_user_id)
 
         if caller_role == 'superadmin':
             deletable_roles = SUPERADMIN_DELETABLE_ROLES
@@ -63,8 +63,9 @@ def delete_user(
                 detail="No tienes permisos para eliminar usuarios."
             )
 
-        # 2. Obtener el rol del usuario objetivo
-        target_role = _get_role_name(auth, target_user_id)
+        # 2. Validar el rol del usuario objetivo
+        if target_role is None:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
         if target_role not in deletable_roles:
             raise HTTPException(
@@ -78,7 +79,7 @@ def delete_user(
         # 4. Desvincular created_by en tablas que referencian auth.users(id)
         for table in ['patients', 'consultations', 'diagnostics', 'treatments', 'medical_history']:
             try:
-                admin_client.table(table).update(
+                await admin_client.table(table).update(
                     {'created_by': None}
                 ).eq('created_by', target_user_id).execute()
                 print(f"[DELETE] Nullified created_by in {table}")
@@ -87,7 +88,7 @@ def delete_user(
 
         # 5. Eliminar registro de user_roles
         try:
-            result = admin_client.table('user_roles').delete().eq(
+            result = await admin_client.table('user_roles').delete().eq(
                 'user_id', target_user_id
             ).execute()
             print(f"[DELETE] user_roles delete result: {result}")
@@ -97,12 +98,17 @@ def delete_user(
 
         # 6. Eliminar usuario de Supabase Auth (puede fallar si es un usuario seed)
         try:
-            SupabaseClient.admin_delete_user(target_user_id)
+            await SupabaseClient.admin_delete_user(target_user_id)
             print(f"[DELETE] Auth user deleted")
         except Exception as ex:
             print(f"[DELETE] Auth user not found (seed data?): {ex}")
             # El usuario puede no existir en auth.users (ej: datos seed)
 
+        # 7. Rechazar los tokens que el usuario eliminado aún tenga vigentes
+        revoke_user_tokens(target_user_id)
+        await invalidate_user_roles(target_user_id)
+        await response_cache.invalidate('users', target_user_id)
+
         return {
             "success": True,
             "message": "Usuario eliminado exitosamente"
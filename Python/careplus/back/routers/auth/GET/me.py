@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import Optional
 from .. import AUTH_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
 from src.database.classes import AuthContext
 
 
@@ -19,7 +20,7 @@ class UserMeResponse(BaseModel):
 
 
 @AUTH_ROUTER.get('/me')
-def get_me(auth: AuthContext = Depends(get_auth_context)) -> UserMeResponse:
+async def get_me(auth: AuthContext = Depends(get_auth_context)) -> UserMeResponse:
     """Obtiene la información del usuario autenticado, incluyendo su rol."""
 
     try:
@@ -27,14 +28,17 @@ def get_me(auth: AuthContext = Depends(get_auth_context)) -> UserMeResponse:
         if not user_id:
             raise HTTPException(status_code=401, detail="Usuario no autenticado")
 
-        result = auth.client.table('v_users').select('*').eq(
-            'user_id', user_id
-        ).single().execute()
+        async def load() -> dict:
+            result = await auth.client.table('v_users').select('*').eq(
+                'user_id', user_id
+            ).single().execute()
+            return result.data
 
-        if not result.data:
+        data = await response_cache.fetch('users', await cache_scope(auth), load, item_id=user_id)
+
+        if not data:
             raise HTTPException(status_code=404, detail="Perfil de usuario no encontrado")
 
-        data = result.data
         return UserMeResponse(
             user_id=data['user_id'],
             email=data['email'],
@@ -2,7 +2,8 @@ from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 from .. import AUTH_ROUTER
-from src.utils import get_auth_context
+from src.utils import get_auth_context, get_user_role
+from src.utils.response_cache import response_cache
 from src.database.classes import AuthContext
 
 
@@ -19,7 +20,7 @@ class UserListItem(BaseModel):
 
 
 @AUTH_ROUTER.get('/users')
-def get_users(auth: AuthContext = Depends(get_auth_context)) -> list[UserListItem]:
+async def get_users(auth: AuthContext = Depends(get_auth_context)) -> list[UserListItem]:
     """Obtiene la lista de usuarios. Solo admin y superadmin pueden acceder."""
 
     try:
@@ -28,14 +29,11 @@ def get_users(auth: AuthContext = Depends(get_auth_context)) -> list[UserListIte
             raise HTTPException(status_code=401, detail="Usuario no autenticado")
 
         # Verificar que el caller es admin o superadmin
-        caller = auth.client.table('user_roles').select(
-            'roles(name)'
-        ).eq('user_id', user_id).single().execute()
+        caller_role = await get_user_role(auth, user_id)
 
-        if not caller.data:
+        if not caller_role:
             raise HTTPException(status_code=403, detail="No tienes un rol asignado")
 
-        caller_role = caller.data['roles']['name']
         if caller_role not in ('admin', 'superadmin'):
             raise HTTPException(
                 status_code=403,
@@ -43,9 +41,13 @@ def get_users(auth: AuthContext = Depends(get_auth_context)) -> list[UserListIte
             )
 
         # Obtener todos los usuarios desde la vista
-        result = auth.client.table('v_users').select('*').order(
-            'created_at', desc=True
-        ).execute()
+        async def load() -> list:
+            result = await auth.client.table('v_users').select('*').order(
+                'created_at', desc=True
+            ).execute()
+            return result.data
+
+        users = await response_cache.fetch('users', caller_role, load)
 
         return [
             UserListItem(
@@ -59,7 +61,7 @@ def get_users(auth: AuthContext = Depends(get_auth_context)) -> list[UserListIte
                 is_active=u.get('is_active', True),
                 created_at=u.get('created_at'),
             )
-            for u in result.data
+            for u in users
         ]
 
     except HTTPException:
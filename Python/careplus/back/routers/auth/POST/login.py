@@ -1,16 +1,20 @@
-from fastapi import Response, HTTPException, Request
+from fastapi import Depends, Response, HTTPException, Request
 from pydantic import BaseModel
 from src.database import SupabaseClient
 from src.database.classes import LoginResponse
 from src.utils import generate_otp, store_otp, send_otp_email
+from src.utils.rate_limit import rate_limit, body_identifier
 from . import AUTH_ROUTER
 
 class LoginRequest(BaseModel):
     email: str
     password: str
 
-@AUTH_ROUTER.post('/login')
-def login(data: LoginRequest, request: Request, response: Response) -> LoginResponse:
+@AUTH_ROUTER.post('/login', dependencies=[
+    Depends(rate_limit('auth.login:ip', times=10, seconds=60)),
+    Depends(rate_limit('auth.login:email', times=5, seconds=300, identifier=body_identifier('email'))),
+])
+async def login(data: LoginRequest, request: Request, response: Response) -> LoginResponse:
     """Paso 1 del login: verifica credenciales y envía código OTP al correo.
 
     # Args:
@@ -23,14 +27,14 @@ def login(data: LoginRequest, request: Request, response: Response) -> LoginResp
     
     try:
         # Verificar credenciales con Supabase
-        result = SupabaseClient.sign_in({
+        result = await SupabaseClient.sign_in({
             "email": data.email,
             "password": data.password,
         })
         
         # Generar y almacenar código OTP
         code = generate_otp()
-        store_otp(
+        await store_otp(
             user_id=result.user_id,
             email=result.email,
             code=code,
@@ -38,8 +42,8 @@ def login(data: LoginRequest, request: Request, response: Response) -> LoginResp
             refresh_token=result.refresh_token
         )
         
-        # Enviar código por correo
-        send_otp_email(
+        # Encolar el correo: lo envían los workers en segundo plano
+        await send_otp_email(
             to_email=result.email,
             code=code
         )
@@ -1,7 +1,8 @@
-from fastapi import HTTPException
+from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 from src.database import SupabaseClient
 from src.database.classes import LoginResponse
+from src.utils.rate_limit import rate_limit
 from . import AUTH_ROUTER
 
 
@@ -9,8 +10,10 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
-@AUTH_ROUTER.post('/refresh')
-def refresh_token(data: RefreshRequest) -> LoginResponse:
+@AUTH_ROUTER.post('/refresh', dependencies=[
+    Depends(rate_limit('auth.refresh:ip', times=30, seconds=60)),
+])
+async def refresh_token(data: RefreshRequest) -> LoginResponse:
     """Renueva el access_token usando un refresh_token válido.
 
     # Args:
@@ -21,7 +24,7 @@ def refresh_token(data: RefreshRequest) -> LoginResponse:
     """
     
     try:
-        result = SupabaseClient.refresh_session(data.refresh_token)
+        result = await SupabaseClient.refresh_session(data.refresh_token)
         
         return LoginResponse(
             token=result.access_token,
@@ -2,7 +2,8 @@ from fastapi import HTTPException, Depends
 from typing import Optional
 from src.database import SupabaseClient
 from src.database.classes import AuthContext
-from src.utils import get_auth_context
+from src.utils import get_auth_context, get_user_role, reference_catalog
+from src.utils.response_cache import response_cache
 from src.api.models import SignUpRequest, SignUpResponse
 from . import AUTH_ROUTER
 
@@ -12,21 +13,19 @@ ADMIN_ALLOWED_ROLES = {'medico', 'enfermero', 'recepcionista'}
 SUPERADMIN_ALLOWED_ROLES = {'medico', 'enfermero', 'recepcionista', 'admin'}
 
 
-def _get_caller_role(auth: AuthContext) -> str:
-    """Obtiene el rol del usuario autenticado desde la tabla user_roles + roles."""
+async def _get_caller_role(auth: AuthContext) -> str:
+    """Obtiene el rol del usuario autenticado (user_roles + roles, cacheado)."""
     try:
         user_id = auth.user.user.id if auth.user and auth.user.user else None
         if not user_id:
             raise HTTPException(status_code=401, detail="Usuario no autenticado")
 
-        result = auth.client.table('user_roles').select(
-            'roles(name)'
-        ).eq('user_id', user_id).single().execute()
+        role = await get_user_role(auth, user_id)
 
-        if not result.data:
+        if not role:
             raise HTTPException(status_code=403, detail="No tienes un rol asignado")
 
-        return result.data['roles']['name']
+        return role
     except HTTPException:
         raise
     except Exception:
@@ -34,7 +33,7 @@ def _get_caller_role(auth: AuthContext) -> str:
 
 
 @AUTH_ROUTER.post('/sign_up')
-def sign_up(data: SignUpRequest, auth: AuthContext = Depends(get_auth_context)) -> SignUpResponse:
+async def sign_up(data: SignUpRequest, auth: AuthContext = Depends(get_auth_context)) -> SignUpResponse:
     """Crea un nuevo usuario. Solo accesible por admin y superadmin.
 
     - **Admin**: puede crear usuarios con rol 'medico', 'enfermero', 'recepcionista'
@@ -46,7 +45,7 @@ def sign_up(data: SignUpRequest, auth: AuthContext = Depends(get_auth_context))
     """
 
     # 1. Verificar el rol del usuario que hace la petición
-    caller_role = _get_caller_role(auth)
+    caller_role = await _get_caller_role(auth)
 
     if caller_role == 'superadmin':
         allowed_roles = SUPERADMIN_ALLOWED_ROLES
@@ -68,28 +67,27 @@ def sign_up(data: SignUpRequest, auth: AuthContext = Depends(get_auth_context))
 
     try:
         # 3. Crear el usuario en Supabase Auth (usando service_role key)
-        result = SupabaseClient.admin_create_user(
+        result = await SupabaseClient.admin_create_user(
             email=data.email,
             password=data.password,
         )
 
-        # 4. Buscar el role_id correspondiente
-        role_result = auth.client.table('roles').select('id').eq(
-            'name', data.role
-        ).single().execute()
+        # 4. Buscar el role_id correspondiente (catálogo en memoria)
+        role_id = await reference_catalog.role_id(auth, data.role)
 
-        if not role_result.data:
+        if not role_id:
             raise HTTPException(status_code=400, detail=f"Rol '{data.role}' no encontrado en el sistema")
 
         # 5. Asignar el rol en la tabla user_roles
-        auth.client.table('user_roles').insert({
+        await auth.client.table('user_roles').insert({
             'user_id': result.user_id,
-            'role_id': role_result.data['id'],
+            'role_id': role_id,
             'full_name': data.full_name,
             'specialty': data.specialty,
             'license_number': data.license_number,
             'phone': data.phone,
         }).execute()
+        await response_cache.invalidate('users')
 
         return SignUpResponse(
             success=True,
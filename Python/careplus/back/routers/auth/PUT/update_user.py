@@ -1,7 +1,9 @@
 from fastapi import HTTPException, Depends
+from typing import Optional
 from .. import AUTH_ROUTER
 from src.database.classes import AuthContext
-from src.utils import get_auth_context
+from src.utils import get_auth_context, revoke_user_tokens, get_user_roles, invalidate_user_roles, reference_catalog
+from src.utils.response_cache import response_cache
 from src.api.models import UpdateUserRequest
 
 
@@ -23,20 +25,18 @@ SUPERADMIN_ASSIGNABLE_ROLES = {'admin', 'medico', 'enfermero', 'recepcionista'}
 ADMIN_ASSIGNABLE_ROLES = {'medico', 'enfermero', 'recepcionista'}
 
 
-def _get_role_name(auth: AuthContext, user_id: str) -> str:
-    """Obtiene el nombre del rol de un usuario dado."""
-    result = auth.client.table('user_roles').select(
-        'roles(name)'
-    ).eq('user_id', user_id).single().execute()
+async def _get_role_names(auth: AuthContext, caller_id: str, target_user_id: str) -> tuple[str, Optional[str]]:
+    """Obtiene en una sola consulta (o desde caché) el rol del caller y del usuario objetivo."""
+    roles = await get_user_roles(auth, [caller_id, target_user_id])
 
-    if not result.data:
+    if caller_id not in roles:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    return result.data['roles']['name']
+    return roles[caller_id], roles.get(target_user_id)
 
 
 @AUTH_ROUTER.put('/users/{target_user_id}')
-def update_user(
+async def update_user(
     target_user_id: str,
     data: UpdateUserRequest,
     auth: AuthContext = Depends(get_auth_context)
@@ -53,7 +53,7 @@ def update_user(
         if not caller_id:
             raise HTTPException(status_code=401, detail="Usuario no autenticado")
 
-        caller_role = _get_role_name(auth, caller_id)
+        caller_role, target_role = await _get_role_names(auth, caller_id, target_user_id)
 
         if caller_role == 'superadmin':
             editable_roles = SUPERADMIN_EDITABLE_ROLES
@@ -67,8 +67,9 @@ def update_user(
                 detail="No tienes permisos para editar usuarios."
             )
 
-        # 2. Obtener el rol actual del usuario objetivo
-        target_role = _get_role_name(auth, target_user_id)
+        # 2. Validar el rol actual del usuario objetivo
+        if target_role is None:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
         if target_role not in editable_roles:
             raise HTTPException(
@@ -85,16 +86,12 @@ def update_user(
                     detail=f"No tienes permisos para asignar el rol '{data.role}'. "
                            f"Roles permitidos: {', '.join(sorted(assignable_roles))}"
                 )
-            # Buscar el role_id del nuevo rol
-            role_result = auth.client.table('roles').select('id').eq(
-                'name', data.role
-            ).single().execute()
+            # Buscar el role_id del nuevo rol (catálogo en memoria)
+            new_role_id = await reference_catalog.role_id(auth, data.role)
 
-            if not role_result.data:
+            if not new_role_id:
                 raise HTTPException(status_code=400, detail=f"Rol '{data.role}' no encontrado en el sistema")
 
-            new_role_id = role_result.data['id']
-
         # 4. Construir el objeto de actualización para user_roles
         update_data = {}
         if data.full_name is not None:
@@ -114,9 +111,15 @@ def update_user(
             raise HTTPException(status_code=400, detail="No se proporcionaron datos para actualizar")
 
         # 5. Actualizar
-        auth.client.table('user_roles').update(
+        await auth.client.table('user_roles').update(
             update_data
         ).eq('user_id', target_user_id).execute()
+        await invalidate_user_roles(target_user_id)
+        await response_cache.invalidate('users', target_user_id)
+
+        # 6. Un usuario desactivado no debe seguir usando sus tokens vigentes
+        if data.is_active is False:
+            revoke_user_tokens(target_user_id)
 
         return {
             "success": True,
@@ -0,0 +1,16 @@
+from fastapi import Depends
+from .. import CATALOG_ROUTER
+from src.utils import get_auth_context, reference_catalog
+from src.database.classes import AuthContext
+
+
+@CATALOG_ROUTER.get('/roles')
+async def get_roles(auth: AuthContext = Depends(get_auth_context)) -> list[dict]:
+    """Obtener los roles y sus permisos (desde el catálogo en memoria)"""
+    return reference_catalog.roles
+
+
+@CATALOG_ROUTER.get('/document-types')
+async def get_document_types(auth: AuthContext = Depends(get_auth_context)) -> list[dict]:
+    """Obtener los tipos de documento (desde el catálogo en memoria)"""
+    return reference_catalog.document_types
@@ -0,0 +1,2 @@
+from .. import CATALOG_ROUTER
+from . import refresh_catalog
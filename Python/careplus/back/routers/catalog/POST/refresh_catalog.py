@@ -0,0 +1,23 @@
+from fastapi import Depends, HTTPException
+from .. import CATALOG_ROUTER
+from src.utils import get_auth_context, get_user_role, reference_catalog
+from src.database.classes import AuthContext
+
+
+@CATALOG_ROUTER.post('/refresh')
+async def refresh_catalog(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Recarga el catálogo de tablas de referencia. Solo admin y superadmin."""
+
+    user_id = auth.user.user.id if auth.user and auth.user.user else None
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Usuario no autenticado")
+
+    if await get_user_role(auth, user_id) not in ('admin', 'superadmin'):
+        raise HTTPException(status_code=403, detail="No tienes permisos para recargar el catálogo")
+
+    try:
+        await reference_catalog.refresh()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al recargar el catálogo: {str(e)}")
+
+    return reference_catalog.metrics()
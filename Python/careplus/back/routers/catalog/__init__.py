@@ -0,0 +1,9 @@
+from fastapi.routing import APIRouter
+
+CATALOG_ROUTER: APIRouter = APIRouter(
+    prefix="/catalog",
+    tags=["Catalog"]
+)
+
+from . import GET
+from . import POST
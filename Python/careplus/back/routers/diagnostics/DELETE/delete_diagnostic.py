@@ -1,21 +1,27 @@
 from fastapi import Depends, HTTPException
 from .. import DIAGNOSTICS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 
 
 @DIAGNOSTICS_ROUTER.delete('/{diagnostic_id}', status_code=204)
-def delete_diagnostic(
+async def delete_diagnostic(
     diagnostic_id: str,
     auth: AuthContext = Depends(get_auth_context)
 ):
     """Eliminar un diagnóstico"""
     try:
-        response = auth.client.table('diagnostics').delete().eq('id', diagnostic_id).execute()
+        response = await auth.client.table('diagnostics').delete().eq('id', diagnostic_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Diagnóstico no encontrado")
         
+        await response_cache.invalidate('diagnostics', diagnostic_id)
+        await response_cache.invalidate('patients', response.data[0]['patient_id'], lists=False)
+        await realtime.publish('diagnostics', 'delete', response.data[0])
+
         return None
     except HTTPException:
         raise
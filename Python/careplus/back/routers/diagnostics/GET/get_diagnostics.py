@@ -1,37 +1,65 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, Request, Response
 from .. import DIAGNOSTICS_ROUTER
 from src.utils import get_auth_context
+from src.utils.database import paginate, select_fields, View
+from src.utils.response_cache import response_cache, cache_scope, fetch_row, list_validators, list_not_modified, not_modified
+from src._settings import settings
 from src.database.classes import AuthContext
-from src.database.models import DiagnosticResponse
-from typing import Optional
+from src.database.models import DiagnosticResponse, DiagnosticSummary, Page
+from typing import Optional, Union
 
 
-@DIAGNOSTICS_ROUTER.get('/', response_model=list[DiagnosticResponse])
-def get_diagnostics(
+@DIAGNOSTICS_ROUTER.get('/', response_model=Union[Page[DiagnosticResponse], Page[DiagnosticSummary]])
+async def get_diagnostics(
+    request: Request,
+    response: Response,
     patient_id: Optional[str] = None,
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: View = 'full',
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener todos los diagnósticos, opcionalmente filtrados por paciente"""
+    """Obtener todos los diagnósticos, opcionalmente filtrados por paciente; paginado por cursor (`next_cursor`)"""
     try:
-        query = auth.client.table('diagnostics').select('*')
-        
-        if patient_id:
-            query = query.eq('patient_id', patient_id)
-        
-        response = query.order('created_at', desc=True).execute()
-        return response.data
+        selection = select_fields(DiagnosticResponse, DiagnosticSummary, fields, view)
+
+        async def load() -> dict:
+            query = auth.client.table('diagnostics').select(selection.columns)
+
+            if patient_id:
+                query = query.eq('patient_id', patient_id)
+
+            return await paginate(query, 'created_at', limit, cursor)
+
+        params = {
+            'patient_id': patient_id, 'limit': limit,
+            'cursor': cursor, 'fields': fields, 'view': view,
+        }
+        scope = await cache_scope(auth)
+
+        validators = await list_validators(auth, 'diagnostics', scope, params)
+        if list_not_modified(request, validators):
+            return not_modified(validators)
+
+        page = await response_cache.fetch('diagnostics', scope, load, params=params)
+        response.headers.update(validators)
+        return selection.respond(page, validators)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @DIAGNOSTICS_ROUTER.get('/{diagnostic_id}', response_model=DiagnosticResponse)
-def get_diagnostic(
+async def get_diagnostic(
     diagnostic_id: str,
+    request: Request,
+    response: Response,
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener un diagnóstico por ID"""
+    """Obtener un diagnóstico por ID (ETag / `If-None-Match` → 304)"""
     try:
-        response = auth.client.table('diagnostics').select('*').eq('id', diagnostic_id).single().execute()
-        return response.data
+        return await fetch_row(request, response, auth, 'diagnostics', diagnostic_id)
     except Exception:
         raise HTTPException(status_code=404, detail="Diagnóstico no encontrado")
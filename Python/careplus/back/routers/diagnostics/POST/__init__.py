@@ -1,2 +1,3 @@
 from .. import DIAGNOSTICS_ROUTER
 from . import create_diagnostic
+from . import bulk_create_diagnostics
@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import DIAGNOSTICS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import DiagnosticCreate, DiagnosticResponse
 
 
 @DIAGNOSTICS_ROUTER.post('/', response_model=DiagnosticResponse, status_code=201)
-def create_diagnostic(
+async def create_diagnostic(
     data: DiagnosticCreate,
     auth: AuthContext = Depends(get_auth_context)
 ):
@@ -17,7 +19,13 @@ def create_diagnostic(
         diagnostic_data = data.model_dump(exclude_none=True, mode='json')
         diagnostic_data['created_by'] = user_id
         
-        response = auth.client.table('diagnostics').insert(diagnostic_data).execute()
-        return response.data[0]
+        response = await auth.client.table('diagnostics').insert(diagnostic_data).execute()
+        row = response.data[0]
+
+        await response_cache.invalidate('diagnostics')
+        await response_cache.invalidate('patients', row['patient_id'], lists=False)
+        await realtime.publish('diagnostics', 'insert', row)
+        await response_cache.prime('diagnostics', await cache_scope(auth), row)
+        return row
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
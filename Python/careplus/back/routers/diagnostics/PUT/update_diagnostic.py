@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import DIAGNOSTICS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import DiagnosticUpdate, DiagnosticResponse
 
 
 @DIAGNOSTICS_ROUTER.put('/{diagnostic_id}', response_model=DiagnosticResponse)
-def update_diagnostic(
+async def update_diagnostic(
     diagnostic_id: str,
     data: DiagnosticUpdate,
     auth: AuthContext = Depends(get_auth_context)
@@ -18,12 +20,18 @@ def update_diagnostic(
         if not update_data:
             raise HTTPException(status_code=400, detail="No hay datos para actualizar")
         
-        response = auth.client.table('diagnostics').update(update_data).eq('id', diagnostic_id).execute()
+        response = await auth.client.table('diagnostics').update(update_data).eq('id', diagnostic_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Diagnóstico no encontrado")
         
-        return response.data[0]
+        row = response.data[0]
+
+        await response_cache.invalidate('diagnostics', diagnostic_id)
+        await response_cache.invalidate('patients', row['patient_id'], lists=False)
+        await realtime.publish('diagnostics', 'update', row)
+        await response_cache.prime('diagnostics', await cache_scope(auth), row)
+        return row
     except HTTPException:
         raise
     except Exception as e:
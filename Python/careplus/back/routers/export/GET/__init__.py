@@ -0,0 +1,2 @@
+from .. import EXPORT_ROUTER
+from . import export
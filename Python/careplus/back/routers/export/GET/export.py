@@ -0,0 +1,114 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from .. import EXPORT_ROUTER
+from src.utils import get_auth_context
+from src.utils.database import select_fields, iter_pages, ndjson_chunk, csv_chunk, View
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.database.models import (
+    PatientResponse, PatientSummary,
+    ConsultationResponse, ConsultationSummary,
+    DiagnosticResponse, DiagnosticSummary,
+    TreatmentResponse, TreatmentSummary,
+)
+
+logger = logging.getLogger(__name__)
+
+Resource = Literal['patients', 'consultations', 'diagnostics', 'treatments']
+ExportFormat = Literal['ndjson', 'csv']
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    model: type[BaseModel]
+    summary: type[BaseModel]
+    sort_column: str
+    filters: tuple[str, ...]
+    defaults: dict = field(default_factory=dict)
+
+
+# Mismos filtros y orden que los listados de cada recurso
+EXPORTS: dict[str, ExportSpec] = {
+    'patients': ExportSpec(PatientResponse, PatientSummary, 'created_at', ('is_active',), {'is_active': True}),
+    'consultations': ExportSpec(ConsultationResponse, ConsultationSummary, 'consultation_date', ('patient_id', 'status')),
+    'diagnostics': ExportSpec(DiagnosticResponse, DiagnosticSummary, 'created_at', ('patient_id',)),
+    'treatments': ExportSpec(TreatmentResponse, TreatmentSummary, 'created_at', ('patient_id', 'status')),
+}
+
+
+@EXPORT_ROUTER.get('/{resource}')
+async def export_resource(
+    resource: Resource,
+    format: ExportFormat = 'ndjson',
+    patient_id: Optional[str] = None,
+    status: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    fields: Optional[str] = None,
+    view: View = 'full',
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Exportar un recurso completo en NDJSON o CSV, en streaming.
+
+    Las filas se leen en páginas por cursor de ``EXPORT_CHUNK_SIZE`` y se serializan a
+    medida que llegan: la memoria usada no depende del tamaño de la tabla.
+    """
+    spec = EXPORTS[resource]
+
+    try:
+        requested = {'patient_id': patient_id, 'status': status, 'is_active': is_active}
+        unsupported = [name for name, value in requested.items() if value is not None and name not in spec.filters]
+        if unsupported:
+            raise HTTPException(status_code=400, detail=f"Filtros no válidos para {resource}: {', '.join(unsupported)}")
+
+        filters = {**spec.defaults, **{name: value for name, value in requested.items() if value is not None}}
+
+        selection = select_fields(spec.model, spec.summary, fields, view, required=('id', spec.sort_column))
+        # Columnas explícitas también en la vista completa: el CSV necesita la cabecera
+        # antes de la primera fila
+        columns = selection.fields or list(spec.model.model_fields)
+
+        def build_query():
+            query = auth.client.table(resource).select(', '.join(columns))
+            for name, value in filters.items():
+                query = query.eq(name, value)
+            return query
+
+        pages = iter_pages(build_query, spec.sort_column, settings.export_chunk_size)
+        # La primera página se lee antes de responder: los errores aún pueden ser un 4xx/5xx
+        first = await anext(pages, [])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def serialize(rows: list[dict], header: bool = False) -> bytes:
+        if format == 'csv':
+            return csv_chunk(rows, columns, header=header)
+        return ndjson_chunk(rows)
+
+    async def body():
+        yield serialize(first, header=True)
+        try:
+            async for rows in pages:
+                yield serialize(rows)
+        except Exception:
+            # Con el estado 200 ya enviado solo se puede cortar la respuesta
+            logger.exception(f"Export of {resource} interrupted")
+            raise
+
+    filename = f'{resource}-{date.today().isoformat()}.{format}'
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[format], headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Cache-Control': 'no-store',
+    })
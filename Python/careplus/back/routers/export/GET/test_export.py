@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src._settings import settings
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from .. import EXPORT_ROUTER
+
+ROWS = [
+    {'id': str(uuid.UUID(int=i + 1)), 'created_at': f'2026-02-11T10:00:{59 - i:02d}+00:00', 'first_name': f'P{i}'}
+    for i in range(5)
+]
+
+
+def _client(requests: list[httpx.Request]) -> TestClient:
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # Simula el keyset: cada página empieza después de la anterior
+        start = len(requests) * settings.export_chunk_size
+        requests.append(request)
+        rows = ROWS[start:start + int(request.url.params['limit'])]
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(EXPORT_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+    return TestClient(app)
+
+
+def test_ndjson_export_walks_keyset_pages(monkeypatch):
+    monkeypatch.setattr(settings, 'export_chunk_size', 2)
+
+    requests: list[httpx.Request] = []
+    response = _client(requests).get('/export/patients', params={'fields': 'first_name'})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert [json.loads(line)['first_name'] for line in response.text.splitlines()] == ['P0', 'P1', 'P2', 'P3', 'P4']
+
+    assert len(requests) == 3
+    assert all(r.url.params['limit'] == '3' for r in requests)
+    assert 'or' not in requests[0].url.params and 'or' in requests[1].url.params
+    assert requests[0].url.params['is_active'] == 'eq.True'
+
+
+def test_csv_export_has_header_and_rejects_foreign_filters(monkeypatch):
+    monkeypatch.setattr(settings, 'export_chunk_size', 10)
+
+    client = _client([])
+    response = client.get('/export/patients', params={'format': 'csv', 'fields': 'first_name'})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers['content-disposition'].startswith('attachment; filename="patients-')
+    assert list(rows[0]) == ['id', 'created_at', 'first_name']
+    assert len(rows) == 5
+
+    assert client.get('/export/patients', params={'status': 'activo'}).status_code == 400
+
+
+def test_export_walks_past_postgrest_max_rows(monkeypatch):
+    monkeypatch.setattr(settings, 'export_chunk_size', settings.postgrest_max_rows)
+
+    rows = [
+        {'id': str(uuid.UUID(int=i + 1)), 'created_at': f'2026-02-11T10:00:00.{999999 - i:06d}+00:00', 'first_name': f'P{i}'}
+        for i in range(2500)
+    ]
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # PostgREST recorta cualquier respuesta a max_rows, pida lo que pida el limit
+        limit = int(request.url.params['limit'])
+        start = len(requests) * (limit - 1)
+        requests.append(request)
+        page = rows[start:start + min(limit, settings.postgrest_max_rows)]
+        return httpx.Response(200, content=json.dumps(page), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(EXPORT_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    response = TestClient(app).get('/export/patients', params={'fields': 'first_name'})
+
+    assert len(response.text.splitlines()) == 2500
+    assert len(requests) == 3
+    assert all(int(r.url.params['limit']) <= settings.postgrest_max_rows for r in requests)
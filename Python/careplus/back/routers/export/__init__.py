@@ -0,0 +1,8 @@
+from fastapi.routing import APIRouter
+
+EXPORT_ROUTER: APIRouter = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+from . import GET
\ No newline at end of file
@@ -0,0 +1,2 @@
+from .. import IMPORTS_ROUTER
+from . import import_job
@@ -0,0 +1,36 @@
+from fastapi import Depends, HTTPException
+from fastapi.responses import Response
+from .. import IMPORTS_ROUTER
+from src.utils import get_auth_context
+from src.utils.importer import import_jobs
+from src.database.classes import AuthContext
+from src.database.models import ImportJob
+
+
+def _user_id(auth: AuthContext) -> str:
+    user_id = auth.user.user.id if auth.user and auth.user.user else None
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Usuario no autenticado")
+    return user_id
+
+
+@IMPORTS_ROUTER.get('/{job_id}', response_model=ImportJob)
+async def get_import_job(job_id: str, auth: AuthContext = Depends(get_auth_context)):
+    """Estado y progreso de una importación"""
+    job = import_jobs.get(job_id, _user_id(auth))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Importación no encontrada")
+    return job
+
+
+@IMPORTS_ROUTER.get('/{job_id}/rejected')
+async def get_import_rejected(job_id: str, auth: AuthContext = Depends(get_auth_context)):
+    """Filas rechazadas de una importación en CSV: número de fila, motivo y valores"""
+    rejected = import_jobs.rejected(job_id, _user_id(auth))
+    if rejected is None:
+        raise HTTPException(status_code=404, detail="Importación no encontrada")
+
+    return Response(rejected.write_csv(), media_type='text/csv; charset=utf-8', headers={
+        'Content-Disposition': f'attachment; filename="import-{job_id}-rejected.csv"',
+        'Cache-Control': 'no-store',
+    })
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import Literal, Optional
+
+import jwt
+from fastapi import Depends, HTTPException, Request, Response
+from .. import IMPORTS_ROUTER
+from src.utils import get_auth_context
+from src.utils.importer import ImportFormat, ImportSpec, ImportReference, scan_upload, missing_columns, import_jobs
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.database.models import PatientCreate, ConsultationCreate, ImportJob
+
+Resource = Literal['patients', 'consultations']
+
+IMPORTS: dict[str, ImportSpec] = {
+    'patients': ImportSpec('patients', PatientCreate, unique='document_number'),
+    # Las consultas pueden referir al paciente por su documento en vez del uuid
+    'consultations': ImportSpec('consultations', ConsultationCreate, references={
+        'patient_id': ImportReference('patient_document_number', 'patients', 'document_number'),
+    }),
+}
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    '''``exp`` claim of the access token (already verified by ``get_auth_context``)'''
+
+    try:
+        return jwt.decode(token, options={'verify_signature': False}).get('exp')
+    except jwt.PyJWTError:
+        return None
+
+
+@IMPORTS_ROUTER.post('/{resource}', response_model=ImportJob, status_code=202)
+async def import_resource(
+    resource: Resource,
+    request: Request,
+    response: Response,
+    format: ImportFormat = 'csv',
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Importar un archivo CSV o Parquet (el cuerpo de la petición) en segundo plano.
+
+    Se valida la cabecera y se responde con el trabajo; el progreso y las filas
+    rechazadas se consultan en ``GET /imports/{job_id}``.
+
+    El trabajo inserta con el token de la petición y no puede renovarlo: se rechaza
+    (401) si le quedan menos de ``import_min_token_seconds`` y, si expira durante la
+    importación, el trabajo termina en ``failed`` con un error que lo indica.
+    """
+    user_id = auth.user.user.id if auth.user and auth.user.user else None
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Usuario no autenticado")
+
+    expires_at = _token_expiry(auth.token)
+    if expires_at is not None and expires_at - time.time() < settings.import_min_token_seconds:
+        raise HTTPException(
+            status_code=401,
+            detail="El token expira antes de que la importación pueda terminar. Renuévalo en /auth/refresh y vuelve a intentarlo."
+        )
+
+    spec = IMPORTS[resource]
+    path = None
+
+    try:
+        with tempfile.NamedTemporaryFile(suffix=f'.{format}', delete=False) as file:
+            path = file.name
+            size = 0
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.import_max_bytes:
+                    raise HTTPException(status_code=413, detail=f"El archivo supera {settings.import_max_bytes} bytes")
+                # Escritura a disco fuera del event loop
+                await asyncio.to_thread(file.write, chunk)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail="El archivo está vacío")
+
+        missing = await asyncio.to_thread(lambda: missing_columns(scan_upload(path, format), spec))
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Faltan columnas obligatorias: {', '.join(missing)}")
+
+        job = import_jobs.submit(resource, spec, path, format, auth.client, user_id, expires_at)
+        # El archivo ahora es del trabajo, que lo borra al terminar
+        path = None
+
+        response.headers['Location'] = f'{IMPORTS_ROUTER.prefix}/{job.id}'
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"No se pudo leer el archivo: {str(e)}")
+    finally:
+        if path:
+            os.remove(path)
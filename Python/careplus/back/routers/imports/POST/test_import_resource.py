@@ -0,0 +1,106 @@
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src._settings import settings
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from src.utils.importer import _jobs
+from .. import IMPORTS_ROUTER
+
+CSV = (
+    'first_name,last_name,date_of_birth,gender,document_number\n'
+    'Ana,Pérez,1990-01-31,femenino,1\n'
+    'Luis,Gómez,1985-06-15,masculino,2\n'
+    'Eva,Díaz,no,femenino,3\n'
+)
+
+
+def test_import_runs_in_background_and_reports_rejections():
+    inserts: list[list[dict]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == 'GET':
+            # El documento 2 ya está registrado
+            return httpx.Response(200, content=json.dumps([{'document_number': '2'}]), headers={'content-type': 'application/json'})
+        inserts.append(json.loads(request.content))
+        return httpx.Response(201, content=b'', headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    user = SimpleNamespace(user=SimpleNamespace(id='user-1'))
+    app = FastAPI()
+    app.include_router(IMPORTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=user, token="token")
+
+    with TestClient(app) as client:
+        assert client.post('/imports/patients', content=b'first_name\nAna\n').status_code == 400
+
+        response = client.post('/imports/patients', params={'format': 'csv'}, content=CSV.encode())
+        assert response.status_code == 202
+        job_id = response.json()['id']
+        assert response.headers['location'] == f'/imports/{job_id}'
+
+        for _ in range(100):
+            job = client.get(f'/imports/{job_id}').json()
+            if job['status'] in ('completed', 'failed'):
+                break
+            time.sleep(0.02)
+
+        assert job['status'] == 'completed'
+        assert (job['total_rows'], job['inserted'], job['rejected'], job['progress']) == (3, 1, 2, 1.0)
+        # El id se genera al cargar (return=minimal), igual que en las altas masivas
+        assert all(row.pop('id') for batch in inserts for row in batch)
+        assert inserts == [[{
+            'first_name': 'Ana', 'last_name': 'Pérez', 'date_of_birth': '1990-01-31', 'gender': 'femenino',
+            'document_number': '1', 'document_type': 'cedula', 'created_by': 'user-1',
+        }]]
+
+        report = client.get(f'/imports/{job_id}/rejected').text.splitlines()
+        assert report[0].startswith('row,error')
+        assert report[1].startswith('2,document_number: ya registrado')
+        assert report[2].startswith('3,date_of_birth: valor no válido')
+
+
+def test_import_is_bounded_by_the_token_lifetime(monkeypatch):
+    inserts: list[bytes] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == 'GET':
+            return httpx.Response(200, content=b'[]', headers={'content-type': 'application/json'})
+        inserts.append(request.content)
+        return httpx.Response(201, content=b'', headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    user = SimpleNamespace(user=SimpleNamespace(id='user-1'))
+    app = FastAPI()
+    app.include_router(IMPORTS_ROUTER)
+
+    def client_for(expires_in: int) -> TestClient:
+        token = jwt.encode({'sub': 'user-1', 'exp': int(time.time()) + expires_in}, 'secret', algorithm='HS256')
+        app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token(token), user=user, token=token)
+        return TestClient(app)
+
+    # No alcanza para la importación: se rechaza antes de leer el archivo
+    response = client_for(60).post('/imports/patients', content=CSV.encode())
+    assert response.status_code == 401
+    assert '/auth/refresh' in response.json()['detail']
+
+    # El token "expira" con el trabajo en curso: falla con un error claro, sin 401 de PostgREST
+    monkeypatch.setattr(_jobs, 'TOKEN_MARGIN_SECONDS', settings.import_min_token_seconds + 120)
+    with client_for(settings.import_min_token_seconds + 60) as client:
+        job_id = client.post('/imports/patients', content=CSV.encode()).json()['id']
+
+        for _ in range(100):
+            job = client.get(f'/imports/{job_id}').json()
+            if job['status'] in ('completed', 'failed'):
+                break
+            time.sleep(0.02)
+
+    assert job['status'] == 'failed'
+    assert job['error'] == _jobs.TOKEN_EXPIRED_ERROR
+    assert inserts == []
@@ -0,0 +1,9 @@
+from fastapi.routing import APIRouter
+
+IMPORTS_ROUTER: APIRouter = APIRouter(
+    prefix="/imports",
+    tags=["Imports"]
+)
+
+from . import GET
+from . import POST
@@ -0,0 +1,2 @@
+from .. import MEDICAL_HISTORY_ROUTER
+from . import delete_medical_history
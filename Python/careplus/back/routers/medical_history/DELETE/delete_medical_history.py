@@ -0,0 +1,26 @@
+from fastapi import Depends, HTTPException
+from .. import MEDICAL_HISTORY_ROUTER
+from src.utils import get_auth_context
+from src.utils.realtime import realtime
+from src.database.classes import AuthContext
+
+
+@MEDICAL_HISTORY_ROUTER.delete('/{history_id}', status_code=204)
+async def delete_medical_history(
+    history_id: str,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Eliminar un evento del historial médico"""
+    try:
+        response = await auth.client.table('medical_history').delete().eq('id', history_id).execute()
+
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Evento de historial no encontrado")
+
+        await realtime.publish('medical_history', 'delete', response.data[0])
+
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
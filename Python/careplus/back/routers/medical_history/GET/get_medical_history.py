@@ -0,0 +1,62 @@
+from fastapi import Depends, HTTPException, Query
+from .. import MEDICAL_HISTORY_ROUTER
+from src.utils import get_auth_context
+from src.utils.database import paginate, select_fields, View
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.database.enums import EventType
+from src.database.models import MedicalHistoryResponse, MedicalHistorySummary, Page
+from typing import Optional, Union
+from datetime import date
+
+
+@MEDICAL_HISTORY_ROUTER.get('/', response_model=Union[Page[MedicalHistoryResponse], Page[MedicalHistorySummary]])
+async def get_medical_history(
+    patient_id: Optional[str] = None,
+    event_type: Optional[EventType] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: View = 'full',
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Línea de tiempo del historial médico (eventos más recientes primero), filtrable por
+    paciente, tipo de evento y rango de fechas; paginado por cursor (`next_cursor`)"""
+    try:
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(status_code=400, detail="date_from no puede ser posterior a date_to")
+
+        selection = select_fields(
+            MedicalHistoryResponse, MedicalHistorySummary, fields, view, required=('id', 'event_date')
+        )
+        query = auth.client.table('medical_history').select(selection.columns)
+
+        if patient_id:
+            query = query.eq('patient_id', patient_id)
+        if event_type:
+            query = query.eq('event_type', event_type.value)
+        if date_from:
+            query = query.gte('event_date', date_from.isoformat())
+        if date_to:
+            query = query.lte('event_date', date_to.isoformat())
+
+        return selection.respond(await paginate(query, 'event_date', limit, cursor))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@MEDICAL_HISTORY_ROUTER.get('/{history_id}', response_model=MedicalHistoryResponse)
+async def get_medical_history_event(
+    history_id: str,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Obtener un evento del historial médico por ID"""
+    try:
+        response = await auth.client.table('medical_history').select('*').eq('id', history_id).single().execute()
+        return response.data
+    except Exception:
+        raise HTTPException(status_code=404, detail="Evento de historial no encontrado")
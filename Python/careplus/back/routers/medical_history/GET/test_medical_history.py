@@ -0,0 +1,60 @@
+import json
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from .. import MEDICAL_HISTORY_ROUTER
+
+ROWS = [
+    {'id': '3f8b8f52-0d8e-4a4e-9d64-5a7f0f0c0001', 'event_date': '2026-02-10', 'title': 'Control'},
+    {'id': '3f8b8f52-0d8e-4a4e-9d64-5a7f0f0c0002', 'event_date': '2026-02-01', 'title': 'Consulta'},
+]
+
+
+def _client(requests: list[httpx.Request]) -> TestClient:
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=json.dumps(ROWS), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(MEDICAL_HISTORY_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+    return TestClient(app)
+
+
+def test_timeline_filters_and_keyset_pagination():
+
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+
+    first = client.get('/medical-history/', params={
+        'patient_id': 'p1', 'event_type': 'consulta', 'date_from': '2026-01-01',
+        'date_to': '2026-03-01', 'limit': 1, 'fields': 'title',
+    })
+
+    assert first.status_code == 200
+    params = requests[0].url.params
+    assert params['select'] == 'id,event_date,title'
+    assert params['patient_id'] == 'eq.p1'
+    assert params['event_type'] == 'eq.consulta'
+    assert params.get_list('event_date') == ['gte.2026-01-01', 'lte.2026-03-01']
+    assert params['order'] == 'event_date.desc,id.desc'
+    assert params['limit'] == '2'
+
+    cursor = first.json()['next_cursor']
+    assert cursor
+
+    client.get('/medical-history/', params={'patient_id': 'p1', 'cursor': cursor, 'fields': 'title'})
+    assert 'event_date.lt."2026-02-10"' in requests[1].url.params['or']
+
+
+def test_inverted_date_range_is_rejected():
+
+    response = _client([]).get('/medical-history/', params={'date_from': '2026-03-01', 'date_to': '2026-01-01'})
+
+    assert response.status_code == 400
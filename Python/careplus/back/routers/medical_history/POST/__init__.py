@@ -0,0 +1,2 @@
+from .. import MEDICAL_HISTORY_ROUTER
+from . import create_medical_history
@@ -0,0 +1,27 @@
+from fastapi import Depends, HTTPException
+from .. import MEDICAL_HISTORY_ROUTER
+from src.utils import get_auth_context
+from src.utils.realtime import realtime
+from src.database.classes import AuthContext
+from src.database.models import MedicalHistoryCreate, MedicalHistoryResponse
+
+
+@MEDICAL_HISTORY_ROUTER.post('/', response_model=MedicalHistoryResponse, status_code=201)
+async def create_medical_history(
+    data: MedicalHistoryCreate,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Registrar un nuevo evento en el historial médico"""
+    try:
+        user_id = auth.user.user.id if auth.user and auth.user.user else None
+
+        history_data = data.model_dump(exclude_none=True, mode='json')
+        history_data['created_by'] = user_id
+
+        response = await auth.client.table('medical_history').insert(history_data).execute()
+        row = response.data[0]
+
+        await realtime.publish('medical_history', 'insert', row)
+        return row
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,43 @@
+import json
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from src.utils.realtime import realtime
+from .. import MEDICAL_HISTORY_ROUTER
+
+ROW = {
+    'id': '3f8b8f52-0d8e-4a4e-9d64-5a7f0f0c0001', 'patient_id': 'p1', 'event_type': 'nota', 'title': 'Control',
+    'event_date': '2026-02-10', 'created_at': '2026-02-10T10:00:00+00:00', 'updated_at': '2026-02-10T10:00:00+00:00',
+}
+
+
+def test_writes_publish_medical_history_changes(monkeypatch):
+    published: list[tuple[str, str, tuple[dict, ...]]] = []
+
+    async def publish(resource, op, *rows):
+        published.append((resource, op, rows))
+
+    monkeypatch.setattr(realtime, 'publish', publish)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps([ROW]), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(MEDICAL_HISTORY_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+    client = TestClient(app)
+
+    assert client.post('/medical-history/', json={'patient_id': 'p1', 'event_type': 'nota', 'title': 'Control'}).status_code == 201
+    assert client.put(f"/medical-history/{ROW['id']}", json={'title': 'Control anual'}).status_code == 200
+    assert client.delete(f"/medical-history/{ROW['id']}").status_code == 204
+
+    assert published == [
+        ('medical_history', 'insert', (ROW,)),
+        ('medical_history', 'update', (ROW,)),
+        ('medical_history', 'delete', (ROW,)),
+    ]
@@ -0,0 +1,34 @@
+from fastapi import Depends, HTTPException
+from .. import MEDICAL_HISTORY_ROUTER
+from src.utils import get_auth_context
+from src.utils.realtime import realtime
+from src.database.classes import AuthContext
+from src.database.models import MedicalHistoryUpdate, MedicalHistoryResponse
+
+
+@MEDICAL_HISTORY_ROUTER.put('/{history_id}', response_model=MedicalHistoryResponse)
+async def update_medical_history(
+    history_id: str,
+    data: MedicalHistoryUpdate,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Actualizar un evento del historial médico"""
+    try:
+        update_data = data.model_dump(exclude_none=True, mode='json')
+
+        if not update_data:
+            raise HTTPException(status_code=400, detail="No hay datos para actualizar")
+
+        response = await auth.client.table('medical_history').update(update_data).eq('id', history_id).execute()
+
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Evento de historial no encontrado")
+
+        row = response.data[0]
+
+        await realtime.publish('medical_history', 'update', row)
+        return row
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,11 @@
+from fastapi.routing import APIRouter
+
+MEDICAL_HISTORY_ROUTER: APIRouter = APIRouter(
+    prefix="/medical-history",
+    tags=["Medical History"]
+)
+
+from . import GET
+from . import POST
+from . import PUT
+from . import DELETE
\ No newline at end of file
@@ -0,0 +1,9 @@
+from .. import METRICS_ROUTER
+from . import clients
+from . import catalog
+from . import email
+from . import cache
+from . import stats
+from . import realtime
+from . import otp_purge
+from . import patient_counters
@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.utils.response_cache import response_cache
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/cache')
+async def get_cache_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas de la caché de respuestas (aciertos, fallos e invalidaciones por recurso)"""
+    return response_cache.metrics()
@@ -0,0 +1,10 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context, reference_catalog
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/catalog')
+async def get_catalog_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas del catálogo de referencia (tamaño, última carga, tasa de aciertos)"""
+    return reference_catalog.metrics()
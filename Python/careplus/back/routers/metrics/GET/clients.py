@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.database import get_client_factory
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/clients')
+async def get_client_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas del pool de clientes de Supabase (conexiones y reutilización)"""
+    return get_client_factory().metrics()
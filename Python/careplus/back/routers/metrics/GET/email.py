@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.utils.mail import email_dispatcher
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/email')
+async def get_email_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas de la cola de correos (profundidad, envíos, reintentos, latencia)"""
+    return email_dispatcher.metrics()
@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.utils.otp import verification_code_purger
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/otp-purge')
+async def get_otp_purge_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas de la purga de códigos OTP (última ejecución, filas borradas, fallos)"""
+    return verification_code_purger.metrics()
@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.utils.stats import patient_counters
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/patient-counters')
+async def get_patient_counters_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas de la reconciliación de patient_counters (última ejecución, pacientes corregidos, fallos)"""
+    return patient_counters.metrics()
@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.utils.realtime import realtime
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/realtime')
+async def get_realtime_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas de los eventos en tiempo real (conexiones, cambios publicados, fallos)"""
+    return realtime.metrics()
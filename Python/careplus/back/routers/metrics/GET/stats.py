@@ -0,0 +1,11 @@
+from fastapi import Depends
+from .. import METRICS_ROUTER
+from src.utils import get_auth_context
+from src.utils.stats import dashboard_stats
+from src.database.classes import AuthContext
+
+
+@METRICS_ROUTER.get('/stats')
+async def get_stats_metrics(auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Métricas del refresco de los rollups del dashboard (último refresco, duración, fallos)"""
+    return dashboard_stats.metrics()
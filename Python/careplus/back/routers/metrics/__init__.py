@@ -0,0 +1,8 @@
+from fastapi.routing import APIRouter
+
+METRICS_ROUTER: APIRouter = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+from . import GET
@@ -1,23 +1,28 @@
 from fastapi import Depends, HTTPException
 from .. import PATIENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 
 
 @PATIENTS_ROUTER.delete('/{patient_id}', status_code=204)
-def delete_patient(
+async def delete_patient(
     patient_id: str,
     auth: AuthContext = Depends(get_auth_context)
 ):
     """Eliminar un paciente (soft delete: marca como inactivo)"""
     try:
-        response = auth.client.table('patients').update(
+        response = await auth.client.table('patients').update(
             {'is_active': False}
         ).eq('id', patient_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Paciente no encontrado")
         
+        await response_cache.invalidate('patients', patient_id)
+        await realtime.publish('patients', 'delete', response.data[0])
+
         return None
     except HTTPException:
         raise
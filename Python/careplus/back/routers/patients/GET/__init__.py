@@ -1,2 +1,3 @@
-
-from . import patient
\ No newline at end of file
+from . import patient
+from . import chart
+from . import vitals
@@ -0,0 +1,66 @@
+from fastapi import Depends, HTTPException, Query
+from postgrest.exceptions import APIError
+from .. import PATIENTS_ROUTER
+from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.database.classes import AuthContext
+from src.database.enums import TreatmentStatus
+from src.database.models import PatientChart
+
+# Los FK se indican explícitamente: diagnostics/treatments también relacionan
+# patients y consultations (PostgREST vería varias rutas de embebido)
+CHART_SELECT = (
+    '*, '
+    'consultations!consultations_patient_id_fkey(*), '
+    'diagnostics!diagnostics_patient_id_fkey(*), '
+    'treatments!treatments_patient_id_fkey(*)'
+)
+
+
+@PATIENTS_ROUTER.get('/{patient_id}/chart', response_model=PatientChart)
+async def get_patient_chart(
+    patient_id: str,
+    consultations_limit: int = Query(10, ge=0, le=100),
+    diagnostics_limit: int = Query(10, ge=0, le=100),
+    treatments_limit: int = Query(20, ge=0, le=100),
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Ficha del paciente en una sola consulta: datos del paciente, últimas consultas,
+    últimos diagnósticos y tratamientos activos (recursos embebidos de PostgREST)."""
+
+    async def load() -> dict:
+        response = await auth.client.table('patients').select(CHART_SELECT).eq(
+            'id', patient_id
+        ).eq(
+            'treatments.status', TreatmentStatus.activo.value
+        ).order(
+            'consultation_date', desc=True, foreign_table='consultations'
+        ).limit(
+            consultations_limit, foreign_table='consultations'
+        ).order(
+            'created_at', desc=True, foreign_table='diagnostics'
+        ).limit(
+            diagnostics_limit, foreign_table='diagnostics'
+        ).order(
+            'created_at', desc=True, foreign_table='treatments'
+        ).limit(
+            treatments_limit, foreign_table='treatments'
+        ).single().execute()
+        return response.data
+
+    try:
+        # Vista del registro del paciente: las escrituras de consultas, diagnósticos y
+        # tratamientos invalidan el registro (y con él la ficha)
+        return await response_cache.fetch('patients', await cache_scope(auth), load, item_id=patient_id, params={
+            'view': 'chart', 'consultations_limit': consultations_limit,
+            'diagnostics_limit': diagnostics_limit, 'treatments_limit': treatments_limit,
+        })
+    except HTTPException:
+        raise
+    except APIError as e:
+        # PGRST116: single() sin filas; 22P02: patient_id no es un UUID (como en get_patient)
+        if e.code in ('PGRST116', '22P02'):
+            raise HTTPException(status_code=404, detail="Paciente no encontrado")
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
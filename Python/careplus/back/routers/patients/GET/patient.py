@@ -1,38 +1,76 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, Request, Response
 from .. import PATIENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.database import paginate, select_fields, View
+from src.utils.response_cache import response_cache, cache_scope, fetch_row, list_validators, list_not_modified, not_modified
+from src._settings import settings
 from src.database.classes import AuthContext
-from src.database.models import PatientResponse
-from typing import Optional
+from src.database.models import PatientResponse, PatientSummary, Page
+from typing import Optional, Union
 
 
-@PATIENTS_ROUTER.get('/', response_model=list[PatientResponse])
-def get_patients(
+@PATIENTS_ROUTER.get('/', response_model=Union[Page[PatientResponse], Page[PatientSummary]])
+async def get_patients(
+    request: Request,
+    response: Response,
     search: Optional[str] = None,
     is_active: bool = True,
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: View = 'full',
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener todos los pacientes"""
+    """Obtener todos los pacientes, paginados por cursor (`next_cursor`).
+
+    Con ``search`` se devuelven los ``limit`` pacientes más parecidos (nombre,
+    apellido o documento, sin distinguir acentos), ordenados por similitud y sin
+    ``next_cursor``.
+    """
     try:
-        query = auth.client.table('patients').select('*').eq('is_active', is_active)
-        
-        if search:
-            query = query.or_(f"first_name.ilike.%{search}%,last_name.ilike.%{search}%,document_number.ilike.%{search}%")
-        
-        response = query.order('created_at', desc=True).execute()
-        return response.data
+        selection = select_fields(PatientResponse, PatientSummary, fields, view)
+
+        async def load() -> dict:
+            if search:
+                # search_patients: documento exacto por btree, si no similitud por trigramas
+                result = await auth.client.rpc('search_patients', {
+                    'p_query': search,
+                    'p_limit': limit,
+                    'p_is_active': is_active,
+                }, get=True).select(selection.columns).execute()
+                return {'items': result.data, 'next_cursor': None}
+
+            query = auth.client.table('patients').select(selection.columns).eq('is_active', is_active)
+            return await paginate(query, 'created_at', limit, cursor)
+
+        params = {
+            'search': search, 'is_active': is_active, 'limit': limit,
+            'cursor': cursor, 'fields': fields, 'view': view,
+        }
+        scope = await cache_scope(auth)
+
+        validators = await list_validators(auth, 'patients', scope, params)
+        if list_not_modified(request, validators):
+            return not_modified(validators)
+
+        page = await response_cache.fetch('patients', scope, load, params=params)
+        response.headers.update(validators)
+        return selection.respond(page, validators)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @PATIENTS_ROUTER.get('/{patient_id}', response_model=PatientResponse)
-def get_patient(
+async def get_patient(
     patient_id: str,
+    request: Request,
+    response: Response,
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener un paciente por ID"""
+    """Obtener un paciente por ID (ETag / `If-None-Match` → 304)"""
     try:
-        response = auth.client.table('patients').select('*').eq('id', patient_id).single().execute()
-        return response.data
+        return await fetch_row(request, response, auth, 'patients', patient_id)
     except Exception:
         raise HTTPException(status_code=404, detail="Paciente no encontrado")
\ No newline at end of file
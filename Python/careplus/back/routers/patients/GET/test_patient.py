@@ -0,0 +1,167 @@
+import json
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from .. import PATIENTS_ROUTER
+
+
+ROWS = [{'id': 'p1', 'created_at': '2026-02-11T10:00:00+00:00', 'first_name': 'José'}]
+
+
+def _client(requests: list[httpx.Request], body=ROWS) -> TestClient:
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/rpc/table_watermark'):
+            return httpx.Response(200, content=json.dumps('2026-02-11T10:00:00.5+00:00'), headers={'content-type': 'application/json'})
+        requests.append(request)
+        return httpx.Response(200, content=json.dumps(body), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+    return TestClient(app)
+
+
+def test_search_uses_ranked_rpc_instead_of_ilike():
+
+    requests: list[httpx.Request] = []
+
+    response = _client(requests).get('/patients/', params={'search': 'jose', 'limit': 10, 'fields': 'first_name'})
+
+    assert response.status_code == 200
+    assert response.json()['next_cursor'] is None
+
+    request = requests[0]
+    assert request.method == 'GET'
+    assert request.url.path.endswith('/rpc/search_patients')
+    assert request.url.params['p_query'] == 'jose'
+    assert request.url.params['p_limit'] == '10'
+    assert request.url.params['select'] == 'id,created_at,first_name'
+    assert 'ilike' not in str(request.url)
+
+
+def test_search_limit_matches_the_rpc_bound():
+
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+
+    # search_patients() acota p_limit a 200 (= pagination_max_limit)
+    assert client.get('/patients/', params={'search': 'jose', 'limit': 200, 'fields': 'first_name'}).status_code == 200
+    assert requests[0].url.params['p_limit'] == '200'
+    assert client.get('/patients/', params={'search': 'jose', 'limit': 201, 'fields': 'first_name'}).status_code == 422
+
+
+def test_listing_without_search_is_paginated():
+
+    requests: list[httpx.Request] = []
+
+    _client(requests).get('/patients/', params={'fields': 'first_name'})
+
+    assert requests[0].url.path.endswith('/patients')
+    assert requests[0].url.params['limit'] == '51'
+
+
+def test_chart_is_a_single_embedded_request():
+
+    requests: list[httpx.Request] = []
+    patient = {
+        'id': 'p1', 'first_name': 'Ana', 'last_name': 'Pérez', 'date_of_birth': '1990-01-01',
+        'gender': 'femenino', 'document_type': 'cedula', 'document_number': '001',
+        'consultations': [], 'diagnostics': [], 'treatments': [],
+    }
+
+    response = _client(requests, patient).get('/patients/p1/chart', params={'consultations_limit': 5})
+
+    assert response.status_code == 200
+    assert response.json()['treatments'] == []
+    assert len(requests) == 1
+
+    params = requests[0].url.params
+    assert 'consultations!consultations_patient_id_fkey(*)' in params['select']
+    assert params['consultations.limit'] == '5'
+    assert params['consultations.order'] == 'consultation_date.desc'
+    assert params['treatments.status'] == 'eq.activo'
+
+
+def test_chart_of_a_malformed_id_is_not_found():
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        error = {'code': '22P02', 'message': 'invalid input syntax for type uuid: "p1"', 'details': None, 'hint': None}
+        return httpx.Response(400, content=json.dumps(error), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    response = TestClient(app).get('/patients/p1/chart')
+
+    assert response.status_code == 404
+
+
+def test_if_none_match_is_answered_from_an_updated_at_probe():
+
+    requests: list[httpx.Request] = []
+    patient = {
+        'id': 'p1', 'first_name': 'Ana', 'last_name': 'Pérez', 'date_of_birth': '1990-01-01',
+        'gender': 'femenino', 'document_type': 'cedula', 'document_number': '001',
+        'updated_at': '2026-02-11T10:00:00+00:00',
+    }
+    client = _client(requests, patient)
+
+    first = client.get('/patients/p1')
+    etag = first.headers['etag']
+    assert first.status_code == 200 and etag.startswith('"')
+
+    second = client.get('/patients/p1', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['etag'] == etag
+    assert requests[-1].url.params['select'] == 'id,updated_at'
+
+    assert client.get('/patients/p1', headers={'If-None-Match': '"stale"'}).status_code == 200
+
+
+def test_list_if_modified_since():
+
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+
+    first = client.get('/patients/', params={'fields': 'first_name'})
+    assert first.status_code == 200
+    assert first.headers['last-modified'] == 'Wed, 11 Feb 2026 10:00:00 GMT'
+
+    second = client.get('/patients/', params={'fields': 'first_name'}, headers={
+        'If-Modified-Since': first.headers['last-modified'],
+    })
+    assert second.status_code == 304
+    assert len(requests) == 1
+
+    third = client.get('/patients/', params={'fields': 'first_name'}, headers={
+        'If-Modified-Since': 'Wed, 11 Feb 2026 09:59:59 GMT',
+    })
+    assert third.status_code == 200
+
+
+def test_vitals_are_computed_from_the_patient_consultations():
+
+    requests: list[httpx.Request] = []
+    rows = [{
+        'id': 'c1', 'patient_id': 'p1', 'consultation_date': '2026-02-11T10:00:00+00:00',
+        'weight_kg': 70, 'height_cm': 170, 'heart_rate': 72, 'temperature_c': 36.5, 'blood_pressure': '120/80',
+    }]
+
+    response = _client(requests, body=rows).get('/patients/p1/vitals', params={'window': 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['window'], body['count'], body['latest']['bmi']) == (5, 1, 24.2)
+    assert body['ranges']['heart_rate'] == {'low': 60, 'high': 100}
+
+    assert requests[0].url.path.endswith('/consultations')
+    assert requests[0].url.params['patient_id'] == 'eq.p1'
+    assert requests[0].url.params['status'] == 'neq.cancelada'
@@ -0,0 +1,36 @@
+from fastapi import Depends, HTTPException, Query
+from .. import PATIENTS_ROUTER
+from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.vitals import VITALS_SELECT, load_vitals, patient_vitals
+from src.database.classes import AuthContext
+from src.database.enums import ConsultationStatus
+from src.database.models import PatientVitals
+
+
+@PATIENTS_ROUTER.get('/{patient_id}/vitals', response_model=PatientVitals)
+async def get_patient_vitals(
+    patient_id: str,
+    window: int = Query(3, ge=1, le=20),
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Evolución de los signos vitales del paciente: IMC, presión sistólica/diastólica,
+    medias móviles de `window` consultas, variaciones y valores fuera de rango.
+    Se calcula una vez por paciente y se sirve desde la caché."""
+
+    async def load() -> dict:
+        def build_query():
+            return auth.client.table('consultations').select(VITALS_SELECT).eq(
+                'patient_id', patient_id
+            ).neq('status', ConsultationStatus.cancelada.value)
+
+        return patient_vitals(await load_vitals(build_query), window)
+
+    try:
+        # Vista del registro del paciente, como la ficha: las escrituras de consultas
+        # invalidan el registro y con él estas métricas
+        return await response_cache.fetch('patients', await cache_scope(auth), load, item_id=patient_id, params={
+            'view': 'vitals', 'window': window,
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,2 +1,3 @@
 from .. import PATIENTS_ROUTER
 from . import create_patient
+from . import bulk_create_patients
@@ -0,0 +1,32 @@
+from typing import Annotated, Any
+from fastapi import Body, Depends, HTTPException
+from .. import PATIENTS_ROUTER
+from src.utils import get_auth_context
+from src.utils.database import bulk_insert
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.database.models import PatientCreate, BulkResult
+
+
+@PATIENTS_ROUTER.post('/bulk', response_model=BulkResult)
+async def bulk_create_patients(
+    items: Annotated[list[dict[str, Any]], Body(min_length=1, max_length=settings.bulk_max_items)],
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Crear varios pacientes en una petición (INSERTs por lotes); el resultado de cada
+    registro se reporta por separado (`created`, `invalid` o `failed`)"""
+    try:
+        user_id = auth.user.user.id if auth.user and auth.user.user else None
+
+        result, inserted = await bulk_insert(
+            auth.client, 'patients', PatientCreate, items, user_id, settings.bulk_batch_size
+        )
+
+        if inserted:
+            await response_cache.invalidate('patients')
+            await realtime.publish('patients', 'insert', *inserted)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
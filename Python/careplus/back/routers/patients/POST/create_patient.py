@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import PATIENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import PatientCreate, PatientResponse
 
 
 @PATIENTS_ROUTER.post('/', response_model=PatientResponse, status_code=201)
-def create_patient(
+async def create_patient(
     data: PatientCreate,
     auth: AuthContext = Depends(get_auth_context)
 ):
@@ -17,7 +19,12 @@ def create_patient(
         patient_data = data.model_dump(mode='json')
         patient_data['created_by'] = user_id
         
-        response = auth.client.table('patients').insert(patient_data).execute()
-        return response.data[0]
+        response = await auth.client.table('patients').insert(patient_data).execute()
+        row = response.data[0]
+
+        await response_cache.invalidate('patients')
+        await realtime.publish('patients', 'insert', row)
+        await response_cache.prime('patients', await cache_scope(auth), row)
+        return row
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import PATIENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import PatientUpdate, PatientResponse
 
 
 @PATIENTS_ROUTER.put('/{patient_id}', response_model=PatientResponse)
-def update_patient(
+async def update_patient(
     patient_id: str,
     data: PatientUpdate,
     auth: AuthContext = Depends(get_auth_context)
@@ -18,12 +20,17 @@ def update_patient(
         if not update_data:
             raise HTTPException(status_code=400, detail="No hay datos para actualizar")
         
-        response = auth.client.table('patients').update(update_data).eq('id', patient_id).execute()
+        response = await auth.client.table('patients').update(update_data).eq('id', patient_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Paciente no encontrado")
         
-        return response.data[0]
+        row = response.data[0]
+
+        await response_cache.invalidate('patients', patient_id)
+        await realtime.publish('patients', 'update', row)
+        await response_cache.prime('patients', await cache_scope(auth), row)
+        return row
     except HTTPException:
         raise
     except Exception as e:
@@ -1,21 +1,27 @@
 from fastapi import Depends, HTTPException
 from .. import CONSULTATIONS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 
 
 @CONSULTATIONS_ROUTER.delete('/{consultation_id}', status_code=204)
-def delete_consultation(
+async def delete_consultation(
     consultation_id: str,
     auth: AuthContext = Depends(get_auth_context)
 ):
     """Eliminar una consulta"""
     try:
-        response = auth.client.table('consultations').delete().eq('id', consultation_id).execute()
+        response = await auth.client.table('consultations').delete().eq('id', consultation_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Consulta no encontrada")
         
+        await response_cache.invalidate('consultations', consultation_id)
+        await response_cache.invalidate('patients', response.data[0]['patient_id'], lists=False)
+        await realtime.publish('consultations', 'delete', response.data[0])
+
         return None
     except HTTPException:
         raise
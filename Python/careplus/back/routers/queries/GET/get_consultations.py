@@ -1,40 +1,68 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, Request, Response
 from .. import CONSULTATIONS_ROUTER
 from src.utils import get_auth_context
+from src.utils.database import paginate, select_fields, View
+from src.utils.response_cache import response_cache, cache_scope, fetch_row, list_validators, list_not_modified, not_modified
+from src._settings import settings
 from src.database.classes import AuthContext
-from src.database.models import ConsultationResponse
-from typing import Optional
+from src.database.models import ConsultationResponse, ConsultationSummary, Page
+from typing import Optional, Union
 
 
-@CONSULTATIONS_ROUTER.get('/', response_model=list[ConsultationResponse])
-def get_consultations(
+@CONSULTATIONS_ROUTER.get('/', response_model=Union[Page[ConsultationResponse], Page[ConsultationSummary]])
+async def get_consultations(
+    request: Request,
+    response: Response,
     patient_id: Optional[str] = None,
     status: Optional[str] = None,
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: View = 'full',
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener todas las consultas, opcionalmente filtradas por paciente o estado"""
+    """Obtener todas las consultas, opcionalmente filtradas por paciente o estado; paginado por cursor (`next_cursor`)"""
     try:
-        query = auth.client.table('consultations').select('*')
-        
-        if patient_id:
-            query = query.eq('patient_id', patient_id)
-        if status:
-            query = query.eq('status', status)
-        
-        response = query.order('consultation_date', desc=True).execute()
-        return response.data
+        selection = select_fields(ConsultationResponse, ConsultationSummary, fields, view, required=('id', 'consultation_date'))
+
+        async def load() -> dict:
+            query = auth.client.table('consultations').select(selection.columns)
+
+            if patient_id:
+                query = query.eq('patient_id', patient_id)
+            if status:
+                query = query.eq('status', status)
+
+            return await paginate(query, 'consultation_date', limit, cursor)
+
+        params = {
+            'patient_id': patient_id, 'status': status, 'limit': limit,
+            'cursor': cursor, 'fields': fields, 'view': view,
+        }
+        scope = await cache_scope(auth)
+
+        validators = await list_validators(auth, 'consultations', scope, params)
+        if list_not_modified(request, validators):
+            return not_modified(validators)
+
+        page = await response_cache.fetch('consultations', scope, load, params=params)
+        response.headers.update(validators)
+        return selection.respond(page, validators)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @CONSULTATIONS_ROUTER.get('/{consultation_id}', response_model=ConsultationResponse)
-def get_consultation(
+async def get_consultation(
     consultation_id: str,
+    request: Request,
+    response: Response,
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener una consulta por ID"""
+    """Obtener una consulta por ID (ETag / `If-None-Match` → 304)"""
     try:
-        response = auth.client.table('consultations').select('*').eq('id', consultation_id).single().execute()
-        return response.data
+        return await fetch_row(request, response, auth, 'consultations', consultation_id)
     except Exception:
         raise HTTPException(status_code=404, detail="Consulta no encontrada")
@@ -1,2 +1,3 @@
 from .. import CONSULTATIONS_ROUTER
 from . import create_consultation
+from . import bulk_create_consultations
@@ -0,0 +1,34 @@
+from typing import Annotated, Any
+from fastapi import Body, Depends, HTTPException
+from .. import CONSULTATIONS_ROUTER
+from src.utils import get_auth_context
+from src.utils.database import bulk_insert
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.database.models import ConsultationCreate, BulkResult
+
+
+@CONSULTATIONS_ROUTER.post('/bulk', response_model=BulkResult)
+async def bulk_create_consultations(
+    items: Annotated[list[dict[str, Any]], Body(min_length=1, max_length=settings.bulk_max_items)],
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Crear varias consultas en una petición (INSERTs por lotes); el resultado de cada
+    registro se reporta por separado (`created`, `invalid` o `failed`)"""
+    try:
+        user_id = auth.user.user.id if auth.user and auth.user.user else None
+
+        result, inserted = await bulk_insert(
+            auth.client, 'consultations', ConsultationCreate, items, user_id, settings.bulk_batch_size
+        )
+
+        if inserted:
+            await response_cache.invalidate('consultations')
+            # La ficha de cada paciente afectado embebe este recurso
+            await response_cache.invalidate('patients', *{row['patient_id'] for row in inserted}, lists=False)
+            await realtime.publish('consultations', 'insert', *inserted)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
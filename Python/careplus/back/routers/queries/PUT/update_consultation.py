@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import CONSULTATIONS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import ConsultationUpdate, ConsultationResponse
 
 
 @CONSULTATIONS_ROUTER.put('/{consultation_id}', response_model=ConsultationResponse)
-def update_consultation(
+async def update_consultation(
     consultation_id: str,
     data: ConsultationUpdate,
     auth: AuthContext = Depends(get_auth_context)
@@ -18,12 +20,18 @@ def update_consultation(
         if not update_data:
             raise HTTPException(status_code=400, detail="No hay datos para actualizar")
         
-        response = auth.client.table('consultations').update(update_data).eq('id', consultation_id).execute()
+        response = await auth.client.table('consultations').update(update_data).eq('id', consultation_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Consulta no encontrada")
         
-        return response.data[0]
+        row = response.data[0]
+
+        await response_cache.invalidate('consultations', consultation_id)
+        await response_cache.invalidate('patients', row['patient_id'], lists=False)
+        await realtime.publish('consultations', 'update', row)
+        await response_cache.prime('consultations', await cache_scope(auth), row)
+        return row
     except HTTPException:
         raise
     except Exception as e:
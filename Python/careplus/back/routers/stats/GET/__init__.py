@@ -0,0 +1,2 @@
+from .. import STATS_ROUTER
+from . import dashboard
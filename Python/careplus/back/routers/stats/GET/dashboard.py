@@ -0,0 +1,122 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from .. import STATS_ROUTER
+from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.stats import stats_period
+from src.database.classes import AuthContext
+from src.database.enums import ConsultationStatus, Severity, DiagnosisType, TreatmentType
+from src.database.models import ConsultationStats, DiagnosisStats, TreatmentStats, PatientStats
+
+
+def _counts(values: dict, enum: type[Enum]) -> dict[str, int]:
+    '''Counts of every enum value (0 when the period has none), plus any other key'''
+
+    return {**{member.value: 0 for member in enum}, **(values or {})}
+
+
+async def _section(auth: AuthContext, function: str, params: dict) -> dict:
+    # Los rollups solo cambian con el refresco, que invalida todo el namespace 'stats'
+    async def load() -> dict:
+        response = await auth.client.rpc(function, params).execute()
+        return response.data or {}
+
+    return await response_cache.fetch('stats', await cache_scope(auth), load, params={'view': function, **params})
+
+
+@STATS_ROUTER.get('/consultations', response_model=ConsultationStats)
+async def get_consultation_stats(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Consultas por día, estado y médico en el periodo (por defecto los últimos 30 días)"""
+    try:
+        date_from, date_to = stats_period(date_from, date_to)
+        data = await _section(auth, 'dashboard_consultations', {
+            'p_from': date_from.isoformat(), 'p_to': date_to.isoformat(),
+        })
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'total': data.get('total', 0),
+            'by_day': data.get('by_day', []),
+            'by_status': _counts(data.get('by_status'), ConsultationStatus),
+            'by_doctor': data.get('by_doctor', []),
+            'refreshed_at': data.get('refreshed_at'),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@STATS_ROUTER.get('/diagnoses', response_model=DiagnosisStats)
+async def get_diagnosis_stats(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Diagnósticos por severidad y tipo en el periodo (por fecha de diagnóstico)"""
+    try:
+        date_from, date_to = stats_period(date_from, date_to)
+        data = await _section(auth, 'dashboard_diagnoses', {
+            'p_from': date_from.isoformat(), 'p_to': date_to.isoformat(),
+        })
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'total': data.get('total', 0),
+            'by_severity': _counts(data.get('by_severity'), Severity),
+            'by_type': _counts(data.get('by_type'), DiagnosisType),
+            'refreshed_at': data.get('refreshed_at'),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@STATS_ROUTER.get('/treatments', response_model=TreatmentStats)
+async def get_treatment_stats(auth: AuthContext = Depends(get_auth_context)):
+    """Tratamientos activos por tipo"""
+    try:
+        data = await _section(auth, 'dashboard_treatments', {})
+        return {
+            'total': data.get('total', 0),
+            'by_type': _counts(data.get('by_type'), TreatmentType),
+            'refreshed_at': data.get('refreshed_at'),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@STATS_ROUTER.get('/patients', response_model=PatientStats)
+async def get_patient_stats(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Pacientes nuevos por día y ciudad en el periodo"""
+    try:
+        date_from, date_to = stats_period(date_from, date_to)
+        data = await _section(auth, 'dashboard_patients', {
+            'p_from': date_from.isoformat(), 'p_to': date_to.isoformat(),
+        })
+        return {
+            'date_from': date_from,
+            'date_to': date_to,
+            'total': data.get('total', 0),
+            'by_day': data.get('by_day', []),
+            'by_city': data.get('by_city', []),
+            'refreshed_at': data.get('refreshed_at'),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,48 @@
+import json
+from datetime import date, timedelta
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from .. import STATS_ROUTER
+
+
+def test_stats_read_rollup_functions_only():
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = {
+            'total': 3,
+            'by_day': [{'day': '2026-02-01', 'count': 3}],
+            'by_status': {'completada': 2, 'cancelada': 1},
+            'by_doctor': [{'doctor_id': 'user-1', 'consultations': 3}],
+            'refreshed_at': '2026-02-02T10:00:00+00:00',
+        }
+        return httpx.Response(200, content=json.dumps(body), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(STATS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    with TestClient(app) as client:
+        response = client.get('/stats/consultations')
+        assert response.status_code == 200
+        data = response.json()
+
+        # Nunca se consultan las tablas clínicas: solo la función del rollup
+        assert [r.url.path for r in requests] == ['/rest/v1/rpc/dashboard_consultations']
+        params = json.loads(requests[0].content)
+        assert params == {'p_from': (date.today() - timedelta(days=29)).isoformat(), 'p_to': date.today().isoformat()}
+
+        assert data['total'] == 3
+        assert data['by_status'] == {'programada': 0, 'en_curso': 0, 'completada': 2, 'cancelada': 1}
+        assert data['by_day'] == [{'day': '2026-02-01', 'count': 3}]
+
+        assert client.get('/stats/patients', params={'date_from': '2026-02-10', 'date_to': '2026-02-01'}).status_code == 400
+        assert client.get('/stats/diagnoses', params={'date_from': '2024-01-01', 'date_to': '2026-01-01'}).status_code == 400
+        assert len(requests) == 1
@@ -0,0 +1,26 @@
+from fastapi import Depends, HTTPException
+from .. import STATS_ROUTER
+from src.utils import get_auth_context, get_user_role
+from src.utils.stats import dashboard_stats
+from src.database.classes import AuthContext
+
+
+@STATS_ROUTER.post('/refresh')
+async def refresh_stats(full: bool = False, auth: AuthContext = Depends(get_auth_context)) -> dict:
+    """Refresca ahora los rollups del dashboard (`full` los reconstruye completos). Solo admin y superadmin."""
+
+    user_id = auth.user.user.id if auth.user and auth.user.user else None
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Usuario no autenticado")
+
+    if await get_user_role(auth, user_id) not in ('admin', 'superadmin'):
+        raise HTTPException(status_code=403, detail="No tienes permisos para refrescar las estadísticas")
+
+    try:
+        result = await dashboard_stats.refresh(full)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al refrescar las estadísticas: {str(e)}")
+
+    if result is None:
+        raise HTTPException(status_code=409, detail="Ya hay un refresco de estadísticas en curso")
+    return result
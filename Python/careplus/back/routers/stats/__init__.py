@@ -0,0 +1,9 @@
+from fastapi.routing import APIRouter
+
+STATS_ROUTER: APIRouter = APIRouter(
+    prefix="/stats",
+    tags=["Stats"]
+)
+
+from . import GET
+from . import POST
@@ -1,21 +1,27 @@
 from fastapi import Depends, HTTPException
 from .. import TREATMENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 
 
 @TREATMENTS_ROUTER.delete('/{treatment_id}', status_code=204)
-def delete_treatment(
+async def delete_treatment(
     treatment_id: str,
     auth: AuthContext = Depends(get_auth_context)
 ):
     """Eliminar un tratamiento"""
     try:
-        response = auth.client.table('treatments').delete().eq('id', treatment_id).execute()
+        response = await auth.client.table('treatments').delete().eq('id', treatment_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Tratamiento no encontrado")
         
+        await response_cache.invalidate('treatments', treatment_id)
+        await response_cache.invalidate('patients', response.data[0]['patient_id'], lists=False)
+        await realtime.publish('treatments', 'delete', response.data[0])
+
         return None
     except HTTPException:
         raise
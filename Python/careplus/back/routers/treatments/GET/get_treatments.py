@@ -1,40 +1,68 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, Request, Response
 from .. import TREATMENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.database import paginate, select_fields, View
+from src.utils.response_cache import response_cache, cache_scope, fetch_row, list_validators, list_not_modified, not_modified
+from src._settings import settings
 from src.database.classes import AuthContext
-from src.database.models import TreatmentResponse
-from typing import Optional
+from src.database.models import TreatmentResponse, TreatmentSummary, Page
+from typing import Optional, Union
 
 
-@TREATMENTS_ROUTER.get('/', response_model=list[TreatmentResponse])
-def get_treatments(
+@TREATMENTS_ROUTER.get('/', response_model=Union[Page[TreatmentResponse], Page[TreatmentSummary]])
+async def get_treatments(
+    request: Request,
+    response: Response,
     patient_id: Optional[str] = None,
     status: Optional[str] = None,
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: View = 'full',
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener todos los tratamientos, opcionalmente filtrados por paciente o estado"""
+    """Obtener todos los tratamientos, opcionalmente filtrados por paciente o estado; paginado por cursor (`next_cursor`)"""
     try:
-        query = auth.client.table('treatments').select('*')
-        
-        if patient_id:
-            query = query.eq('patient_id', patient_id)
-        if status:
-            query = query.eq('status', status)
-        
-        response = query.order('created_at', desc=True).execute()
-        return response.data
+        selection = select_fields(TreatmentResponse, TreatmentSummary, fields, view)
+
+        async def load() -> dict:
+            query = auth.client.table('treatments').select(selection.columns)
+
+            if patient_id:
+                query = query.eq('patient_id', patient_id)
+            if status:
+                query = query.eq('status', status)
+
+            return await paginate(query, 'created_at', limit, cursor)
+
+        params = {
+            'patient_id': patient_id, 'status': status, 'limit': limit,
+            'cursor': cursor, 'fields': fields, 'view': view,
+        }
+        scope = await cache_scope(auth)
+
+        validators = await list_validators(auth, 'treatments', scope, params)
+        if list_not_modified(request, validators):
+            return not_modified(validators)
+
+        page = await response_cache.fetch('treatments', scope, load, params=params)
+        response.headers.update(validators)
+        return selection.respond(page, validators)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @TREATMENTS_ROUTER.get('/{treatment_id}', response_model=TreatmentResponse)
-def get_treatment(
+async def get_treatment(
     treatment_id: str,
+    request: Request,
+    response: Response,
     auth: AuthContext = Depends(get_auth_context)
 ):
-    """Obtener un tratamiento por ID"""
+    """Obtener un tratamiento por ID (ETag / `If-None-Match` → 304)"""
     try:
-        response = auth.client.table('treatments').select('*').eq('id', treatment_id).single().execute()
-        return response.data
+        return await fetch_row(request, response, auth, 'treatments', treatment_id)
     except Exception:
         raise HTTPException(status_code=404, detail="Tratamiento no encontrado")
@@ -1,2 +1,3 @@
 from .. import TREATMENTS_ROUTER
 from . import create_treatment
+from . import bulk_create_treatments
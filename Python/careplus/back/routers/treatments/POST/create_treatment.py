@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import TREATMENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import TreatmentCreate, TreatmentResponse
 
 
 @TREATMENTS_ROUTER.post('/', response_model=TreatmentResponse, status_code=201)
-def create_treatment(
+async def create_treatment(
     data: TreatmentCreate,
     auth: AuthContext = Depends(get_auth_context)
 ):
@@ -17,7 +19,13 @@ def create_treatment(
         treatment_data = data.model_dump(exclude_none=True, mode='json')
         treatment_data['created_by'] = user_id
         
-        response = auth.client.table('treatments').insert(treatment_data).execute()
-        return response.data[0]
+        response = await auth.client.table('treatments').insert(treatment_data).execute()
+        row = response.data[0]
+
+        await response_cache.invalidate('treatments')
+        await response_cache.invalidate('patients', row['patient_id'], lists=False)
+        await realtime.publish('treatments', 'insert', row)
+        await response_cache.prime('treatments', await cache_scope(auth), row)
+        return row
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
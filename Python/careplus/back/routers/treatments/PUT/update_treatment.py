@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException
 from .. import TREATMENTS_ROUTER
 from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.realtime import realtime
 from src.database.classes import AuthContext
 from src.database.models import TreatmentUpdate, TreatmentResponse
 
 
 @TREATMENTS_ROUTER.put('/{treatment_id}', response_model=TreatmentResponse)
-def update_treatment(
+async def update_treatment(
     treatment_id: str,
     data: TreatmentUpdate,
     auth: AuthContext = Depends(get_auth_context)
@@ -18,12 +20,18 @@ def update_treatment(
         if not update_data:
             raise HTTPException(status_code=400, detail="No hay datos para actualizar")
         
-        response = auth.client.table('treatments').update(update_data).eq('id', treatment_id).execute()
+        response = await auth.client.table('treatments').update(update_data).eq('id', treatment_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Tratamiento no encontrado")
         
-        return response.data[0]
+        row = response.data[0]
+
+        await response_cache.invalidate('treatments', treatment_id)
+        await response_cache.invalidate('patients', row['patient_id'], lists=False)
+        await realtime.publish('treatments', 'update', row)
+        await response_cache.prime('treatments', await cache_scope(auth), row)
+        return row
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,2 @@
+from .. import VITALS_ROUTER
+from . import cohort
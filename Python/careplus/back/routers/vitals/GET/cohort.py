@@ -0,0 +1,57 @@
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from .. import VITALS_ROUTER
+from src.utils import get_auth_context
+from src.utils.response_cache import response_cache, cache_scope
+from src.utils.stats import stats_period
+from src.utils.vitals import VITALS_SELECT, CohortGroup, load_vitals, cohort_vitals
+from src.database.classes import AuthContext
+from src.database.enums import ConsultationStatus
+from src.database.models import CohortVitals
+
+# Datos del paciente para agrupar (FK explícito, como en la ficha)
+PATIENT_EMBED = 'patients!consultations_patient_id_fkey(gender, date_of_birth)'
+
+
+@VITALS_ROUTER.get('/cohort', response_model=CohortVitals)
+async def get_cohort_vitals(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    group_by: Optional[CohortGroup] = None,
+    auth: AuthContext = Depends(get_auth_context)
+):
+    """Resumen de signos vitales de todos los pacientes con consultas en el periodo:
+    media, mediana, percentiles 10/90 y pacientes fuera de rango por métrica,
+    opcionalmente por género o franja de edad (`group_by`).
+
+    El periodo es por defecto de los últimos 30 días y como mucho de
+    `stats_max_range_days`, como en /stats: la cohorte se lee entera en memoria."""
+    try:
+        date_from, date_to = stats_period(date_from, date_to)
+
+        def build_query():
+            query = auth.client.table('consultations').select(
+                f'{VITALS_SELECT}, {PATIENT_EMBED}' if group_by else VITALS_SELECT
+            ).neq('status', ConsultationStatus.cancelada.value)
+
+            # consultation_date es TIMESTAMPTZ: date_to incluye todo el día
+            return query.gte('consultation_date', date_from.isoformat()).lt(
+                'consultation_date', (date_to + timedelta(days=1)).isoformat()
+            )
+
+        async def load() -> dict:
+            frame = await load_vitals(build_query)
+            # La agregación de toda la cohorte no debe bloquear el event loop
+            return await asyncio.to_thread(cohort_vitals, frame, group_by)
+
+        # Variante de los listados de consultas: cualquier escritura de consultas la invalida
+        return await response_cache.fetch('consultations', await cache_scope(auth), load, params={
+            'view': 'vitals_cohort', 'date_from': date_from, 'date_to': date_to, 'group_by': group_by,
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
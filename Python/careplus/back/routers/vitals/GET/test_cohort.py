@@ -0,0 +1,52 @@
+import json
+import uuid
+from datetime import date, timedelta
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src._settings import settings
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from .. import VITALS_ROUTER
+
+ROWS = [
+    {
+        'id': str(uuid.UUID(int=i)), 'patient_id': f'p{i % 300}', 'consultation_date': f'2026-02-11T10:{i // 60 % 60:02d}:{i % 60:02d}+00:00',
+        'weight_kg': 70.0, 'height_cm': 175.0, 'heart_rate': 72, 'temperature_c': 36.6, 'blood_pressure': '120/80',
+    }
+    for i in range(1500, 0, -1)
+]
+
+
+def test_cohort_reads_every_page_within_a_bounded_period():
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # PostgREST recorta cualquier respuesta a max_rows, pida lo que pida el limit
+        limit = int(request.url.params['limit'])
+        start = len(requests) * (limit - 1)
+        requests.append(request)
+        rows = ROWS[start:start + min(limit, settings.postgrest_max_rows)]
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(VITALS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+    client = TestClient(app)
+
+    response = client.get('/vitals/cohort', params={'date_from': '2026-02-01', 'date_to': '2026-02-28'})
+
+    assert response.status_code == 200
+    assert response.json()['consultations'] == 1500
+    assert len(requests) == 2
+    assert requests[0].url.params.get_list('consultation_date') == ['gte.2026-02-01', 'lt.2026-03-01']
+
+    # Sin fechas: los últimos 30 días; nunca más de stats_max_range_days
+    client.get('/vitals/cohort')
+    assert requests[2].url.params.get_list('consultation_date')[0] == f'gte.{(date.today() - timedelta(days=29)).isoformat()}'
+
+    too_long = date.today() - timedelta(days=settings.stats_max_range_days)
+    assert client.get('/vitals/cohort', params={'date_from': too_long.isoformat()}).status_code == 400
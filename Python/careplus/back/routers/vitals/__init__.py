@@ -0,0 +1,8 @@
+from fastapi.routing import APIRouter
+
+VITALS_ROUTER: APIRouter = APIRouter(
+    prefix="/vitals",
+    tags=["Vitals"]
+)
+
+from . import GET
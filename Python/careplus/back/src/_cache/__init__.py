@@ -0,0 +1,2 @@
+from .__TTLCache import TTLCache
+from .__redis import get_redis, close_redis
@@ -0,0 +1,30 @@
+from typing import Optional
+
+import redis.asyncio as asyncredis
+from src._settings import settings
+
+_redis: Optional[asyncredis.Redis] = None
+
+
+def get_redis() -> Optional[asyncredis.Redis]:
+    """Conexión Redis compartida, o None si APP_REDIS_REDIS_URL no está configurada."""
+    global _redis
+
+    if not settings.app_redis_redis_url:
+        return None
+
+    if _redis is None:
+        _redis = asyncredis.from_url(
+            settings.app_redis_redis_url,
+            encoding='utf8',
+            decode_responses=True,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -26,10 +26,107 @@ class Settings(BaseSettings):
     
     prod_supabase_service_role_key: str
     test_supabase_service_role_key: str = ''
-    
+
+    # Pool de conexiones compartido por los clientes de Supabase
+    supabase_max_connections: int = 100
+    supabase_max_keepalive_connections: int = 20
+    supabase_keepalive_expiry_seconds: float = 30.0
+    supabase_token_client_cache_size: int = 512
+
+    # Secreto(s) JWT del proyecto, separados por coma para permitir rotación
+    prod_supabase_jwt_secret: str = ''
+    test_supabase_jwt_secret: str = ''
+
+    # Verificación de tokens: 'local' (firma JWT en proceso) o 'remote' (auth.get_user)
+    auth_verification_mode: Literal['local', 'remote'] = 'local'
+    auth_remote_fallback: bool = True
+    auth_jwt_audience: str = 'authenticated'
+    auth_jwks_ttl_seconds: int = 600
+    auth_negative_cache_ttl_seconds: int = 30
+    auth_revocation_ttl_seconds: int = 3600
+
+    # Caché de roles de usuario (memoria + Redis opcional)
+    role_cache_ttl_seconds: int = 60
+
+    # Catálogo de tablas de referencia (roles, tipos de documento); 0 = sin refresco periódico
+    reference_catalog_refresh_seconds: int = 300
+
+    # Paginación por cursor de los listados; search_patients() acota p_limit a 200,
+    # subir pagination_max_limit requiere subir también ese tope en la migración
+    pagination_default_limit: int = 50
+    pagination_max_limit: int = 200
+
+    # max_rows de PostgREST (supabase/config.toml): tope de filas de cualquier respuesta
+    postgrest_max_rows: int = 1000
+
+    # Exportaciones en streaming: filas por página. paginate() pide una fila de más
+    # para saber si hay otra página, así que debe ser < postgrest_max_rows
+    export_chunk_size: int = 999
+
+    # Altas masivas (POST /<recurso>/bulk): registros por petición y filas por INSERT
+    bulk_max_items: int = 5000
+    bulk_batch_size: int = 500
+
+    # Importación de CSV/Parquet en segundo plano (POST /imports/<recurso>)
+    import_max_bytes: int = 100 * 1024 * 1024
+    import_batch_size: int = 1000
+    import_max_concurrent_jobs: int = 2
+    import_job_history: int = 50
+    # Los trabajos usan el token del usuario (RLS) y no pueden renovarlo: se rechaza la
+    # importación si al token le quedan menos de estos segundos
+    import_min_token_seconds: int = 300
+
+    # Rollups del dashboard (/stats): refresco incremental cada N segundos (0 = sin
+    # programador), margen para transacciones que confirman tarde y reconstrucción
+    # completa diaria ("HH:MM" hora del servidor, '' = nunca)
+    stats_refresh_seconds: int = 60
+    stats_refresh_lookback_seconds: int = 300
+    stats_full_rebuild_at: str = '03:30'
+    stats_max_range_days: int = 366
+
+    # Reconciliación diaria de patient_counters ("HH:MM" hora del servidor, '' = nunca)
+    patient_counters_reconcile_at: str = '04:00'
+
+    # Almacén de códigos OTP: tabla verification_codes, memoria del proceso o Redis
+    otp_backend: Literal['table', 'memory', 'redis'] = 'table'
+
+    # Purga de verification_codes usados o expirados (solo con el almacén 'table'):
+    # cada N segundos (0 = sin programador), en lotes de N filas, N lotes por turno
+    otp_purge_interval_seconds: int = 300
+    otp_purge_batch_size: int = 1000
+    otp_purge_max_batches: int = 50
+
+    # Límite de peticiones (token bucket) en los endpoints de autenticación.
+    # RATE_LIMITS sobreescribe reglas: '{"auth.login:ip": "20/60"}' (peticiones/segundos).
+    # RATE_LIMIT_TRUSTED_PROXIES: proxies propios delante de la API que agregan su salto
+    # a X-Forwarded-For (0 = se usa la IP de la conexión y se ignora la cabecera)
+    rate_limit_enabled: bool = True
+    rate_limit_backend: Literal['memory', 'redis'] = 'memory'
+    rate_limits: dict[str, str] = {}
+    rate_limit_trusted_proxies: int = 0
+
+    # Caché de respuestas de los GET (clave: recurso + rol + query params), invalidada
+    # por los POST/PUT/DELETE. 'memory' solo es coherente con un único proceso
+    response_cache_enabled: bool = True
+    response_cache_backend: Literal['memory', 'redis'] = 'memory'
+    response_cache_ttl_seconds: int = 60
+    response_cache_max_keys: int = 4096
+
+    # Cambios en tiempo real por socket.io (/ws, namespace /realtime). Con 'redis' los
+    # procesos de la API comparten los eventos por pub/sub (APP_REDIS_REDIS_URL)
+    realtime_enabled: bool = True
+    realtime_backend: Literal['memory', 'redis'] = 'memory'
+    realtime_redis_channel: str = 'careplus-realtime'
+
     # Resend para envío de correos (2FA)
     resend_api_key: str = ''
     resend_from_email: str = 'onboarding@resend.dev'
+
+    # Cola de envío de correos en segundo plano (0 workers = envío en línea)
+    email_queue_size: int = 1000
+    email_queue_workers: int = 2
+    email_max_retries: int = 3
+    email_retry_backoff_seconds: float = 0.5
     
     # class Config:
     #     env_file = ".env"
@@ -98,6 +195,23 @@ class Settings(BaseSettings):
             else self.prod_supabase_service_role_key
         )
 
+    @property
+    def supabase_jwt_secrets(self) -> list[str]:
+        '''Returns supabase JWT secrets (local or production), current one first
+
+        :param self: Description
+        :return: Supabase JWT Secrets
+        :rtype: list[str]
+        '''
+
+        raw = (
+            self.test_supabase_jwt_secret
+            if self.env_is_local()
+            else self.prod_supabase_jwt_secret
+        )
+
+        return [secret.strip() for secret in raw.split(',') if secret.strip()]
+
 @lru_cache
 def get_settings() -> Settings:
     return Settings() # type: ignore
@@ -1 +1,2 @@
-from .supabase import SupabaseClient
\ No newline at end of file
+from .supabase import SupabaseClient
+from ._client_factory import SupabaseClientFactory, init_client_factory, get_client_factory, close_client_factory
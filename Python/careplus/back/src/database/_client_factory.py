@@ -0,0 +1,195 @@
+from typing import Optional
+
+import httpx
+from src._settings import settings
+from src._cache import TTLCache
+
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions
+)
+
+from supabase_auth import AsyncGoTrueClient
+
+
+class SupabaseClientFactory:
+    """Fábrica de clientes Supabase sobre un único pool de conexiones keep-alive.
+
+    - ``anon``: cliente compartido con la anon key.
+    - ``admin``: cliente compartido con la service_role key.
+    - ``for_token``: clientes ligados al token del usuario, en un LRU acotado.
+
+    Todos comparten el mismo ``httpx.AsyncClient``, por lo que no se abren sesiones ni
+    handshakes TLS nuevos por petición. Las cabeceras (apikey/Authorization) se envían
+    por petición, así que compartir el transporte no mezcla credenciales.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        service_role_key: str = '',
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        token_client_cache_size: int = 512,
+        token_client_ttl_seconds: float = 300.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if not url or not key:
+            raise Exception("Supabase url or key not exists!")
+
+        self.url = url
+        self.key = key
+        self.service_role_key = service_role_key
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+
+        self.__http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(120.0),
+            follow_redirects=True,
+            http2=True,
+            transport=transport,
+        )
+        self.__token_clients = TTLCache(token_client_ttl_seconds, max_size=token_client_cache_size)
+        self.__anon: Optional[AsyncClient] = None
+        self.__admin: Optional[AsyncClient] = None
+
+        self.clients_created = 0
+        self.auth_clients_created = 0
+
+    def _options(self, access_token: Optional[str] = None) -> AsyncClientOptions:
+        options = AsyncClientOptions(
+            httpx_client=self.__http,
+            auto_refresh_token=False,
+            persist_session=False,
+        )
+        if access_token:
+            options.headers['Authorization'] = f'Bearer {access_token}'
+        return options
+
+    def _create(self, key: str, access_token: Optional[str] = None) -> AsyncClient:
+        # Se construye directamente (sin acreate_client): la cabecera Authorization
+        # ya va en las opciones, así que no hace falta consultar la sesión.
+        self.clients_created += 1
+        return AsyncClient(self.url, key, self._options(access_token))
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self.__http
+
+    @property
+    def anon(self) -> AsyncClient:
+        '''Shared client authenticated with the anon key'''
+
+        if self.__anon is None:
+            self.__anon = self._create(self.key)
+        return self.__anon
+
+    @property
+    def admin(self) -> AsyncClient:
+        '''Shared client authenticated with the service_role key'''
+
+        if not self.service_role_key:
+            raise Exception("Service role key not configured. Set PROD/TEST_SUPABASE_SERVICE_ROLE_KEY in .env")
+
+        if self.__admin is None:
+            self.__admin = self._create(self.service_role_key)
+        return self.__admin
+
+    def for_token(self, access_token: str) -> AsyncClient:
+        '''Client bound to a user access token (RLS runs as that user)
+
+        :param access_token: User JWT
+        :return: Cached or new token-bound client
+        :rtype: AsyncClient
+        '''
+
+        client: Optional[AsyncClient] = self.__token_clients.get(access_token)
+        if client is None:
+            client = self._create(self.key, access_token)
+            self.__token_clients.set(access_token, client)
+        return client
+
+    def auth_client(self) -> AsyncGoTrueClient:
+        '''Fresh GoTrue client over the shared transport
+
+        Operations like sign-in or refresh store a session in the auth client, so
+        they must not run on the shared ``anon`` client. Creating the GoTrue client
+        is cheap because it reuses the connection pool.
+        '''
+
+        self.auth_clients_created += 1
+        return AsyncGoTrueClient(
+            url=f"{self.url.rstrip('/')}/auth/v1",
+            headers={
+                'apiKey': self.key,
+                'Authorization': f'Bearer {self.key}',
+            },
+            auto_refresh_token=False,
+            persist_session=False,
+            http_client=self.__http,
+        )
+
+    def metrics(self) -> dict:
+        pool = getattr(getattr(self.__http, '_transport', None), '_pool', None)
+        connections = list(getattr(pool, 'connections', []))
+
+        return {
+            'pool_max_connections': self.max_connections,
+            'pool_max_keepalive_connections': self.max_keepalive_connections,
+            'pool_open_connections': len(connections),
+            'pool_idle_connections': sum(1 for c in connections if c.is_idle()),
+            'clients_created': self.clients_created,
+            'auth_clients_created': self.auth_clients_created,
+            'token_clients_cached': len(self.__token_clients),
+            'token_client_hits': self.__token_clients.hits,
+            'token_client_misses': self.__token_clients.misses,
+            'token_client_hit_rate': round(self.__token_clients.hit_rate, 4),
+        }
+
+    async def close(self) -> None:
+        self.__token_clients.clear()
+        await self.__http.aclose()
+
+
+_factory: Optional[SupabaseClientFactory] = None
+
+
+def init_client_factory(transport: Optional[httpx.AsyncBaseTransport] = None) -> SupabaseClientFactory:
+    """Crea la fábrica compartida (se llama desde el lifespan de la app).
+
+    ``transport`` permite sustituir la red (benchmarks/pruebas con un PostgREST simulado).
+    """
+    global _factory
+
+    if _factory is None:
+        _factory = SupabaseClientFactory(
+            url=settings.supabase_url,
+            key=settings.supabase_key,
+            service_role_key=settings.supabase_service_role_key,
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_keepalive_expiry_seconds,
+            token_client_cache_size=settings.supabase_token_client_cache_size,
+            transport=transport,
+        )
+    return _factory
+
+
+def get_client_factory() -> SupabaseClientFactory:
+    """Retorna la fábrica compartida, creándola si el lifespan aún no lo hizo."""
+    return _factory or init_client_factory()
+
+
+async def close_client_factory() -> None:
+    global _factory
+
+    if _factory is not None:
+        await _factory.close()
+        _factory = None
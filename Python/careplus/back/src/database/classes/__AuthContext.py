@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from supabase import Client
+from supabase import AsyncClient
 from supabase_auth import UserResponse
 
 @dataclass
 class AuthContext:
-    client: Client
+    client: AsyncClient
     user: UserResponse|None
     token: str
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class VerifyOtpRequest(BaseModel):
     user_id: str
-    code: str
+    # Seis dígitos ASCII, como los genera generate_otp
+    code: str = Field(pattern=r'^[0-9]{6}$')
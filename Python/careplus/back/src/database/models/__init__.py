@@ -1,5 +1,10 @@
-from .patient import PatientCreate, PatientUpdate, PatientResponse
-from .consultation import ConsultationCreate, ConsultationUpdate, ConsultationResponse
-from .diagnostic import DiagnosticCreate, DiagnosticUpdate, DiagnosticResponse
-from .treatment import TreatmentCreate, TreatmentUpdate, TreatmentResponse
-from .medical_history import MedicalHistoryCreate, MedicalHistoryUpdate, MedicalHistoryResponse
+from .patient import PatientCreate, PatientUpdate, PatientResponse, PatientSummary, PatientChart
+from .consultation import ConsultationCreate, ConsultationUpdate, ConsultationResponse, ConsultationSummary
+from .diagnostic import DiagnosticCreate, DiagnosticUpdate, DiagnosticResponse, DiagnosticSummary
+from .treatment import TreatmentCreate, TreatmentUpdate, TreatmentResponse, TreatmentSummary
+from .medical_history import MedicalHistoryCreate, MedicalHistoryUpdate, MedicalHistoryResponse, MedicalHistorySummary
+from .page import Page
+from .bulk import BulkResult, BulkItemResult
+from .imports import ImportJob
+from .vitals import PatientVitals, CohortVitals
+from .stats import ConsultationStats, DiagnosisStats, TreatmentStats, PatientStats
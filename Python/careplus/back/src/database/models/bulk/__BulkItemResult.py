@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Any, Literal, Optional
+
+
+class BulkItemResult(BaseModel):
+    # Posición del registro en la petición
+    index: int
+    # invalid: no pasó la validación; failed: la base de datos lo rechazó o no respondió
+    status: Literal['created', 'invalid', 'failed']
+    # id asignado (created y failed): tras un error de conexión permite comprobar si se guardó
+    id: Optional[str] = None
+    error: Optional[Any] = None
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+from .__BulkItemResult import BulkItemResult
+
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkItemResult]
@@ -0,0 +1,2 @@
+from .__BulkItemResult import BulkItemResult
+from .__BulkResult import BulkResult
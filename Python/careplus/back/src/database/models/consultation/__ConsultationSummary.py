@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+from src.database.enums import ConsultationStatus
+
+
+class ConsultationSummary(BaseModel):
+    id: str
+    patient_id: str
+    consultation_date: Optional[datetime] = None
+    reason: str
+    blood_pressure: Optional[str] = None
+    heart_rate: Optional[int] = None
+    temperature_c: Optional[float] = None
+    status: ConsultationStatus
+    created_at: Optional[datetime] = None
@@ -1,3 +1,4 @@
 from .__ConsultationCreate import ConsultationCreate
 from .__ConsultationUpdate import ConsultationUpdate
 from .__ConsultationResponse import ConsultationResponse
+from .__ConsultationSummary import ConsultationSummary
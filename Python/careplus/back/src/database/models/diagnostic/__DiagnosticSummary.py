@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+from src.database.enums import Severity, DiagnosisType
+
+
+class DiagnosticSummary(BaseModel):
+    id: str
+    patient_id: str
+    consultation_id: Optional[str] = None
+    code: Optional[str] = None
+    name: str
+    severity: Severity
+    diagnosis_type: DiagnosisType
+    diagnosis_date: Optional[date] = None
+    created_at: Optional[datetime] = None
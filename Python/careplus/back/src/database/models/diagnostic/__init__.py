@@ -1,3 +1,4 @@
 from .__DiagnosticCreate import DiagnosticCreate
 from .__DiagnosticUpdate import DiagnosticUpdate
 from .__DiagnosticResponse import DiagnosticResponse
+from .__DiagnosticSummary import DiagnosticSummary
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+from datetime import datetime
+
+
+class ImportJob(BaseModel):
+    id: str
+    resource: str
+    # validating: recuento de filas del archivo; loading: validación e INSERTs por lotes
+    status: Literal['queued', 'validating', 'loading', 'completed', 'failed']
+    total_rows: int = 0
+    # Filas ya resueltas (insertadas o rechazadas)
+    processed_rows: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    progress: float = 0.0
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
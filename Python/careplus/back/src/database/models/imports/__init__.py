@@ -0,0 +1 @@
+from .__ImportJob import ImportJob
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+from src.database.enums import EventType
+
+
+class MedicalHistorySummary(BaseModel):
+    id: str
+    patient_id: str
+    event_type: EventType
+    title: str
+    event_date: Optional[date] = None
+    created_at: Optional[datetime] = None
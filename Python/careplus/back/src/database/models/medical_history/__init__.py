@@ -1,3 +1,4 @@
 from .__MedicalHistoryCreate import MedicalHistoryCreate
 from .__MedicalHistoryUpdate import MedicalHistoryUpdate
 from .__MedicalHistoryResponse import MedicalHistoryResponse
+from .__MedicalHistorySummary import MedicalHistorySummary
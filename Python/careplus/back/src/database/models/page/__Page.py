@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # Cursor para pedir la página siguiente; None en la última página
+    next_cursor: Optional[str] = None
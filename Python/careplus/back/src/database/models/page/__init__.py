@@ -0,0 +1 @@
+from .__Page import Page
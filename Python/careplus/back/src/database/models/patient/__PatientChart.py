@@ -0,0 +1,12 @@
+from ..consultation import ConsultationResponse
+from ..diagnostic import DiagnosticResponse
+from ..treatment import TreatmentResponse
+from .__PatientResponse import PatientResponse
+
+
+class PatientChart(PatientResponse):
+    '''Ficha del paciente con sus secciones más recientes'''
+
+    consultations: list[ConsultationResponse] = []
+    diagnostics: list[DiagnosticResponse] = []
+    treatments: list[TreatmentResponse] = []
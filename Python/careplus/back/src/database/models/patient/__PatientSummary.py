@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+from src.database.enums import Gender, DocumentType
+
+
+class PatientSummary(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    gender: Gender
+    document_type: DocumentType
+    document_number: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    blood_type: Optional[str] = None
+    created_at: Optional[datetime] = None
+    is_active: bool = True
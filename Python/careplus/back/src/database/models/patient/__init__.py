@@ -1,3 +1,5 @@
 from .__PatientCreate import PatientCreate
 from .__PatientUpdate import PatientUpdate
 from .__PatientResponse import PatientResponse
+from .__PatientSummary import PatientSummary
+from .__PatientChart import PatientChart
@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+
+class DayCount(BaseModel):
+    day: date
+    count: int
+
+
+class DoctorCount(BaseModel):
+    # consultations.created_by
+    doctor_id: Optional[str] = None
+    consultations: int
+
+
+class CityCount(BaseModel):
+    city: Optional[str] = None
+    new_patients: int
+
+
+class ConsultationStats(BaseModel):
+    date_from: date
+    date_to: date
+    total: int
+    by_day: list[DayCount]
+    by_status: dict[str, int]
+    by_doctor: list[DoctorCount]
+    # Último refresco de los rollups (las cifras no incluyen cambios posteriores)
+    refreshed_at: Optional[datetime] = None
+
+
+class DiagnosisStats(BaseModel):
+    date_from: date
+    date_to: date
+    total: int
+    by_severity: dict[str, int]
+    by_type: dict[str, int]
+    refreshed_at: Optional[datetime] = None
+
+
+class TreatmentStats(BaseModel):
+    # Tratamientos activos ahora (no depende del periodo)
+    total: int
+    by_type: dict[str, int]
+    refreshed_at: Optional[datetime] = None
+
+
+class PatientStats(BaseModel):
+    date_from: date
+    date_to: date
+    total: int
+    by_day: list[DayCount]
+    by_city: list[CityCount]
+    refreshed_at: Optional[datetime] = None
@@ -0,0 +1 @@
+from .__DashboardStats import ConsultationStats, DiagnosisStats, TreatmentStats, PatientStats, DayCount, DoctorCount, CityCount
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date, datetime
+
+from src.database.enums import TreatmentType, TreatmentStatus
+
+
+class TreatmentSummary(BaseModel):
+    id: str
+    patient_id: str
+    diagnostic_id: Optional[str] = None
+    name: str
+    treatment_type: TreatmentType
+    dosage: Optional[str] = None
+    frequency: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: TreatmentStatus
+    created_at: Optional[datetime] = None
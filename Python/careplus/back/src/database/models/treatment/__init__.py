@@ -1,3 +1,4 @@
 from .__TreatmentCreate import TreatmentCreate
 from .__TreatmentUpdate import TreatmentUpdate
 from .__TreatmentResponse import TreatmentResponse
+from .__TreatmentSummary import TreatmentSummary
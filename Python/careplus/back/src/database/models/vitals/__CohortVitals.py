@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class VitalStats(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    p10: Optional[float] = None
+    p90: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    # Pacientes por debajo / por encima del rango de referencia
+    low: Optional[int] = None
+    high: Optional[int] = None
+
+
+class CohortVitalsGroup(BaseModel):
+    group: str
+    patients: int
+    metrics: dict[str, VitalStats]
+
+
+class CohortVitals(BaseModel):
+    patients: int
+    consultations: int
+    metrics: dict[str, VitalStats]
+    groups: list[CohortVitalsGroup] = []
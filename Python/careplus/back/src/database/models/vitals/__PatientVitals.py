@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+
+from .__VitalsPoint import VitalsPoint
+
+
+class VitalRange(BaseModel):
+    low: float
+    high: float
+
+
+class PatientVitals(BaseModel):
+    # Consultas de cada media móvil
+    window: int
+    count: int
+    latest: Optional[VitalsPoint] = None
+    points: list[VitalsPoint] = []
+    ranges: dict[str, VitalRange] = {}
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class VitalsPoint(BaseModel):
+    '''Signos vitales de una consulta con sus métricas derivadas'''
+
+    consultation_id: str
+    consultation_date: datetime
+    weight_kg: Optional[float] = None
+    height_cm: Optional[float] = None
+    bmi: Optional[float] = None
+    heart_rate: Optional[int] = None
+    temperature_c: Optional[float] = None
+    systolic: Optional[int] = None
+    diastolic: Optional[int] = None
+    # Media móvil y diferencia con la medición anterior, por métrica
+    averages: dict[str, Optional[float]] = {}
+    deltas: dict[str, Optional[float]] = {}
+    # <métrica>_low / <métrica>_high
+    flags: list[str] = []
@@ -0,0 +1,3 @@
+from .__VitalsPoint import VitalsPoint
+from .__PatientVitals import PatientVitals, VitalRange
+from .__CohortVitals import CohortVitals, CohortVitalsGroup, VitalStats
@@ -2,11 +2,12 @@ from dataclasses import dataclass
 from src._settings import settings
 
 from supabase import (
-    create_client,
-    Client,
-    ClientOptions
+    AsyncClient,
+    AsyncClientOptions
 )
 
+from ._client_factory import get_client_factory
+
 from supabase_auth import (
     SignInWithPasswordCredentials,
     SignUpWithPasswordCredentials
@@ -34,29 +35,36 @@ class SupabaseSignUpResult:
 class SupabaseClient:
     """Supabase Client
     
-    **Inherits**: Client
+    **Inherits**: AsyncClient
     """
     
     def __init__(
         self,
         access_token: Optional[str] = None,
-        options: Optional[ClientOptions] = None
+        options: Optional[AsyncClientOptions] = None
     ):
         
         if options is None:
-            options = ClientOptions()
+            # Reusar los clientes de la fábrica (pool de conexiones compartido)
+            factory = get_client_factory()
+            self.__client: AsyncClient = (
+                factory.for_token(access_token)
+                if access_token
+                else factory.anon
+            )
+            return
         
         if access_token:
             options.headers['Authorization'] = f'Bearer {access_token}'
         
         self.__new_client(options)
     
-    def __new_client(self, options: Optional[ClientOptions] = None):
+    def __new_client(self, options: Optional[AsyncClientOptions] = None):
         '''Generate a new client following the new options
         
         :param self: Description
         :param new_options: Description
-        :type new_options: Optional[ClientOptions]
+        :type new_options: Optional[AsyncClientOptions]
         '''
         
         url: Optional[str] = settings.supabase_url
@@ -65,30 +73,28 @@ class SupabaseClient:
         if url is None or key is None:
             raise Exception("Supabase url or key not exists!")
         
-        self.__client: Client = create_client(url, key, options)
+        self.__client = AsyncClient(url, key, options)
     
     @staticmethod
-    def generate_client() -> Client:
-        return create_client(settings.supabase_url, settings.supabase_key)
+    def generate_client() -> AsyncClient:
+        """Shared client using the anon key."""
+        return get_client_factory().anon
     
     @staticmethod
-    def generate_admin_client() -> Client:
-        """Generate a client using the service_role key for admin operations."""
-        service_key = settings.supabase_service_role_key
-        if not service_key:
-            raise Exception("Service role key not configured. Set PROD/TEST_SUPABASE_SERVICE_ROLE_KEY in .env")
-        return create_client(settings.supabase_url, service_key)
+    def generate_admin_client() -> AsyncClient:
+        """Shared client using the service_role key for admin operations."""
+        return get_client_factory().admin
     
     @property
     def client(self):
         return self.__client
     
     @staticmethod
-    def sign_in(args: SignInWithPasswordCredentials) -> SupabaseLoginResult:
+    async def sign_in(args: SignInWithPasswordCredentials) -> SupabaseLoginResult:
         
-        client = SupabaseClient.generate_client()
+        auth = get_client_factory().auth_client()
         
-        response = client.auth.sign_in_with_password(credentials=args)
+        response = await auth.sign_in_with_password(credentials=args)
         
         if not response.session:
             raise Exception("Invalid Credentials")
@@ -102,11 +108,11 @@ class SupabaseClient:
         )
 
     @staticmethod
-    def sign_up(args: SignUpWithPasswordCredentials) -> SupabaseSignUpResult:
+    async def sign_up(args: SignUpWithPasswordCredentials) -> SupabaseSignUpResult:
         
-        client = SupabaseClient.generate_client()
+        auth = get_client_factory().auth_client()
         
-        response = client.auth.sign_up(credentials=args)
+        response = await auth.sign_up(credentials=args)
         
         if not response.user:
             raise Exception("Sign up failed")
@@ -119,12 +125,12 @@ class SupabaseClient:
         )
 
     @staticmethod
-    def admin_create_user(email: str, password: str) -> SupabaseSignUpResult:
+    async def admin_create_user(email: str, password: str) -> SupabaseSignUpResult:
         """Create a user using the admin/service_role API (skips email confirmation)."""
         
         admin_client = SupabaseClient.generate_admin_client()
         
-        response = admin_client.auth.admin.create_user({
+        response = await admin_client.auth.admin.create_user({
             "email": email,
             "password": password,
             "email_confirm": True,
@@ -141,11 +147,11 @@ class SupabaseClient:
         )
 
     @staticmethod
-    def refresh_session(refresh_token: str) -> SupabaseLoginResult:
+    async def refresh_session(refresh_token: str) -> SupabaseLoginResult:
         """Refresh an expired session using the refresh_token."""
         
-        client = SupabaseClient.generate_client()
-        response = client.auth.refresh_session(refresh_token)
+        auth = get_client_factory().auth_client()
+        response = await auth.refresh_session(refresh_token)
         
         if not response.session:
             raise Exception("Could not refresh session")
@@ -159,8 +165,8 @@ class SupabaseClient:
         )
 
     @staticmethod
-    def admin_delete_user(user_id: str) -> None:
+    async def admin_delete_user(user_id: str) -> None:
         """Delete a user from Supabase Auth using the service_role key."""
         
         admin_client = SupabaseClient.generate_admin_client()
-        admin_client.auth.admin.delete_user(user_id)
\ No newline at end of file
+        await admin_client.auth.admin.delete_user(user_id)
\ No newline at end of file
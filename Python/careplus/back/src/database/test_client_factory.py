@@ -0,0 +1,33 @@
+import asyncio
+from ._client_factory import SupabaseClientFactory
+
+def test_clients_are_reused():
+    
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", "service-key", token_client_cache_size=2)
+    
+    assert factory.anon is factory.anon
+    assert factory.admin is factory.admin
+    assert factory.for_token("token-a") is factory.for_token("token-a")
+    assert factory.for_token("token-a") is not factory.for_token("token-b")
+    
+    # Todos los clientes comparten el mismo transporte HTTP
+    assert factory.for_token("token-a").postgrest.session is factory.http
+    assert factory.admin.postgrest.session is factory.http
+    
+    metrics = factory.metrics()
+    assert metrics['clients_created'] == 4
+    assert metrics['token_clients_cached'] == 2
+    assert metrics['token_client_hits'] >= 3
+    
+    asyncio.run(factory.close())
+
+def test_token_clients_are_bounded():
+    
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", token_client_cache_size=2)
+    
+    for token in ("a", "b", "c"):
+        factory.for_token(token)
+    
+    assert factory.metrics()['token_clients_cached'] == 2
+    
+    asyncio.run(factory.close())
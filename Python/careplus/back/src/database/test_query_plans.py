@@ -0,0 +1,207 @@
+"""Regresión de planes: las consultas reales de los listados deben usar índices.
+
+Requiere un Supabase local (``supabase db reset``) con las migraciones y
+``seeds/query_plans.sql``, que habilita los planes por la API y crea
+``query_plans_seed``: unas 20k fichas con sus consultas, diagnósticos, tratamientos
+y códigos OTP. Las rutas se ejecutan tal cual; el transporte pide a PostgREST el
+plan de cada consulta (``application/vnd.pgrst.plan+json``) en lugar de las filas.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src._settings import settings
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from src.utils.database import encode_cursor
+
+requires_supabase = pytest.mark.skipif(
+    not (settings.env_is_local() and settings.supabase_url and settings.supabase_service_role_key),
+    reason="Requiere un Supabase local (supabase db reset) con seeds/query_plans.sql",
+)
+
+# Tablas que nunca deben recorrerse completas en estas consultas
+VOLUME_TABLES = {'patients', 'consultations', 'diagnostics', 'treatments', 'verification_codes'}
+
+
+class PlanTransport(httpx.AsyncBaseTransport):
+    '''Asks PostgREST for the plan of every read of ``VOLUME_TABLES`` and records it;
+    the rest (e.g. the ``table_watermark`` rpc) get their rows as usual'''
+
+    def __init__(self):
+        self.inner = httpx.AsyncHTTPTransport(http2=True)
+        self.plans: list[tuple[str, list]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        relation = request.url.path.rsplit('/', 1)[-1]
+        explain = request.method == 'GET' and '/rest/v1/' in request.url.path and relation in VOLUME_TABLES
+        if explain and 'pgrst.plan' not in request.headers.get('accept', ''):
+            accept = request.headers.get('accept', '*/*')
+            accept = 'application/json' if accept == '*/*' else accept
+            request.headers['accept'] = f'application/vnd.pgrst.plan+json; for="{accept}"'
+
+        response = await self.inner.handle_async_request(request)
+        if explain:
+            await response.aread()
+            if response.status_code != 200:
+                pytest.fail(f"PostgREST no devolvió el plan ({response.status_code}): {response.text}")
+            self.plans.append((relation, response.json()))
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+def _nodes(plan) -> Iterator[dict]:
+    if isinstance(plan, list):
+        for item in plan:
+            yield from _nodes(item)
+    elif isinstance(plan, dict):
+        if 'Node Type' in plan:
+            yield plan
+        for key in ('Plan', 'Plans'):
+            if key in plan:
+                yield from _nodes(plan[key])
+
+
+def _scans(plan) -> dict[str, set[str]]:
+    '''Relation -> scan descriptions ("Seq Scan", "Index Scan idx_...")'''
+
+    scans: dict[str, set[str]] = {}
+    for node in _nodes(plan):
+        relation = node.get('Relation Name')
+        if relation:
+            label = node['Node Type'] + (f" {node['Index Name']}" if node.get('Index Name') else '')
+            scans.setdefault(relation, set()).add(label)
+    return scans
+
+
+def _factory(transport: Optional[httpx.AsyncBaseTransport] = None) -> SupabaseClientFactory:
+    return SupabaseClientFactory(
+        settings.supabase_url, settings.supabase_key, settings.supabase_service_role_key, transport=transport,
+    )
+
+
+@pytest.fixture(scope='module')
+def seeded() -> dict:
+    async def seed() -> dict:
+        factory = _factory()
+        try:
+            return (await factory.admin.rpc('query_plans_seed', {}).execute()).data
+        finally:
+            await factory.close()
+
+    try:
+        return asyncio.run(seed())
+    except Exception as e:
+        pytest.fail(f"query_plans_seed no disponible (¿supabase db reset con seeds/query_plans.sql?): {e}")
+
+
+@pytest.fixture(scope='module')
+def routes(seeded) -> Iterator[tuple[TestClient, PlanTransport]]:
+    from routers.patients import PATIENTS_ROUTER
+    from routers.queries import CONSULTATIONS_ROUTER
+    from routers.diagnostics import DIAGNOSTICS_ROUTER
+    from routers.treatments import TREATMENTS_ROUTER
+
+    transport = PlanTransport()
+    factory = _factory(transport)
+
+    app = FastAPI()
+    for router in (PATIENTS_ROUTER, CONSULTATIONS_ROUTER, DIAGNOSTICS_ROUTER, TREATMENTS_ROUTER):
+        app.include_router(router)
+    # service_role: las políticas de estas tablas son USING (true), el plan es el mismo.
+    # Sin usuario no se usa la caché de respuestas: cada petición llega a la base de datos
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.admin, user=None, token='plans')
+
+    # La respuesta de cada ruta es un plan, no filas: solo interesa lo registrado
+    with TestClient(app, raise_server_exceptions=False) as client:
+        yield client, transport
+        # El pool de conexiones vive en el event loop del TestClient
+        client.portal.call(factory.close)
+
+
+def _deep_cursor() -> str:
+    # Unos 10k pacientes más atrás (el volumen se crea a un minuto por paciente)
+    return encode_cursor((datetime.now(timezone.utc) - timedelta(days=7)).isoformat(), 'ffffffff-ffff-ffff-ffff-ffffffffffff')
+
+
+# (ruta, query params, tabla principal, índice esperado o None si basta con no recorrer la tabla)
+ROUTE_CASES = [
+    ('/patients/', {'is_active': 'true'}, 'patients', 'idx_patients_active_created_id'),
+    ('/patients/', {'is_active': 'true', 'cursor': _deep_cursor}, 'patients', None),
+    ('/consultations/', {'patient_id': 'patient_id'}, 'consultations', 'idx_consultations_patient_date_id'),
+    ('/consultations/', {'patient_id': 'patient_id', 'status': 'completada'}, 'consultations', 'idx_consultations_patient_date_id'),
+    ('/consultations/', {'status': 'en_curso'}, 'consultations', 'idx_consultations_status_date_id'),
+    ('/diagnostics/', {'patient_id': 'patient_id'}, 'diagnostics', 'idx_diagnostics_patient_created_id'),
+    ('/treatments/', {'status': 'suspendido'}, 'treatments', 'idx_treatments_status_created_id'),
+    ('/patients/{patient_id}/chart', {}, 'treatments', None),
+]
+
+
+def _resolve(value, seeded: dict):
+    if callable(value):
+        return value()
+    return seeded.get(value, value)
+
+
+@requires_supabase
+@pytest.mark.parametrize('path, params, table, index', ROUTE_CASES)
+def test_router_query_uses_index(routes, seeded, path: str, params: dict, table: str, index: Optional[str]):
+    client, transport = routes
+    transport.plans.clear()
+
+    client.get(path.format(**seeded), params={name: _resolve(value, seeded) for name, value in params.items()})
+
+    plans = [plan for relation, plan in transport.plans if relation == path.strip('/').split('/')[0]]
+    assert plans, f"La ruta no consultó la tabla: {[relation for relation, _ in transport.plans]}"
+
+    scans = _scans(plans)
+    for relation in VOLUME_TABLES & scans.keys():
+        assert not any(scan.startswith('Seq Scan') for scan in scans[relation]), f"Seq Scan sobre {relation}: {scans}"
+    assert table in scans, f"{table} no aparece en el plan: {scans}"
+    if index:
+        assert any(scan.endswith(f' {index}') for scan in scans[table]), f"{table} no usa {index}: {scans}"
+
+
+@requires_supabase
+def test_pending_verification_code_lookup_uses_partial_index(seeded):
+    # Misma forma que verify_verification_code() (el plan de una función no se ve por la API)
+    transport = PlanTransport()
+
+    async def lookup() -> None:
+        factory = _factory(transport)
+        try:
+            await factory.admin.table('verification_codes').select('*').eq(
+                'user_id', seeded['user_id']
+            ).eq(
+                'used', False
+            ).gte(
+                'expires_at', datetime.now(timezone.utc).isoformat()
+            ).order('created_at', desc=True).limit(1).execute()
+        finally:
+            await factory.close()
+
+    asyncio.run(lookup())
+
+    scans = _scans([plan for _, plan in transport.plans])
+    assert not any(scan.startswith('Seq Scan') for scan in scans['verification_codes']), scans
+    assert any(scan.endswith(' idx_verification_codes_pending') for scan in scans['verification_codes']), scans
+
+
+def test_plan_walker_flags_sequential_scans():
+    plan = [{'Plan': {'Node Type': 'Limit', 'Plans': [
+        {'Node Type': 'Seq Scan', 'Relation Name': 'patients'},
+        {'Node Type': 'Index Scan', 'Relation Name': 'consultations', 'Index Name': 'idx_consultations_status_date_id'},
+    ]}}]
+    assert _scans(plan) == {
+        'patients': {'Seq Scan'},
+        'consultations': {'Index Scan idx_consultations_status_date_id'},
+    }
@@ -1,3 +1,5 @@
-from ._get_auth_context import get_auth_context
+from ._get_auth_context import get_auth_context, revoke_user_tokens
 from ._otp import generate_otp, store_otp, verify_otp
-from ._email import send_otp_email
\ No newline at end of file
+from ._email import send_otp_email
+from ._roles import get_user_role, get_user_roles, invalidate_user_roles
+from ._reference_catalog import reference_catalog
\ No newline at end of file
@@ -1,37 +1,131 @@
+"""Autenticación de las peticiones (``get_auth_context``).
+
+Con ``AUTH_VERIFICATION_MODE=local`` el JWT se verifica en el proceso y el usuario
+se arma con sus claims, sin consultar a Supabase Auth; si no se puede verificar
+localmente se recurre a ``auth.get_user`` (``AUTH_REMOTE_FALLBACK``).
+
+La lista de revocación de ``revoke_user_tokens`` vive en la memoria de cada
+proceso: una revocación no llega a las demás instancias de la API, que siguen
+aceptando los tokens del usuario hasta que expiran.
+"""
+
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from src._settings import settings
 from src.database import SupabaseClient
-from supabase_auth import UserResponse
+from supabase_auth import UserResponse, User
+import hashlib
 import logging
+import time
+import jwt
 from src.database.classes import AuthContext
+from src._cache import TTLCache
+from src.utils.database import decode_supabase_token, TokenVerificationUnavailable
+from src.utils.database._decode_supabase_token import HMAC_ALGORITHMS
 
 security = HTTPBearer()
 
-def get_auth_context(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthContext:
-    
+EXPIRED_TOKEN_DETAIL = "Token expirado o inválido. Por favor, usa tu refresh_token para obtener un nuevo token en /auth/refresh."
+
+# Tokens rechazados recientemente (evita re-verificar el mismo token inválido)
+_rejected_tokens = TTLCache(settings.auth_negative_cache_ttl_seconds, max_size=4096)
+
+# user_id -> instante de revocación; se rechazan los tokens emitidos antes
+_revoked_users = TTLCache(settings.auth_revocation_ttl_seconds, max_size=4096)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def revoke_user_tokens(user_id: str) -> None:
+    """Invalida en este proceso los tokens ya emitidos para el usuario."""
+    _revoked_users.set(user_id, time.time())
+
+
+def _is_revoked(claims: dict) -> bool:
+    revoked_at = _revoked_users.get(claims['sub'])
+    return revoked_at is not None and claims.get('iat', 0) <= revoked_at
+
+
+def _user_from_claims(claims: dict) -> UserResponse:
+    """Construye un UserResponse equivalente al de auth.get_user a partir de los claims.
+
+    El JWT no trae la fecha de alta de la cuenta: ``created_at`` queda sin asignar
+    (``iat`` es la emisión del token, no la creación del usuario).
+    """
+    aud = claims.get('aud', '')
+
+    return UserResponse(user=User.model_construct(
+        id=claims['sub'],
+        aud=aud if isinstance(aud, str) else ','.join(aud),
+        email=claims.get('email'),
+        phone=claims.get('phone'),
+        role=claims.get('role'),
+        app_metadata=claims.get('app_metadata') or {},
+        user_metadata=claims.get('user_metadata') or {},
+        is_anonymous=claims.get('is_anonymous', False),
+    ))
+
+
+async def _verify_locally(token: str) -> UserResponse|None:
+    """Verifica el token en proceso. Retorna None si hay que recurrir a get_user."""
+    try:
+        if jwt.get_unverified_header(token).get('alg') in HMAC_ALGORITHMS:
+            claims = decode_supabase_token(token)
+        else:
+            # La consulta del JWKS (si no está en caché) es bloqueante
+            claims = await run_in_threadpool(decode_supabase_token, token)
+    except TokenVerificationUnavailable as e:
+        logging.debug(f"Local token verification unavailable: {e}")
+        if not settings.auth_remote_fallback:
+            raise HTTPException(status_code=401, detail="No se pudo autenticar el usuario.")
+        return None
+    except jwt.PyJWTError:
+        _rejected_tokens.set(_token_key(token), True)
+        raise HTTPException(status_code=401, detail=EXPIRED_TOKEN_DETAIL)
+
+    if _is_revoked(claims):
+        raise HTTPException(status_code=401, detail=EXPIRED_TOKEN_DETAIL)
+
+    return _user_from_claims(claims)
+
+
+async def get_auth_context(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthContext:
+
     token = credentials.credentials
-    
+
     logging.debug("Received authorization credentials.")
-    
+
+    if _rejected_tokens.get(_token_key(token)):
+        raise HTTPException(status_code=401, detail=EXPIRED_TOKEN_DETAIL)
+
+    user: UserResponse|None = None
+    if settings.auth_verification_mode == 'local':
+        user = await _verify_locally(token)
+
     try:
         client = SupabaseClient(token).client
-        user: UserResponse|None = client.auth.get_user(token)
+        if user is None:
+            user = await client.auth.get_user(token)
     except Exception as e:
         error_msg = str(e).lower()
         if "expired" in error_msg or "invalid" in error_msg or "token" in error_msg:
+            _rejected_tokens.set(_token_key(token), True)
             raise HTTPException(
                 status_code=401,
-                detail="Token expirado o inválido. Por favor, usa tu refresh_token para obtener un nuevo token en /auth/refresh."
+                detail=EXPIRED_TOKEN_DETAIL
             )
         raise HTTPException(
             status_code=401,
             detail="No se pudo autenticar el usuario."
         )
-    
+
     return AuthContext(
         client=client,
         user=user,
         token=token
     )
-    
-    
\ No newline at end of file
+
+
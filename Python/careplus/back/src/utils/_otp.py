@@ -1,85 +1,70 @@
 import secrets
 import string
-from datetime import datetime, timedelta, timezone
-from src.database import SupabaseClient
+from typing import Optional
+
+from .otp import OtpStore, get_otp_store
 
 OTP_LENGTH = 6
 OTP_EXPIRY_MINUTES = 10
 OTP_MAX_ATTEMPTS = 5
 
+OTP_ERRORS = {
+    'not_found': 'Código expirado o no encontrado. Inicia sesión nuevamente.',
+    'locked': 'Máximo de intentos alcanzado. Inicia sesión nuevamente.',
+}
+
 
 def generate_otp() -> str:
     """Genera un código OTP de 6 dígitos."""
     return ''.join(secrets.choice(string.digits) for _ in range(OTP_LENGTH))
 
 
-def store_otp(user_id: str, email: str, code: str, access_token: str, refresh_token: str = "") -> bool:
-    """Almacena el código OTP en la tabla verification_codes junto con el access_token y refresh_token."""
-    
-    client = SupabaseClient(access_token).client
-    expires_at = (datetime.now(timezone.utc) + timedelta(minutes=OTP_EXPIRY_MINUTES)).isoformat()
-    
-    # Invalidar códigos anteriores del usuario
-    client.table('verification_codes').update({
-        'used': True
-    }).eq('user_id', user_id).eq('used', False).execute()
-    
-    # Insertar nuevo código con el access_token y refresh_token
-    client.table('verification_codes').insert({
-        'user_id': user_id,
-        'email': email,
-        'code': code,
-        'access_token': access_token,
-        'refresh_token': refresh_token,
-        'expires_at': expires_at,
-        'attempts': 0,
-        'max_attempts': OTP_MAX_ATTEMPTS
-    }).execute()
-    
+async def store_otp(user_id: str, email: str, code: str, access_token: str, refresh_token: str = "",
+                    store: Optional[OtpStore] = None) -> bool:
+    """Almacena el código OTP junto con el access_token y refresh_token.
+
+    Reemplaza el código pendiente del usuario en el almacén configurado
+    (OTP_BACKEND); con la tabla es una sola llamada a ``store_verification_code``.
+    """
+
+    store = store or get_otp_store()
+
+    await store.store(
+        user_id,
+        email,
+        code,
+        access_token,
+        refresh_token,
+        ttl_seconds=OTP_EXPIRY_MINUTES * 60,
+        max_attempts=OTP_MAX_ATTEMPTS,
+    )
+
     return True
 
 
-def verify_otp(user_id: str, code: str, access_token: str) -> dict:
-    """Verifica el código OTP. Retorna el access_token original si es válido."""
-    
-    client = SupabaseClient(access_token).client
-    
-    # Buscar el código más reciente no usado y no expirado
-    result = client.table('verification_codes').select('*').eq(
-        'user_id', user_id
-    ).eq(
-        'used', False
-    ).gte(
-        'expires_at', datetime.now(timezone.utc).isoformat()
-    ).order(
-        'created_at', desc=True
-    ).limit(1).execute()
-    
-    if not result.data:
-        return {'valid': False, 'error': 'Código expirado o no encontrado'}
-    
-    record = result.data[0]
-    
-    # Verificar intentos máximos
-    if record['attempts'] >= record['max_attempts']:
-        client.table('verification_codes').update({
-            'used': True
-        }).eq('id', record['id']).execute()
-        return {'valid': False, 'error': 'Máximo de intentos alcanzado. Solicita un nuevo código.'}
-    
-    # Incrementar intentos
-    client.table('verification_codes').update({
-        'attempts': record['attempts'] + 1
-    }).eq('id', record['id']).execute()
-    
-    # Verificar código
-    if record['code'] != code:
-        remaining = record['max_attempts'] - record['attempts'] - 1
-        return {'valid': False, 'error': f'Código incorrecto. {remaining} intentos restantes.'}
-    
-    # Marcar como usado
-    client.table('verification_codes').update({
-        'used': True
-    }).eq('id', record['id']).execute()
-    
-    return {'valid': True, 'access_token': record['access_token']}
+async def verify_otp(user_id: str, code: str, store: Optional[OtpStore] = None) -> dict:
+    """Verifica el código OTP. Retorna el access_token original si es válido.
+
+    Cada almacén resuelve la comparación y el contador de intentos de forma
+    atómica, así que intentos concurrentes no pueden superar ``max_attempts``.
+    """
+
+    store = store or get_otp_store()
+
+    record = await store.verify(user_id, code)
+    status = record['status']
+
+    if status == 'valid':
+        return {
+            'valid': True,
+            'status': status,
+            'access_token': record['access_token'],
+            'refresh_token': record['refresh_token'],
+        }
+
+    if status == 'invalid':
+        error = f"Código incorrecto. {record['remaining_attempts']} intentos restantes."
+    else:
+        error = OTP_ERRORS.get(status, OTP_ERRORS['not_found'])
+
+    return {'valid': False, 'status': status, 'error': error}
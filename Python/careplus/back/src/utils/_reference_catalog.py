@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from supabase import AsyncClient
+from src.database import SupabaseClient
+from src.database.classes import AuthContext
+from src.database.enums import DocumentType
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCatalog:
+    """Catálogo en memoria de tablas de referencia (roles, tipos de documento).
+
+    Se carga una vez en el lifespan con el cliente service_role y se refresca cada
+    ``interval`` segundos o a demanda con ``refresh()``. Las búsquedas son O(1) por
+    nombre; si un nombre no está (p. ej. un rol creado después de la última carga) se
+    consulta a la base de datos y se incorpora al catálogo.
+    """
+
+    def __init__(self):
+        self.__roles: dict[str, dict] = {}
+        self.__document_types: dict[str, dict] = {}
+        self.__task: Optional[asyncio.Task] = None
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    async def refresh(self, client: Optional[AsyncClient] = None) -> None:
+        '''Reload every reference table from the database
+
+        :param client: Client to use (service_role by default)
+        '''
+
+        client = client or SupabaseClient.generate_admin_client()
+
+        roles = await client.table('roles').select('*').execute()
+        self.__roles = {row['name']: row for row in roles.data}
+
+        try:
+            document_types = await client.table('document_types').select('*').execute()
+            self.__document_types = {
+                row.get('name') or row.get('code'): row
+                for row in document_types.data
+            }
+        except Exception as e:
+            # Sin tabla document_types: los valores válidos son los del enum
+            logger.debug(f"document_types not available, using enum ({e})")
+            self.__document_types = {item.value: {'name': item.value} for item in DocumentType}
+
+        self.loaded_at = time.time()
+        logger.info(f"Reference catalog loaded: {len(self.__roles)} roles, {len(self.__document_types)} document types")
+
+    def role(self, name: str) -> Optional[dict]:
+        '''Role row (id, name, can_manage_* flags) by name, from memory'''
+
+        row = self.__roles.get(name)
+        if row is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return row
+
+    async def lookup_role(self, auth: AuthContext, name: str) -> Optional[dict]:
+        '''Role row by name; queries the database only when the name is not cached'''
+
+        row = self.role(name)
+        if row is None:
+            result = await auth.client.table('roles').select('*').eq('name', name).limit(1).execute()
+            if not result.data:
+                return None
+            row = result.data[0]
+            self.__roles[name] = row
+        return row
+
+    async def role_id(self, auth: AuthContext, name: str) -> Optional[str]:
+        '''Role id by name; queries the database only when the name is not cached'''
+
+        row = await self.lookup_role(auth, name)
+        return row['id'] if row is not None else None
+
+    @property
+    def roles(self) -> list[dict]:
+        return list(self.__roles.values())
+
+    @property
+    def document_types(self) -> list[dict]:
+        return list(self.__document_types.values())
+
+    async def __refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Reference catalog refresh failed: {e}")
+
+    async def start(self, interval: float) -> None:
+        '''Initial load plus periodic refresh (interval <= 0 disables it)'''
+
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Reference catalog not loaded at startup: {e}")
+
+        if interval > 0 and self.__task is None:
+            self.__task = asyncio.create_task(self.__refresh_loop(interval))
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    def metrics(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'roles': len(self.__roles),
+            'document_types': len(self.__document_types),
+            'loaded_at': self.loaded_at,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+reference_catalog = ReferenceCatalog()
@@ -0,0 +1,105 @@
+import logging
+from typing import Iterable, Optional
+
+from src._cache import TTLCache, get_redis
+from src._settings import settings
+from src.database.classes import AuthContext
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'careplus:role:'
+
+# user_id -> nombre del rol (nivel 1: memoria del proceso)
+_role_cache = TTLCache(settings.role_cache_ttl_seconds, max_size=4096)
+
+
+async def _redis_get_many(user_ids: list[str]) -> dict[str, str]:
+    redis = get_redis()
+    if redis is None or not user_ids:
+        return {}
+
+    try:
+        values = await redis.mget([REDIS_KEY_PREFIX + user_id for user_id in user_ids])
+    except Exception as e:
+        logger.warning(f"Role cache: Redis unavailable ({e})")
+        return {}
+
+    return {user_id: value for user_id, value in zip(user_ids, values) if value}
+
+
+async def _redis_set_many(roles: dict[str, str]) -> None:
+    redis = get_redis()
+    if redis is None or not roles:
+        return
+
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id, role in roles.items():
+                pipe.set(REDIS_KEY_PREFIX + user_id, role, ex=settings.role_cache_ttl_seconds)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Role cache: Redis unavailable ({e})")
+
+
+async def get_user_roles(auth: AuthContext, user_ids: Iterable[str]) -> dict[str, str]:
+    """Resuelve el nombre del rol de varios usuarios.
+
+    Consulta en orden la caché en memoria, Redis (si está configurado) y, para los
+    que falten, una sola consulta ``user_roles -> roles(name)`` con ``IN``.
+    Los usuarios sin rol no aparecen en el resultado.
+    """
+
+    roles: dict[str, str] = {}
+    missing: list[str] = []
+
+    for user_id in dict.fromkeys(user_ids):
+        role = _role_cache.get(user_id)
+        if role is None:
+            missing.append(user_id)
+        else:
+            roles[user_id] = role
+
+    if missing:
+        from_redis = await _redis_get_many(missing)
+        for user_id, role in from_redis.items():
+            _role_cache.set(user_id, role)
+        roles.update(from_redis)
+        missing = [user_id for user_id in missing if user_id not in from_redis]
+
+    if missing:
+        result = await auth.client.table('user_roles').select(
+            'user_id, roles(name)'
+        ).in_('user_id', missing).execute()
+
+        from_db = {
+            row['user_id']: row['roles']['name']
+            for row in result.data
+            if row.get('roles')
+        }
+        for user_id, role in from_db.items():
+            _role_cache.set(user_id, role)
+        await _redis_set_many(from_db)
+        roles.update(from_db)
+
+    return roles
+
+
+async def get_user_role(auth: AuthContext, user_id: str) -> Optional[str]:
+    """Nombre del rol de un usuario, o None si no tiene rol asignado."""
+    return (await get_user_roles(auth, [user_id])).get(user_id)
+
+
+async def invalidate_user_roles(*user_ids: str) -> None:
+    """Elimina los roles cacheados tras modificar o eliminar usuarios."""
+
+    for user_id in user_ids:
+        _role_cache.delete(user_id)
+
+    redis = get_redis()
+    if redis is None or not user_ids:
+        return
+
+    try:
+        await redis.delete(*[REDIS_KEY_PREFIX + user_id for user_id in user_ids])
+    except Exception as e:
+        logger.warning(f"Role cache: Redis unavailable ({e})")
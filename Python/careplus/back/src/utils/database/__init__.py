@@ -0,0 +1,5 @@
+from ._decode_supabase_token import decode_supabase_token, TokenVerificationUnavailable
+from ._paginate import paginate, encode_cursor, decode_cursor
+from ._fields import select_fields, FieldSelection, View
+from ._stream import iter_pages, ndjson_chunk, csv_chunk
+from ._bulk import bulk_insert, insert_rows
@@ -0,0 +1,116 @@
+import uuid
+from typing import Any, Optional
+
+import httpx
+from postgrest.exceptions import APIError
+from pydantic import BaseModel, ValidationError
+
+
+def _db_error(error: APIError) -> str:
+    return error.message or str(error)
+
+
+def _transport_error(error: httpx.TransportError) -> str:
+    # Sin respuesta no se sabe si el INSERT llegó a confirmarse
+    return f"Sin respuesta de la base de datos, el registro pudo no guardarse ({type(error).__name__}: {error})"
+
+
+async def insert_rows(client, table: str, rows: list[dict]) -> list[tuple[int, str]]:
+    '''Insert ``rows`` in a single multi-row INSERT (``return=minimal``, ``missing=default``);
+    if the database rejects it, retry row by row to find the failing ones. A
+    connection error or timeout marks the rows it covered as failed instead of
+    raising, so earlier batches of the caller stay reported
+
+    :param client: Supabase client of the caller (RLS applies)
+    :param table: Target table
+    :param rows: Rows already validated
+    :return: (position in ``rows``, error) of every rejected row
+    :rtype: list[tuple[int, str]]
+    '''
+
+    try:
+        await client.table(table).insert(rows, returning='minimal', default_to_null=False).execute()
+        return []
+    except APIError:
+        pass
+    except httpx.TransportError as e:
+        return [(position, _transport_error(e)) for position in range(len(rows))]
+
+    failures: list[tuple[int, str]] = []
+    for position, row in enumerate(rows):
+        try:
+            await client.table(table).insert(row, returning='minimal').execute()
+        except APIError as e:
+            failures.append((position, _db_error(e)))
+        except httpx.TransportError as e:
+            failures.append((position, _transport_error(e)))
+    return failures
+
+
+async def bulk_insert(
+    client,
+    table: str,
+    model: type[BaseModel],
+    items: list[dict[str, Any]],
+    created_by: Optional[str],
+    batch_size: int,
+) -> tuple[dict, list[dict]]:
+    """Alta masiva: valida todos los registros y los inserta en INSERTs de varias filas.
+
+    - Cada registro se valida por separado con ``model``: los inválidos se reportan y
+      el resto se inserta igual.
+    - Los ``id`` se generan aquí, así el resultado de cada registro no depende del
+      orden en que PostgREST devuelva las filas y se puede usar ``return=minimal``.
+    - ``missing=default``: las columnas omitidas toman el DEFAULT de la tabla aunque
+      otros registros del mismo INSERT sí las traigan.
+    - Si un lote falla (p. ej. un documento duplicado) se reintenta fila a fila para
+      saber qué registros rechazó la base de datos.
+    - Un error de conexión o un timeout marca como ``failed`` los registros de ese
+      lote (con su ``id``, para comprobar si llegaron a guardarse) y se sigue con el
+      siguiente: el resultado siempre cubre todos los registros.
+
+    :param client: Supabase client of the caller (RLS applies)
+    :param table: Target table
+    :param model: ``*Create`` model used to validate each item
+    :param items: Raw items from the request body
+    :param created_by: User id stamped on every row
+    :param batch_size: Rows per INSERT
+    :return: (``BulkResult`` payload, rows inserted)
+    """
+
+    results: list[Optional[dict]] = [None] * len(items)
+    rows: list[tuple[int, dict]] = []
+
+    for index, item in enumerate(items):
+        try:
+            data = model.model_validate(item).model_dump(exclude_none=True, mode='json')
+        except ValidationError as e:
+            results[index] = {
+                'index': index,
+                'status': 'invalid',
+                'error': e.errors(include_url=False, include_context=False, include_input=False),
+            }
+            continue
+
+        data['id'] = str(uuid.uuid4())
+        data['created_by'] = created_by
+        rows.append((index, data))
+
+    inserted: list[dict] = []
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        failures = dict(await insert_rows(client, table, [row for _, row in batch]))
+
+        for position, (index, row) in enumerate(batch):
+            if position in failures:
+                results[index] = {'index': index, 'status': 'failed', 'id': row['id'], 'error': failures[position]}
+            else:
+                results[index] = {'index': index, 'status': 'created', 'id': row['id']}
+                inserted.append(row)
+
+    return {
+        'created': len(inserted),
+        'failed': len(items) - len(inserted),
+        'results': results,
+    }, inserted
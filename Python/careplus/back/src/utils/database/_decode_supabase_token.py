@@ -1,15 +1,80 @@
+import threading
+from typing import Any, Optional
+
 import jwt
-from src import _settings
-from src import SupabaseAccessPayload
-from src import Algorithm
+from jwt import PyJWKClient
+from src._settings import settings
+
+HMAC_ALGORITHMS = ['HS256']
+ASYMMETRIC_ALGORITHMS = ['RS256', 'ES256']
+
+
+class TokenVerificationUnavailable(Exception):
+    """No hay clave disponible para verificar el token localmente."""
+
+
+_jwks_client: Optional[PyJWKClient] = None
+_jwks_lock = threading.Lock()
+
+
+def _get_jwks_client() -> PyJWKClient:
+    """Cliente JWKS compartido; cachea las claves públicas del proyecto."""
+    global _jwks_client
+
+    with _jwks_lock:
+        if _jwks_client is None:
+            _jwks_client = PyJWKClient(
+                f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+                cache_keys=True,
+                lifespan=settings.auth_jwks_ttl_seconds,
+                timeout=5,
+            )
+        return _jwks_client
+
 
-def decode_supabase_token(token: str) -> SupabaseAccessPayload:
-    
-    payload = jwt.decode(
+def _decode(token: str, key: Any, algorithms: list[str]) -> dict:
+    return jwt.decode(
         token,
-        _settings.supabase_api_key,
-        algorithms=[Algorithm.RS256],
-        audience="authenticated"
+        key,
+        algorithms=algorithms,
+        audience=settings.auth_jwt_audience,
+        options={'require': ['exp', 'sub']},
     )
-    
-    return payload
+
+
+def decode_supabase_token(token: str) -> dict:
+    """Verifica firma, expiración y audiencia de un access_token de Supabase.
+
+    - HS256: se valida con el secreto JWT (se prueban todos los secretos configurados
+      para permitir rotación).
+    - RS256/ES256: se valida con las claves públicas del endpoint JWKS (cacheadas).
+
+    Raises:
+        jwt.PyJWTError: El token es inválido o expiró.
+        TokenVerificationUnavailable: No hay secreto configurado o el JWKS no responde.
+    """
+
+    algorithm = jwt.get_unverified_header(token).get('alg')
+
+    if algorithm in HMAC_ALGORITHMS:
+        secrets = settings.supabase_jwt_secrets
+        if not secrets:
+            raise TokenVerificationUnavailable("Supabase JWT secret not configured")
+
+        error: Optional[jwt.PyJWTError] = None
+        for secret in secrets:
+            try:
+                return _decode(token, secret, HMAC_ALGORITHMS)
+            except jwt.InvalidSignatureError as e:
+                error = e
+        raise error  # type: ignore[misc]
+
+    if algorithm in ASYMMETRIC_ALGORITHMS:
+        try:
+            signing_key = _get_jwks_client().get_signing_key_from_jwt(token)
+        except jwt.PyJWKClientConnectionError as e:
+            raise TokenVerificationUnavailable(str(e))
+
+        return _decode(token, signing_key.key, ASYMMETRIC_ALGORITHMS)
+
+    raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {algorithm}")
@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import Literal, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
+
+from src.database.models import Page
+
+View = Literal['full', 'summary']
+
+
+class FieldSelection:
+    """Columnas a pedir a PostgREST para un listado.
+
+    - ``full``: ``select('*')`` y la respuesta se valida con el modelo completo.
+    - ``summary`` o ``fields=``: solo se piden las columnas indicadas y la página se
+      valida con el modelo resumido o con uno creado sobre los campos pedidos.
+    """
+
+    def __init__(self, columns: Optional[list[str]] = None, model: Optional[type[BaseModel]] = None):
+        self.fields = columns
+        self.model = model
+
+    @property
+    def sparse(self) -> bool:
+        return self.fields is not None
+
+    @property
+    def columns(self) -> str:
+        return ', '.join(self.fields) if self.sparse else '*'
+
+    def respond(self, page: dict, headers: Optional[dict[str, str]] = None):
+        '''Return the page; sparse pages are validated here with the selection model
+
+        :param page: Page returned by ``paginate``
+        :param headers: Headers for the sparse response; a returned ``JSONResponse``
+            does not get the headers set on the route ``Response`` parameter
+        '''
+
+        if self.sparse:
+            content = Page[self.model].model_validate(page).model_dump(mode='json')
+            return JSONResponse(content, headers=headers)
+        return page
+
+
+@lru_cache(maxsize=256)
+def _fields_model(model: type[BaseModel], columns: tuple[str, ...]) -> type[BaseModel]:
+    '''Build (once per column set) a model with only the given fields of ``model``
+
+    :param model: Full response model
+    :param columns: Selected field names, all present in ``model``
+    :return: Model named ``<model>Fields`` with the same types and defaults
+    :rtype: type[BaseModel]
+    '''
+
+    return create_model(
+        f'{model.__name__}Fields',
+        **{column: (model.model_fields[column].annotation, model.model_fields[column]) for column in columns},
+    )
+
+
+def select_fields(
+    model: type[BaseModel],
+    summary: type[BaseModel],
+    fields: Optional[str] = None,
+    view: View = 'full',
+    required: tuple[str, ...] = ('id', 'created_at'),
+) -> FieldSelection:
+    '''Resolve the ``fields`` / ``view`` query parameters of a list endpoint
+
+    :param model: Full response model; ``fields`` must be a subset of its fields
+    :param summary: Slim model used by ``view=summary``
+    :param fields: Comma separated field names
+    :param view: 'full' or 'summary' (ignored when ``fields`` is given)
+    :param required: Columns always selected (id and the pagination sort column)
+    :return: Selection to push down into the PostgREST select
+    :rtype: FieldSelection
+    :raises HTTPException: 400 with the unknown field names
+    '''
+
+    if fields:
+        requested = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in requested if field not in model.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Campos no válidos: {', '.join(unknown)}")
+    elif view == 'summary':
+        requested = list(summary.model_fields)
+    else:
+        return FieldSelection()
+
+    columns = list(dict.fromkeys([*required, *requested]))
+    if not fields and set(columns) <= set(summary.model_fields):
+        return FieldSelection(columns, summary)
+    return FieldSelection(columns, _fields_model(model, tuple(columns)))
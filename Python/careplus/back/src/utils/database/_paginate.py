@@ -0,0 +1,72 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(value: str, row_id: str) -> str:
+    '''Opaque cursor pointing right after the row (value, id)
+
+    :param value: Value of the sort column of the last row
+    :param row_id: Id of the last row (tie-breaker)
+    :return: URL-safe cursor
+    :rtype: str
+    '''
+
+    raw = json.dumps([value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    '''Decode and validate a cursor (timestamp + uuid)
+
+    :param cursor: Cursor returned as ``next_cursor``
+    :return: (sort value, id)
+    :rtype: tuple[str, str]
+    :raises HTTPException: 400 if the cursor is malformed
+    '''
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        # Solo timestamps y UUIDs: el valor se interpola en el filtro de PostgREST
+        datetime.fromisoformat(value)
+        uuid.UUID(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    return value, row_id
+
+
+async def paginate(query, sort_column: str, limit: int, cursor: Optional[str] = None) -> dict:
+    """Paginación por keyset sobre ``(sort_column DESC, id DESC)``.
+
+    En lugar de ``OFFSET`` se filtra por las filas posteriores al cursor, así que el
+    coste de una página no depende de su profundidad (con un índice sobre
+    ``(sort_column, id)``). Se pide una fila de más para saber si hay otra página.
+
+    :param query: Consulta de PostgREST con los filtros ya aplicados
+    :param sort_column: Columna timestamp de ordenación (created_at, consultation_date...)
+    :param limit: Tamaño de página
+    :param cursor: ``next_cursor`` de la página anterior
+    :return: ``{'items': [...], 'next_cursor': str | None}``
+    """
+
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        query = query.or_(
+            f'{sort_column}.lt."{value}",and({sort_column}.eq."{value}",id.lt.{row_id})'
+        )
+
+    response = await query.order(sort_column, desc=True).order('id', desc=True).limit(limit + 1).execute()
+    rows = response.data
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][sort_column], rows[-1]['id'])
+
+    return {'items': rows, 'next_cursor': next_cursor}
@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Callable, Iterable
+
+from src._settings import settings
+from ._paginate import paginate
+
+
+async def iter_pages(build_query: Callable[[], object], sort_column: str, chunk_size: int) -> AsyncIterator[list[dict]]:
+    '''Walk a whole query in keyset pages of ``chunk_size`` rows
+
+    Cada página es una consulta nueva filtrada por el cursor de la anterior, así que
+    solo hay una página en memoria a la vez y el coste no crece con la profundidad.
+
+    :param build_query: Returns a fresh PostgREST query with the filters applied
+        (the builders are mutable and cannot be reused between pages)
+    :param sort_column: Timestamp sort column (see ``paginate``)
+    :param chunk_size: Rows per page; clamped to ``postgrest_max_rows - 1`` because
+        ``paginate`` asks for one extra row and PostgREST would silently drop it
+    :return: Async iterator of pages
+    '''
+
+    chunk_size = min(chunk_size, settings.postgrest_max_rows - 1)
+    cursor = None
+    while True:
+        page = await paginate(build_query(), sort_column, chunk_size, cursor)
+        if page['items']:
+            yield page['items']
+
+        cursor = page['next_cursor']
+        if cursor is None:
+            return
+
+
+def ndjson_chunk(rows: Iterable[dict]) -> bytes:
+    '''Serialize rows as NDJSON (one JSON object per line)'''
+
+    return ''.join(json.dumps(row, ensure_ascii=False, default=str) + '\n' for row in rows).encode()
+
+
+def csv_chunk(rows: Iterable[dict], columns: list[str], header: bool = False) -> bytes:
+    '''Serialize rows as CSV with a fixed column order
+
+    :param rows: Rows to write (missing columns are left empty)
+    :param columns: Column order
+    :param header: Write the header line first
+    :return: UTF-8 encoded CSV
+    '''
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
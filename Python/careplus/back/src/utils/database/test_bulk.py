@@ -0,0 +1,96 @@
+import json
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src._settings import settings
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+
+
+def _patient(i: int, document: str = None) -> dict:
+    return {
+        'first_name': 'Ana', 'last_name': str(i), 'date_of_birth': '1990-01-01',
+        'gender': 'femenino', 'document_number': document or f'DOC-{i}',
+    }
+
+
+def test_bulk_create_batches_and_reports_partial_failures(monkeypatch):
+    from routers.patients import PATIENTS_ROUTER
+
+    monkeypatch.setattr(settings, 'bulk_batch_size', 3)
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(request.content)
+        rows = body if isinstance(body, list) else [body]
+        if any(row['document_number'] == 'DUP' for row in rows):
+            error = {'code': '23505', 'message': 'duplicate key value violates unique constraint', 'details': None, 'hint': None}
+            return httpx.Response(409, content=json.dumps(error), headers={'content-type': 'application/json'})
+        return httpx.Response(201, content=b'', headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    items = [_patient(0), _patient(1), {'first_name': 'Sin datos'}, _patient(3), _patient(4, 'DUP'), _patient(5), _patient(6)]
+    response = TestClient(app).post('/patients/bulk', json=items)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['created'] == 5 and body['failed'] == 2
+    assert [r['status'] for r in body['results']] == ['created', 'created', 'invalid', 'created', 'failed', 'created', 'created']
+    assert 'duplicate key' in body['results'][4]['error']
+    assert all(r['id'] for r in body['results'] if r['status'] == 'created')
+
+    # Lote 1 (3 filas) correcto; el lote 2 falla y se reintenta fila a fila (3 INSERTs)
+    batches = [r for r in requests if isinstance(json.loads(r.content), list)]
+    assert [len(json.loads(r.content)) for r in batches] == [3, 3]
+    assert batches[0].url.params['columns']
+    assert 'missing=default' in batches[0].headers['prefer']
+    assert len(requests) == 2 + 3
+
+
+def test_bulk_create_reports_a_batch_lost_to_a_timeout(monkeypatch):
+    from routers.patients import PATIENTS_ROUTER
+
+    monkeypatch.setattr(settings, 'bulk_batch_size', 2)
+    batches: list[list[dict]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        batches.append(json.loads(request.content))
+        if len(batches) == 2:
+            raise httpx.ReadTimeout('timed out', request=request)
+        return httpx.Response(201, content=b'', headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    response = TestClient(app).post('/patients/bulk', json=[_patient(i) for i in range(5)])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r['status'] for r in body['results']] == ['created', 'created', 'failed', 'failed', 'created']
+    assert body['created'] == 3 and body['failed'] == 2
+    # El lote perdido no se reintenta fila a fila; sus id permiten comprobar qué se guardó
+    assert len(batches) == 3
+    assert [r['id'] for r in body['results'][2:4]] == [row['id'] for row in batches[1]]
+    assert 'ReadTimeout' in body['results'][2]['error']
+
+
+def test_bulk_create_limits_the_number_of_items(monkeypatch):
+    from routers.patients import PATIENTS_ROUTER
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(lambda r: httpx.Response(201)))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+    client = TestClient(app)
+
+    assert client.post('/patients/bulk', json=[]).status_code == 422
+    assert client.post('/patients/bulk', json=[_patient(i) for i in range(settings.bulk_max_items + 1)]).status_code == 422
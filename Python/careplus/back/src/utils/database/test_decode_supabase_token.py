@@ -0,0 +1,52 @@
+import time
+
+import jwt
+import pytest
+from src._settings import settings
+from . import decode_supabase_token, TokenVerificationUnavailable
+
+
+def _token(secret: str, **claims) -> str:
+    payload = {
+        'sub': 'user-1',
+        'aud': 'authenticated',
+        'iat': int(time.time()),
+        'exp': int(time.time()) + 60,
+        **claims,
+    }
+    return jwt.encode(payload, secret, algorithm='HS256')
+
+
+def _set_secrets(monkeypatch, value: str):
+    monkeypatch.setattr(settings, 'fastapi_env', 'local')
+    monkeypatch.setattr(settings, 'test_supabase_jwt_secret', value)
+
+
+def test_decode_with_current_and_rotated_secret(monkeypatch):
+
+    _set_secrets(monkeypatch, 'new-secret, old-secret')
+
+    assert decode_supabase_token(_token('new-secret'))['sub'] == 'user-1'
+    assert decode_supabase_token(_token('old-secret'))['sub'] == 'user-1'
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        decode_supabase_token(_token('other-secret'))
+
+
+def test_decode_rejects_expired_and_wrong_audience(monkeypatch):
+
+    _set_secrets(monkeypatch, 'secret')
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        decode_supabase_token(_token('secret', exp=int(time.time()) - 10))
+
+    with pytest.raises(jwt.InvalidAudienceError):
+        decode_supabase_token(_token('secret', aud='anon'))
+
+
+def test_decode_without_secret_is_unavailable(monkeypatch):
+
+    _set_secrets(monkeypatch, '')
+
+    with pytest.raises(TokenVerificationUnavailable):
+        decode_supabase_token(_token('secret'))
@@ -0,0 +1,94 @@
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.database.models import PatientResponse, PatientSummary
+from src.utils import get_auth_context
+from . import select_fields
+
+
+def test_full_view_selects_everything():
+
+    selection = select_fields(PatientResponse, PatientSummary)
+
+    assert not selection.sparse
+    assert selection.columns == '*'
+
+
+def test_summary_view_uses_summary_model_columns():
+
+    selection = select_fields(PatientResponse, PatientSummary, view='summary')
+
+    assert set(selection.fields) == set(PatientSummary.model_fields)
+    assert selection.model is PatientSummary
+    assert 'allergies' not in selection.columns and 'address' not in selection.columns
+
+
+def test_fields_are_validated_and_keep_pagination_columns():
+
+    selection = select_fields(PatientResponse, PatientSummary, fields='first_name, last_name')
+    assert selection.columns == 'id, created_at, first_name, last_name'
+    assert set(selection.model.model_fields) == {'id', 'created_at', 'first_name', 'last_name'}
+    assert selection.model is select_fields(PatientResponse, PatientSummary, fields='first_name,last_name').model
+
+    with pytest.raises(HTTPException) as error:
+        select_fields(PatientResponse, PatientSummary, fields='first_name,password,roles(*)')
+    assert error.value.status_code == 400
+    assert 'password' in error.value.detail
+
+
+def test_list_endpoint_pushes_fields_down_to_postgrest():
+    from routers.patients import PATIENTS_ROUTER
+
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/rpc/table_watermark'):
+            return httpx.Response(200, content='null', headers={'content-type': 'application/json'})
+        requests.append(request)
+        rows = [{'id': 'p1', 'created_at': '2026-02-11T10:00:00+00:00', 'first_name': 'Ana'}]
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    response = TestClient(app).get('/patients/', params={'fields': 'first_name'})
+
+    assert response.status_code == 200
+    assert requests[0].url.params['select'] == 'id,created_at,first_name'
+    assert response.json() == {
+        'items': [{'id': 'p1', 'created_at': '2026-02-11T10:00:00Z', 'first_name': 'Ana'}],
+        'next_cursor': None,
+    }
+
+    assert TestClient(app).get('/patients/', params={'fields': 'nope'}).status_code == 400
+
+
+def test_sparse_pages_are_validated_and_documented():
+    from routers.patients import PATIENTS_ROUTER
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/rpc/table_watermark'):
+            return httpx.Response(200, content='null', headers={'content-type': 'application/json'})
+        # PostgREST devolvería el enum como texto; un valor inválido no debe salir tal cual
+        rows = [{'id': 'p1', 'created_at': '2026-02-11T10:00:00+00:00', 'gender': 'X'}]
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+    assert TestClient(app).get('/patients/', params={'fields': 'gender'}).status_code == 500
+
+    schema = app.openapi()['paths']['/patients/']['get']['responses']['200']['content']['application/json']['schema']
+    assert {option['$ref'] for option in schema['anyOf']} == {
+        '#/components/schemas/Page_PatientResponse_',
+        '#/components/schemas/Page_PatientSummary_',
+    }
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from src.database import SupabaseClientFactory
+from . import paginate, encode_cursor, decode_cursor
+
+ROWS = [
+    {'id': f'00000000-0000-0000-0000-{i:012d}', 'created_at': f'2026-02-11T10:00:{59 - i:02d}.123456+00:00'}
+    for i in range(3)
+]
+
+
+def _client(requests: list[httpx.Request]):
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        limit = int(request.url.params['limit'])
+        return httpx.Response(200, content=json.dumps(ROWS[:limit]), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    return factory.for_token("token")
+
+
+def test_page_fetches_one_extra_row_and_returns_cursor():
+
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+
+    page = asyncio.run(paginate(client.table('patients').select('*'), 'created_at', 2))
+
+    params = requests[0].url.params
+    assert params['limit'] == '3'
+    assert params['order'] == 'created_at.desc,id.desc'
+    assert 'or' not in params
+    assert page['items'] == ROWS[:2]
+    assert decode_cursor(page['next_cursor']) == (ROWS[1]['created_at'], ROWS[1]['id'])
+
+
+def test_cursor_filters_after_last_row():
+
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+    cursor = encode_cursor(ROWS[1]['created_at'], ROWS[1]['id'])
+
+    page = asyncio.run(paginate(client.table('patients').select('*'), 'created_at', 5, cursor))
+
+    value, row_id = ROWS[1]['created_at'], ROWS[1]['id']
+    assert requests[0].url.params['or'] == f'(created_at.lt."{value}",and(created_at.eq."{value}",id.lt.{row_id}))'
+    assert page['next_cursor'] is None
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor('2026-02-11', 'x),id.gt.(0'), encode_cursor('"),or(', ROWS[0]['id'])])
+def test_malformed_cursors_are_rejected(cursor):
+
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+
+    assert error.value.status_code == 400
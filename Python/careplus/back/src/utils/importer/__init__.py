@@ -0,0 +1,2 @@
+from ._pipeline import ImportFormat, ImportSpec, ImportReference, scan_upload, missing_columns, count_rows, validate_batches
+from ._jobs import ImportJobManager, import_jobs
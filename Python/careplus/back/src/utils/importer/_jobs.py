@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import polars as pl
+
+from src._settings import settings
+from src.database.models import ImportJob
+from src.utils.database import insert_rows
+from src.utils.response_cache import response_cache
+from src.utils.realtime import realtime
+from ._pipeline import ImportFormat, ImportSpec, ROW, REASON, scan_upload, count_rows, validate_batches
+
+logger = logging.getLogger(__name__)
+
+# Valores por consulta ``in.(...)``: acota la longitud de la URL de PostgREST
+LOOKUP_CHUNK = 200
+
+# Margen antes de ``exp`` para no empezar un lote que el token ya no alcance a cubrir
+TOKEN_MARGIN_SECONDS = 30
+
+TOKEN_EXPIRED_ERROR = (
+    "El token de la sesión expiró durante la importación; las filas ya insertadas se "
+    "conservan. Renueva el token en /auth/refresh e importa las filas restantes."
+)
+
+
+@dataclass
+class _Job:
+    status: ImportJob
+    owner: Optional[str]
+    rejected: list[pl.DataFrame]
+    expires_at: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+
+
+async def _lookup(client, table: str, key: str, values: list[str], columns: str) -> list[dict]:
+    rows: list[dict] = []
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        response = await client.table(table).select(columns).in_(key, values[start:start + LOOKUP_CHUNK]).execute()
+        rows += response.data
+    return rows
+
+
+def _reject(batch: pl.DataFrame, mask: pl.Series, error: str) -> pl.DataFrame:
+    return batch.filter(mask).select(ROW, pl.lit(error).alias(REASON), pl.exclude(ROW))
+
+
+class ImportJobManager:
+    """Importaciones de CSV/Parquet en segundo plano.
+
+    Cada trabajo lee el archivo con polars de a ``batch_size`` filas: valida cada
+    lote en un hilo (``validate_batches``) e inserta sus filas válidas, deduplicando
+    contra la tabla y resolviendo las referencias (p. ej. el documento del paciente),
+    así en memoria solo está el lote en curso. El
+    progreso se puede consultar mientras corre; los lotes ya insertados no se
+    deshacen si el trabajo falla a mitad de camino.
+
+    El trabajo escribe con el cliente de quien lo inició (RLS) y la API solo recibe
+    su access token, no el refresh token: no puede renovarlo. Antes de cada lote se
+    comprueba ``expires_at`` y, si el token ya no alcanza, el trabajo falla con
+    ``TOKEN_EXPIRED_ERROR`` en vez de recibir 401 de PostgREST a mitad de un lote.
+
+    :param batch_size: Filas por INSERT
+    :param max_concurrent: Trabajos ejecutándose a la vez; el resto queda en cola
+    :param history: Trabajos terminados que se conservan para consulta
+    """
+
+    def __init__(self, batch_size: int = 1000, max_concurrent: int = 2, history: int = 50):
+        self.batch_size = batch_size
+        self.max_concurrent = max_concurrent
+        self.history = history
+
+        self.__jobs: OrderedDict[str, _Job] = OrderedDict()
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+
+    def submit(
+        self,
+        resource: str,
+        spec: ImportSpec,
+        path: str,
+        format: ImportFormat,
+        client,
+        created_by: Optional[str],
+        expires_at: Optional[float] = None,
+    ) -> ImportJob:
+        '''Start importing ``path`` in the background; the file is deleted when the job ends
+
+        :param resource: Resource name reported in the job
+        :param spec: Target table and model
+        :param path: Temporary file with the upload
+        :param format: csv or parquet
+        :param client: Supabase client of the caller (RLS applies)
+        :param created_by: User id stamped on every row and owner of the job
+        :param expires_at: ``exp`` of the caller token (epoch seconds); None when unknown
+        :return: The queued job
+        :rtype: ImportJob
+        '''
+
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        status = ImportJob(
+            id=str(uuid.uuid4()),
+            resource=resource,
+            status='queued',
+            created_at=datetime.now(timezone.utc),
+        )
+        job = _Job(status=status, owner=created_by, rejected=[], expires_at=expires_at)
+        self.__jobs[status.id] = job
+        self.__evict()
+
+        job.task = asyncio.create_task(self.__run(job, spec, path, format, client))
+        return status
+
+    def get(self, job_id: str, owner: Optional[str]) -> Optional[ImportJob]:
+        '''Job status, only for the user that started it'''
+
+        job = self.__jobs.get(job_id)
+        if job is None or job.owner != owner:
+            return None
+        return job.status
+
+    def rejected(self, job_id: str, owner: Optional[str]) -> Optional[pl.DataFrame]:
+        '''Rejected rows so far (``row``, ``error`` and the row values), ordered by row'''
+
+        job = self.__jobs.get(job_id)
+        if job is None or job.owner != owner:
+            return None
+        if not job.rejected:
+            return pl.DataFrame(schema={ROW: pl.UInt32, REASON: pl.String})
+        return pl.concat(job.rejected, how='diagonal_relaxed').sort(ROW)
+
+    async def stop(self) -> None:
+        '''Cancel the jobs that are still running'''
+
+        tasks = [job.task for job in self.__jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __evict(self) -> None:
+        finished = [job_id for job_id, job in self.__jobs.items() if job.status.finished_at is not None]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.__jobs[job_id]
+
+    async def __run(self, job: _Job, spec: ImportSpec, path: str, format: ImportFormat, client) -> None:
+        status = job.status
+        try:
+            async with self.__semaphore:
+                status.status = 'validating'
+                # polars libera el GIL: la lectura y la validación no bloquean el event loop
+                status.total_rows = await asyncio.to_thread(lambda: count_rows(scan_upload(path, format)))
+
+                status.status = 'loading'
+                batches = validate_batches(scan_upload(path, format), spec, self.batch_size)
+                patients: set[str] = set()
+                while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                    valid, rejected = batch
+                    self.__rejected(job, rejected)
+                    # Las filas rechazadas al validar ya están resueltas
+                    self.__progress(status, rejected.height)
+                    patients |= await self.__load(job, spec, valid, client)
+
+                if status.inserted:
+                    await response_cache.invalidate(spec.table)
+                if patients:
+                    # La ficha de cada paciente afectado embebe este recurso
+                    await response_cache.invalidate('patients', *patients, lists=False)
+
+                status.status = 'completed'
+        except asyncio.CancelledError:
+            status.status = 'failed'
+            status.error = 'Importación cancelada'
+            raise
+        except Exception as e:
+            logger.exception(f"Import job {status.id} ({status.resource}) failed")
+            status.status = 'failed'
+            status.error = str(e)
+        finally:
+            status.finished_at = datetime.now(timezone.utc)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def __load(self, job: _Job, spec: ImportSpec, valid: pl.DataFrame, client) -> set[str]:
+        '''Insert the valid rows in batches; returns the parent patient ids touched'''
+
+        patients: set[str] = set()
+
+        for batch in valid.iter_slices(self.batch_size):
+            if job.expires_at is not None and time.time() + TOKEN_MARGIN_SECONDS >= job.expires_at:
+                raise RuntimeError(TOKEN_EXPIRED_ERROR)
+            size = batch.height
+
+            if spec.unique:
+                values = batch[spec.unique].to_list()
+                taken = {row[spec.unique] for row in await _lookup(client, spec.table, spec.unique, values, spec.unique)}
+                mask = batch[spec.unique].is_in(list(taken)).fill_null(False)
+                self.__rejected(job, _reject(batch, mask, f"{spec.unique}: ya registrado"))
+                batch = batch.filter(~mask)
+
+            for name, reference in spec.references.items():
+                if reference.column not in batch.columns:
+                    continue
+                if name not in batch.columns:
+                    batch = batch.with_columns(pl.lit(None, dtype=pl.String).alias(name))
+                pending = batch.filter(pl.col(name).is_null())[reference.column].drop_nulls().unique().to_list()
+                found = await _lookup(client, reference.table, reference.key, pending, f'id, {reference.key}')
+                ids = {row[reference.key]: row['id'] for row in found}
+
+                resolved = pl.col(reference.column).replace_strict(ids, default=None, return_dtype=pl.String)
+                batch = batch.with_columns(pl.coalesce(pl.col(name), resolved).alias(name))
+                mask = batch[name].is_null()
+                self.__rejected(job, _reject(batch, mask, f"{reference.column}: no encontrado en {reference.table}"))
+                batch = batch.filter(~mask).drop(reference.column)
+
+            rows = [
+                {column: value for column, value in row.items() if value is not None and column != ROW}
+                for row in batch.to_dicts()
+            ]
+            for row in rows:
+                row['created_by'] = job.owner
+                # id propio (como en bulk_insert): el INSERT es return=minimal
+                row['id'] = str(uuid.uuid4())
+
+            failures = dict(await insert_rows(client, spec.table, rows)) if rows else {}
+            if failures:
+                positions = pl.Series(range(batch.height)).is_in(list(failures))
+                errors = [failures[position] for position in sorted(failures)]
+                self.__rejected(job, batch.filter(positions).select(ROW, pl.Series(REASON, errors), pl.exclude(ROW)))
+
+            accepted = [row for position, row in enumerate(rows) if position not in failures]
+            patients.update(row['patient_id'] for row in accepted if 'patient_id' in row)
+            await realtime.publish(spec.table, 'insert', *accepted)
+
+            job.status.inserted += len(accepted)
+            self.__progress(job.status, size)
+
+        return patients
+
+    def __rejected(self, job: _Job, rejected: pl.DataFrame) -> None:
+        if rejected.height == 0:
+            return
+        job.rejected.append(rejected)
+        job.status.rejected += rejected.height
+
+    @staticmethod
+    def __progress(status: ImportJob, processed: int) -> None:
+        status.processed_rows += processed
+        if status.total_rows:
+            status.progress = round(status.processed_rows / status.total_rows, 4)
+
+
+import_jobs = ImportJobManager(
+    batch_size=settings.import_batch_size,
+    max_concurrent=settings.import_max_concurrent_jobs,
+    history=settings.import_job_history,
+)
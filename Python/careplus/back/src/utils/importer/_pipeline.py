@@ -0,0 +1,277 @@
+import types
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterator, Literal, Optional, Union, get_args, get_origin
+
+import polars as pl
+import polars.selectors as cs
+from annotated_types import MaxLen
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+from src.database.enums import Gender
+
+ImportFormat = Literal['csv', 'parquet']
+
+ROW = 'row'
+REASON = 'error'
+_ERRORS = '_errors'
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+DATETIME_FORMATS = ('%Y-%m-%dT%H:%M:%S%.f', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M', '%d/%m/%Y %H:%M')
+
+UUID_PATTERN = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+# Abreviaturas habituales en las planillas, además del valor del enum
+ENUM_ALIASES: dict[type[Enum], dict[str, Enum]] = {
+    Gender: {'m': Gender.masculino, 'h': Gender.masculino, 'f': Gender.femenino},
+}
+
+
+@dataclass(frozen=True)
+class ImportReference:
+    '''Alternative natural key for a foreign key column (e.g. the patient's document
+    instead of its uuid), resolved against ``table.key`` while loading'''
+
+    column: str
+    table: str
+    key: str
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    table: str
+    model: type[BaseModel]
+    # Columna única: se deduplica dentro del archivo y contra la tabla
+    unique: Optional[str] = None
+    references: dict[str, ImportReference] = field(default_factory=dict)
+
+
+def _key(value: str) -> str:
+    '''Lowercase, unaccented and without spaces: "Cédula" -> "cedula", "a +" -> "a+"'''
+
+    value = unicodedata.normalize('NFKD', value)
+    return ''.join(c for c in value if not unicodedata.combining(c) and not c.isspace()).lower()
+
+
+def _base_type(annotation):
+    if get_origin(annotation) in (Union, types.UnionType):
+        return next(arg for arg in get_args(annotation) if arg is not type(None))
+    return annotation
+
+
+def _default(info: FieldInfo):
+    '''Plain default of an optional field, None if it has none'''
+
+    if info.is_required() or info.default is None:
+        return None
+    return info.default.value if isinstance(info.default, Enum) else info.default
+
+
+def _text(column: str) -> pl.Expr:
+    value = pl.col(column).str.strip_chars()
+    return pl.when(value.str.len_chars() > 0).then(value)
+
+
+def _enum(text: pl.Expr, enum: type[Enum]) -> pl.Expr:
+    mapping = {_key(member.value): member.value for member in enum}
+    mapping.update({alias: member.value for alias, member in ENUM_ALIASES.get(enum, {}).items()})
+
+    key = (
+        text.str.normalize('NFKD')
+        .str.replace_all(r'[\p{Mn}\s]', '')
+        .str.to_lowercase()
+    )
+    return key.replace_strict(mapping, default=None, return_dtype=pl.String)
+
+
+def _date(text: pl.Expr) -> pl.Expr:
+    return pl.coalesce([text.str.to_date(fmt, strict=False) for fmt in DATE_FORMATS]).dt.to_string('%Y-%m-%d')
+
+
+def _datetime(text: pl.Expr) -> pl.Expr:
+    # Con zona horaria se convierte a UTC; sin ella (o solo fecha) se asume UTC
+    parsed = [text.str.to_datetime('%Y-%m-%dT%H:%M:%S%z', strict=False, time_zone='UTC')]
+    parsed += [text.str.to_datetime(fmt, strict=False).dt.replace_time_zone('UTC') for fmt in DATETIME_FORMATS]
+    parsed += [text.str.to_date(fmt, strict=False).cast(pl.Datetime).dt.replace_time_zone('UTC') for fmt in DATE_FORMATS]
+    return pl.coalesce(parsed).dt.to_string('%Y-%m-%dT%H:%M:%S%z')
+
+
+def _field(name: str, info: FieldInfo) -> tuple[pl.Expr, list[pl.Expr]]:
+    '''Normalized value of a model field and the error checks of that column'''
+
+    kind = _base_type(info.annotation)
+    text = _text(name)
+
+    if isinstance(kind, type) and issubclass(kind, Enum):
+        value = _enum(text, kind)
+    elif kind is date:
+        value = _date(text)
+    elif kind is datetime:
+        value = _datetime(text)
+    elif kind is float:
+        value = text.str.replace(',', '.').cast(pl.Float64, strict=False)
+    elif kind is int:
+        number = text.str.replace(',', '.').cast(pl.Float64, strict=False)
+        value = pl.when(number == number.round()).then(number.cast(pl.Int64))
+    else:
+        value = text
+
+    # El valor no vacío que no se pudo convertir es un error, no un NULL
+    checks = [pl.when(text.is_not_null() & value.is_null()).then(pl.lit(f"{name}: valor no válido"))]
+
+    for constraint in info.metadata:
+        if isinstance(constraint, MaxLen):
+            checks.append(pl.when(text.str.len_chars() > constraint.max_length).then(
+                pl.lit(f"{name}: máximo {constraint.max_length} caracteres")
+            ))
+
+    if _default(info) is not None:
+        value = value.fill_null(pl.lit(_default(info)))
+
+    return value, checks
+
+
+def scan_upload(path: str, format: ImportFormat) -> pl.LazyFrame:
+    '''Lazily scan an uploaded file with every column as text and a 1-based ``row`` number
+
+    :param path: Temporary file with the upload
+    :param format: csv or parquet
+    :return: LazyFrame with normalized (lowercase, trimmed) column names
+    :rtype: pl.LazyFrame
+    '''
+
+    if format == 'csv':
+        frame = pl.scan_csv(path, infer_schema=False, encoding='utf8-lossy')
+    else:
+        # Todo como texto, igual que el CSV: la validación es la misma para ambos formatos
+        frame = pl.scan_parquet(path).with_columns(
+            cs.datetime(time_zone='*').dt.convert_time_zone('UTC').dt.to_string('%Y-%m-%dT%H:%M:%S%z'),
+            cs.datetime(time_zone=None).dt.to_string('%Y-%m-%dT%H:%M:%S'),
+        )
+        frame = frame.select(pl.all().cast(pl.String))
+
+    return frame.rename(lambda column: column.strip().lower()).with_row_index(ROW, offset=1)
+
+
+def missing_columns(frame: pl.LazyFrame, spec: ImportSpec) -> list[str]:
+    '''Required model fields that the file does not have (only reads the header)'''
+
+    columns = set(frame.collect_schema().names())
+    missing = []
+    for name, info in spec.model.model_fields.items():
+        if not info.is_required() or name in columns:
+            continue
+        reference = spec.references.get(name)
+        if reference is None or reference.column not in columns:
+            missing.append(name if reference is None else f'{name} o {reference.column}')
+    return missing
+
+
+def count_rows(frame: pl.LazyFrame) -> int:
+    '''Rows of the upload, with the streaming engine (parquet only reads the metadata)'''
+
+    return frame.select(pl.len()).collect(engine='streaming').item()
+
+
+def _dedupe(checked: pl.DataFrame, unique: str, key: str, seen: dict[str, int]) -> pl.DataFrame:
+    '''Reject the repetitions of ``unique`` in one batch, against this batch and the
+    first rows of the previous ones (``seen``: value -> row, updated in place)'''
+
+    valid = pl.col(_ERRORS).list.len() == 0
+    keys = checked.filter(valid)[key].drop_nulls().unique().to_list()
+    earlier = {value: seen[value] for value in keys if value in seen}
+
+    first = pl.coalesce(
+        pl.col(key).replace_strict(earlier, default=None, return_dtype=pl.UInt32),
+        pl.when(valid).then(pl.col(ROW)).min().over(key),
+    )
+    checked = checked.with_columns(first.alias('_first'))
+
+    for value, row in checked.filter(valid & pl.col(key).is_not_null() & (pl.col('_first') == pl.col(ROW))).select(key, ROW).iter_rows():
+        seen[value] = row
+
+    duplicated = pl.col(key).is_not_null() & valid & (pl.col('_first') != pl.col(ROW))
+    return checked.with_columns(
+        pl.when(duplicated)
+        .then(pl.concat_list(pl.col(_ERRORS), pl.format(f"{unique}: duplicado en el archivo (fila {{}})", pl.col('_first'))))
+        .otherwise(pl.col(_ERRORS))
+        .alias(_ERRORS)
+    ).drop('_first')
+
+
+def validate_batches(frame: pl.LazyFrame, spec: ImportSpec, batch_size: int) -> Iterator[tuple[pl.DataFrame, pl.DataFrame]]:
+    """Valida y normaliza el archivo contra ``spec.model`` de a ``batch_size`` filas.
+
+    Las reglas salen del modelo ``*Create``: campos obligatorios, ``max_length``,
+    valores de los enums (sin distinguir mayúsculas ni tildes), fechas y números. Las
+    expresiones se evalúan con el motor streaming de polars sobre el scan del archivo:
+    en memoria solo está el lote en curso. También se rechazan las repeticiones de
+    ``spec.unique`` dentro del archivo (se conserva la primera fila válida); para eso
+    se recuerda la primera fila de cada valor ya visto.
+
+    :param frame: Output of ``scan_upload``
+    :param spec: Target table and model
+    :param batch_size: Rows per batch
+    :return: Per batch: (valid rows with the model columns, rejected rows with the
+        original columns plus ``error``)
+    """
+
+    columns = frame.collect_schema().names()
+    fields = {
+        name: info for name, info in spec.model.model_fields.items()
+        if name in columns or _default(info) is not None
+    }
+
+    values: list[pl.Expr] = []
+    checks: list[pl.Expr] = []
+
+    for name, info in fields.items():
+        if name not in columns:
+            # Columna ausente con valor por defecto (p. ej. document_type)
+            values.append(pl.lit(_default(info)).alias(name))
+            continue
+        value, field_checks = _field(name, info)
+        values.append(value.alias(name))
+        checks += field_checks
+
+    for name, info in spec.model.model_fields.items():
+        if not info.is_required():
+            continue
+        present = _text(name).is_not_null() if name in columns else pl.lit(False)
+        message = f"{name}: obligatorio"
+
+        reference = spec.references.get(name)
+        if reference is not None and reference.column in columns:
+            present = present | _text(reference.column).is_not_null()
+            message = f"{name} o {reference.column}: obligatorio"
+        checks.append(pl.when(~present).then(pl.lit(message)))
+
+    for name, reference in spec.references.items():
+        if name in columns:
+            checks.append(pl.when(~_text(name).str.contains(UUID_PATTERN)).then(pl.lit(f"{name}: valor no válido")))
+        if reference.column in columns:
+            values.append(_text(reference.column).alias(reference.column))
+
+    checked = frame.with_columns(
+        pl.concat_list(checks).list.drop_nulls().alias(_ERRORS),
+        *[value.alias(f'_{i}') for i, value in enumerate(values)],
+    )
+
+    unique_key = f'_{list(fields).index(spec.unique)}' if spec.unique and spec.unique in columns else None
+    seen: dict[str, int] = {}
+    rejected_mask = pl.col(_ERRORS).list.len() > 0
+
+    for batch in checked.collect_batches(chunk_size=batch_size, lazy=True):
+        if unique_key:
+            batch = _dedupe(batch, spec.unique, unique_key, seen)
+
+        valid = batch.filter(~rejected_mask).select(
+            ROW, *[pl.col(f'_{i}').alias(value.meta.output_name()) for i, value in enumerate(values)]
+        )
+        rejected = batch.filter(rejected_mask).select(
+            ROW, pl.col(_ERRORS).list.join('; ').alias(REASON), *[c for c in columns if c != ROW]
+        )
+        yield valid, rejected
@@ -0,0 +1,68 @@
+import polars as pl
+from src.database.models import PatientCreate, ConsultationCreate
+from . import ImportSpec, ImportReference, scan_upload, missing_columns, count_rows, validate_batches
+
+PATIENTS = ImportSpec('patients', PatientCreate, unique='document_number')
+CONSULTATIONS = ImportSpec('consultations', ConsultationCreate, references={
+    'patient_id': ImportReference('patient_document_number', 'patients', 'document_number'),
+})
+
+
+def _validate(frame: pl.LazyFrame, spec: ImportSpec, batch_size: int = 1000) -> tuple[pl.DataFrame, pl.DataFrame]:
+    batches = list(validate_batches(frame, spec, batch_size))
+    return pl.concat([valid for valid, _ in batches]), pl.concat([rejected for _, rejected in batches])
+
+
+def test_patients_are_normalized_and_rejected_in_bulk(tmp_path):
+    path = tmp_path / 'patients.csv'
+    path.write_text(
+        'First_Name ,last_name,date_of_birth,gender,document_type,document_number,blood_type\n'
+        ' Ana ,Pérez,1990-01-31,F,Cédula,1,a +\n'
+        'Luis,Gómez,15/06/1985,masculino,,2,\n'
+        ',Ruiz,31/02/1990,otro,dni,3,Z\n'
+        'Eva,Díaz,1991-02-02,femenino,,1,\n'
+        f'{"x" * 101},Soto,1991-02-02,otro,,4,\n',
+        encoding='utf-8',
+    )
+
+    frame = scan_upload(str(path), 'csv')
+    assert count_rows(frame) == 5
+
+    # Lotes de 2 filas: la fila 4 repite el documento de la fila 1, que está en otro lote
+    valid, rejected = _validate(frame, PATIENTS, batch_size=2)
+
+    assert valid.select('row', 'first_name', 'date_of_birth', 'gender', 'document_type', 'blood_type').rows() == [
+        (1, 'Ana', '1990-01-31', 'femenino', 'cedula', 'A+'),
+        (2, 'Luis', '1985-06-15', 'masculino', 'cedula', None),
+    ]
+
+    errors = dict(rejected.select('row', 'error').rows())
+    assert set(errors[3].split('; ')) == {
+        'first_name: obligatorio', 'date_of_birth: valor no válido',
+        'document_type: valor no válido', 'blood_type: valor no válido',
+    }
+    assert errors[4] == 'document_number: duplicado en el archivo (fila 1)'
+    assert errors[5] == 'first_name: máximo 100 caracteres'
+    # El reporte conserva los valores originales
+    assert rejected.filter(pl.col('row') == 3)['document_type'][0] == 'dni'
+
+
+def test_consultations_accept_the_patient_document_from_parquet(tmp_path):
+    path = tmp_path / 'consultations.parquet'
+    pl.DataFrame({
+        'patient_document_number': ['1', None],
+        'reason': ['Control', 'Tos'],
+        'heart_rate': [72.0, 71.5],
+        'status': ['Completada', None],
+    }).write_parquet(path)
+
+    frame = scan_upload(str(path), 'parquet')
+    assert missing_columns(frame, CONSULTATIONS) == []
+    assert missing_columns(frame, PATIENTS) == ['first_name', 'last_name', 'date_of_birth', 'gender', 'document_number']
+
+    valid, rejected = _validate(frame, CONSULTATIONS)
+
+    assert valid.select('patient_document_number', 'heart_rate', 'status').rows() == [('1', 72, 'completada')]
+    assert set(rejected['error'][0].split('; ')) == {
+        'heart_rate: valor no válido', 'patient_id o patient_document_number: obligatorio',
+    }
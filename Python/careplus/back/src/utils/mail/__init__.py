@@ -0,0 +1,3 @@
+from ._templates import OTP_SUBJECT, render_otp_email
+from ._transport import EmailMessage, EmailTransport, ResendTransport, ConsoleTransport, StubTransport
+from ._dispatcher import EmailDispatcher, email_dispatcher, default_transport
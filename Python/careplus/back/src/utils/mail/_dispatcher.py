@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from typing import Optional
+
+from src._settings import settings
+from ._transport import EmailMessage, EmailTransport, ResendTransport, ConsoleTransport
+
+logger = logging.getLogger(__name__)
+
+
+def default_transport() -> EmailTransport:
+    '''Resend if RESEND_API_KEY is configured, console otherwise'''
+
+    if settings.resend_api_key:
+        return ResendTransport(settings.resend_api_key, settings.resend_from_email)
+    return ConsoleTransport()
+
+
+class EmailDispatcher:
+    """Cola acotada de correos con workers en segundo plano.
+
+    ``enqueue`` retorna en cuanto el mensaje está en la cola, así que la latencia del
+    proveedor no forma parte de la respuesta. Cada envío se reintenta con backoff
+    exponencial; si la cola no está en marcha (sin lifespan o ``workers=0``) el
+    envío se hace en línea.
+
+    :param transport: Proveedor de envío (por defecto según la configuración)
+    :param max_size: Capacidad de la cola; los mensajes que no caben se descartan
+    :param workers: Número de workers concurrentes
+    :param max_retries: Reintentos tras el primer fallo
+    :param backoff_seconds: Espera base entre reintentos (se duplica en cada uno)
+    """
+
+    def __init__(
+        self,
+        transport: Optional[EmailTransport] = None,
+        max_size: int = 1000,
+        workers: int = 2,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+    ):
+        self.__transport = transport
+        self.max_size = max_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self.__queue: Optional[asyncio.Queue] = None
+        self.__tasks: list[asyncio.Task] = []
+
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        # Segundos desde que se encola hasta que el proveedor acepta el correo
+        self.__latencies: deque[float] = deque(maxlen=1000)
+
+    @property
+    def transport(self) -> EmailTransport:
+        if self.__transport is None:
+            self.__transport = default_transport()
+        return self.__transport
+
+    @property
+    def running(self) -> bool:
+        return bool(self.__tasks)
+
+    async def start(self) -> None:
+        if self.running or self.workers <= 0:
+            return
+
+        self.__queue = asyncio.Queue(maxsize=self.max_size)
+        self.__tasks = [asyncio.create_task(self.__worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        '''Wait up to ``timeout`` seconds for pending emails, then stop the workers'''
+
+        if not self.running:
+            return
+
+        try:
+            await asyncio.wait_for(self.__queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Email queue stopped with {self.__queue.qsize()} pending messages")
+
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+        self.__queue = None
+
+    async def enqueue(self, message: EmailMessage) -> bool:
+        '''Queue a message for delivery
+
+        :param message: Email to send
+        :return: False if the queue is full and the message was dropped
+        :rtype: bool
+        '''
+
+        if not self.running:
+            return await self.deliver(message)
+
+        try:
+            self.__queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error(f"Email queue full, message to {', '.join(message.to)} dropped")
+            if message.fallback:
+                logger.warning(message.fallback)
+            return False
+
+        self.enqueued += 1
+        return True
+
+    async def deliver(self, message: EmailMessage) -> bool:
+        '''Send a message now, retrying with exponential backoff'''
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.transport.send(message)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.error(f"Failed to send email to {', '.join(message.to)}: {e}")
+                    if message.fallback:
+                        logger.warning(message.fallback)
+                    return False
+
+                self.retries += 1
+                await asyncio.sleep(self.backoff_seconds * 2 ** attempt)
+            else:
+                self.sent += 1
+                self.__latencies.append(time.monotonic() - message.enqueued_at)
+                return True
+
+        return False
+
+    async def __worker(self) -> None:
+        while True:
+            message = await self.__queue.get()
+            try:
+                await self.deliver(message)
+            except Exception as e:
+                logger.error(f"Email worker error: {e}")
+            finally:
+                self.__queue.task_done()
+
+    def metrics(self) -> dict:
+        latencies = sorted(self.__latencies)
+        return {
+            'transport': self.transport.name,
+            'running': self.running,
+            'workers': len(self.__tasks),
+            'queue_depth': self.__queue.qsize() if self.__queue is not None else 0,
+            'queue_capacity': self.max_size,
+            'enqueued': self.enqueued,
+            'sent': self.sent,
+            'failed': self.failed,
+            'retries': self.retries,
+            'dropped': self.dropped,
+            'latency_p50_ms': round(statistics.median(latencies) * 1000, 1) if latencies else 0.0,
+            'latency_p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1) if latencies else 0.0,
+        }
+
+
+email_dispatcher = EmailDispatcher(
+    max_size=settings.email_queue_size,
+    workers=settings.email_queue_workers,
+    max_retries=settings.email_max_retries,
+    backoff_seconds=settings.email_retry_backoff_seconds,
+)
@@ -0,0 +1,51 @@
+from html import escape
+
+OTP_SUBJECT = "CarePlus - Código de Verificación"
+
+# Plantilla del correo OTP; {full_name} y {code} son los únicos huecos
+OTP_TEMPLATE = """
+    <div style="font-family: Arial, sans-serif; max-width: 480px; margin: 0 auto; padding: 32px; background: #f8fafc; border-radius: 12px;">
+        <div style="text-align: center; margin-bottom: 24px;">
+            <div style="margin-bottom: 8px;">
+                <svg xmlns="http://www.w3.org/2000/svg" width="36" height="36" viewBox="76.7792 2.35425 29.2208 29.22085" fill="none" style="vertical-align: middle; margin-right: 8px;">
+                    <path d="M 91.3896,31.5751 C 99.4587,31.5751 106,25.0338 106,16.9647 106,8.89557 99.4587,2.35425 91.3896,2.35425 c -8.0691,0 -14.6104,6.54132 -14.6104,14.61045 0,8.0691 6.5413,14.6104 14.6104,14.6104 z" fill="#114f9e" />
+                    <path d="m 101.706,15.0367 c -0.461,-0.571 -1.169,-0.8643 -2.1077,-0.8643 H 94.2249 V 8.41195 c 0,-0.99723 -0.2894,-1.73636 -0.8642,-2.19391 C 92.864,5.82305 92.1875,5.6197 91.3467,5.6197 c -0.8409,0 -1.4744,0.19944 -1.9671,0.59834 -0.5749,0.45755 -0.8682,1.19668 -0.8682,2.19391 v 5.76045 h -5.3303 c -0.9386,0 -1.6464,0.2894 -2.1079,0.8643 -0.3989,0.4967 -0.5983,1.1458 -0.5983,1.928 0,0.7821 0.1955,1.4235 0.5827,1.928 0.3167,0.4145 0.9385,0.9073 2.1235,0.9073 h 5.3303 v 5.7174 c 0,0.9973 0.2933,1.7364 0.8642,2.1939 0.4928,0.3989 1.1576,0.5984 1.9711,0.5984 0.8134,0 1.5173,-0.1995 2.014,-0.5984 0.5709,-0.4575 0.8642,-1.1966 0.8642,-2.1939 V 19.8 h 5.3734 c 1.1847,0 1.8107,-0.4928 2.1277,-0.9073 0.387,-0.5045 0.578,-1.1537 0.578,-1.928 0,-0.7743 -0.199,-1.4313 -0.598,-1.9319 z" fill="#ffffff" />
+                </svg>
+                <svg xmlns="http://www.w3.org/2000/svg" width="130" height="32" viewBox="0 0 106 32" fill="none" style="vertical-align: middle;">
+                    <path d="M20.2614 20.5704C20.4961 20.1558 20.7229 19.8469 20.9419 19.6553C21.1609 19.4597 21.4425 19.362 21.7788 19.362C22.1425 19.362 22.5336 19.4636 22.9481 19.6748C23.3626 19.882 23.5699 20.2732 23.5699 20.8441C23.5699 21.3643 23.3665 21.9821 22.9676 22.6939C22.5648 23.4096 22.1308 24.0392 21.6615 24.5828C21.4777 24.79 21.1609 25.1107 20.7073 25.537C20.2536 25.9672 19.6553 26.3895 18.9161 26.8041C18.177 27.2186 17.301 27.5823 16.2881 27.8951C15.2753 28.208 14.106 28.3644 12.7802 28.3644C10.8562 28.3644 9.11197 28.0281 7.53986 27.3516C5.96776 26.675 4.62247 25.7286 3.50791 24.5085C2.38945 23.2883 1.52518 21.8062 0.915108 20.0659C0.305036 18.3256 0 16.3781 0 14.2233C0 12.0685 0.305036 10.1131 0.915108 8.3572C1.52518 6.6052 2.38945 5.11131 3.50791 3.87552C4.62638 2.63973 5.96776 1.68943 7.53986 1.01288C9.11197 0.336322 10.8562 0 12.7802 0C14.0512 0 15.1814 0.144697 16.1708 0.430179C17.1563 0.715661 18.001 1.04807 18.705 1.4235C19.405 1.79893 19.9759 2.19 20.4179 2.59281C20.8598 2.99561 21.1844 3.31629 21.3916 3.54702C21.8609 4.09452 22.3067 4.72415 22.7369 5.4359C23.1671 6.15156 23.3783 6.76554 23.3783 7.28567C23.3783 7.85663 23.1632 8.2477 22.7369 8.45497C22.3067 8.66224 21.9118 8.76783 21.5481 8.76783C21.2117 8.76783 20.9302 8.67006 20.7112 8.47452C20.4883 8.27899 20.2888 8.01306 20.1089 7.67674C19.8234 7.15661 19.4715 6.63258 19.0569 6.09681C18.6424 5.56495 18.1457 5.07611 17.5748 4.6342C17.0038 4.19229 16.3272 3.82859 15.549 3.54311C14.7708 3.25763 13.8596 3.11293 12.8232 3.11293C11.3411 3.11293 10.0388 3.38668 8.90862 3.93027C7.77842 4.47386 6.8242 5.23645 6.04597 6.21022C5.26774 7.18399 4.68113 8.35329 4.29397 9.71813C3.90681 11.083 3.71127 12.5808 3.71127 14.2194C3.71127 15.858 3.90681 17.3167 4.29397 18.6815C4.68504 20.0463 5.26774 21.2117 6.04597 22.1894C6.8242 23.1632 7.77842 23.9219 8.90862 24.4694C10.0388 25.0169 11.345 25.2867 12.8232 25.2867C13.9925 25.2867 14.9937 25.1264 15.8228 24.7979C16.6557 24.4733 17.3558 24.0705 17.9267 23.5894C18.4977 23.1084 18.967 22.5961 19.3307 22.0486C19.6944 21.505 20.0072 21.0084 20.2653 20.5704H20.2614Z" fill="#114F9E"/><path d="M38.6926 15.506V14.7278C38.6926 13.2456 38.3093 12.1428 37.5428 11.4154C36.7763 10.688 35.5366 10.3243 33.8198 10.3243C33.1433 10.3243 32.5606 10.4025 32.0678 10.5589C31.5751 10.7154 31.1527 10.8992 30.8007 11.1064C30.4488 11.3137 30.1633 11.5366 29.9443 11.7674C29.7253 12.002 29.5337 12.2093 29.3811 12.3931C29.123 12.7059 28.9001 12.9132 28.7202 13.0149C28.5364 13.1166 28.3057 13.1713 28.0202 13.1713C27.6057 13.1713 27.2224 13.0462 26.8705 12.7998C26.5185 12.5534 26.3425 12.2366 26.3425 11.8456C26.3425 11.6383 26.3621 11.4701 26.4012 11.3411C26.4403 11.212 26.4989 11.0673 26.5772 10.9109C26.6045 10.8327 26.7571 10.6137 27.0464 10.2461C27.3319 9.88239 27.766 9.49132 28.3526 9.07678C28.9353 8.66225 29.6901 8.29073 30.613 7.96614C31.536 7.64155 32.6583 7.4773 33.9841 7.4773C35.4662 7.4773 36.7177 7.66501 37.7423 8.04044C38.7669 8.41978 39.592 8.91644 40.2177 9.54216C40.8395 10.164 41.2971 10.8874 41.5826 11.7048C41.8681 12.5221 42.0128 13.3747 42.0128 14.2585V26.6867C42.0128 27.5432 41.4535 27.9734 40.339 27.9734C39.5842 27.9734 39.1227 27.8052 38.9546 27.465C38.7864 27.1287 38.7004 26.6594 38.7004 26.061V24.8917C38.4423 25.2554 38.1294 25.6309 37.7657 26.0219C37.402 26.413 36.9523 26.7689 36.4204 27.0935C35.8886 27.4181 35.2511 27.684 34.512 27.8912C33.7729 28.0985 32.9203 28.2041 31.9583 28.2041C30.789 28.2041 29.784 28.0594 28.9392 27.7739C28.0945 27.4884 27.3945 27.0935 26.8353 26.5851C26.276 26.0806 25.8615 25.4822 25.5878 24.794C25.314 24.1057 25.1771 23.3705 25.1771 22.5922C25.1771 21.5793 25.357 20.6447 25.7207 19.7843C26.0844 18.9279 26.7062 18.1927 27.59 17.5826C28.4739 16.9725 29.6471 16.4915 31.1175 16.1395C32.584 15.7876 34.4338 15.5881 36.6707 15.5334L38.6965 15.4943L38.6926 15.506ZM36.5495 18.1536C34.8874 18.1809 33.5343 18.2983 32.498 18.5055C31.4577 18.7128 30.6404 18.9944 30.0421 19.3424C29.4437 19.6944 29.0331 20.1167 28.8141 20.6095C28.5951 21.1022 28.4817 21.6615 28.4817 22.2833C28.4817 23.1671 28.7867 23.9258 29.3968 24.5632C30.0069 25.2007 31.0158 25.5174 32.4159 25.5174C33.636 25.5174 34.7467 25.2398 35.7478 24.6805C36.7489 24.1213 37.5076 23.4291 38.0277 22.5961C38.4697 21.8961 38.6887 20.9458 38.6887 19.753V18.1145L36.5456 18.1536H36.5495Z" fill="#114F9E"/><path d="M49.2907 26.413C49.2907 27.0113 49.142 27.422 48.8409 27.641C48.5437 27.86 48.1331 27.9734 47.613 27.9734C47.0928 27.9734 46.69 27.8639 46.4045 27.641C46.1191 27.422 45.9744 27.0113 45.9744 26.413V9.34662C45.9744 8.77565 46.1034 8.38458 46.3654 8.17731C46.6235 7.97005 47.0146 7.86446 47.5347 7.86446C48.0549 7.86446 48.4498 7.96613 48.7236 8.17731C48.9973 8.38458 49.1342 8.77565 49.1342 9.34662V11.5679C49.8342 10.2695 50.7142 9.32706 51.7661 8.74437C52.8181 8.16167 53.9405 7.86837 55.1372 7.86837C55.7355 7.86837 56.1618 7.99742 56.4238 8.25944C56.6819 8.52146 56.8149 8.93599 56.8149 9.50696C56.8149 10.0779 56.6858 10.5472 56.4238 10.8327C56.1657 11.1182 55.7355 11.2629 55.1372 11.2629C51.2421 11.2629 49.2907 13.6914 49.2907 18.5485V26.4208V26.413Z" fill="#114F9E"/><path d="M74.5813 17.4535C74.5813 18.3882 74.0494 18.8575 72.9818 18.8575H59.7323C59.7323 20.9615 60.2602 22.5844 61.3083 23.7263C62.3603 24.8722 63.8463 25.4431 65.7704 25.4431C66.5252 25.4431 67.1783 25.3454 67.7375 25.1498C68.2967 24.9543 68.7699 24.7236 69.161 24.4498C69.5521 24.1761 69.8689 23.8984 70.1152 23.6129C70.3616 23.3274 70.565 23.0811 70.7175 22.8738C70.8974 22.6157 71.0734 22.4201 71.2454 22.2911C71.4136 22.162 71.6678 22.0956 72.0041 22.0956C72.3678 22.0956 72.7237 22.2129 73.0756 22.4475C73.4276 22.6822 73.6036 22.995 73.6036 23.3822C73.6036 23.7185 73.4589 24.1213 73.1734 24.5906C72.9388 24.9543 72.6337 25.3493 72.2583 25.7795C71.8829 26.2057 71.4019 26.6163 70.8152 27.0074C70.2326 27.3985 69.5208 27.7231 68.6917 27.9812C67.8587 28.2393 66.885 28.3723 65.7704 28.3723C64.3156 28.3723 62.9977 28.1181 61.8167 27.6136C60.6357 27.1052 59.6267 26.3934 58.7976 25.4705C57.9646 24.5476 57.3311 23.4448 56.8892 22.1581C56.4473 20.8715 56.2283 19.4636 56.2283 17.9306C56.2283 16.3976 56.4473 14.9546 56.8892 13.6836C57.3311 12.4126 57.9607 11.3137 58.7781 10.3908C59.5954 9.46785 60.5848 8.75219 61.7385 8.24771C62.896 7.73932 64.1866 7.48903 65.614 7.48903C67.0414 7.48903 68.3554 7.74323 69.47 8.24771C70.5884 8.75219 71.5231 9.45612 72.2739 10.3517C73.0287 11.2472 73.5997 12.307 73.9868 13.5272C74.3779 14.7473 74.5695 16.0613 74.5695 17.4614L74.5813 17.4535ZM65.6179 10.3204C64.7067 10.3204 63.9167 10.469 63.2402 10.7662C62.5636 11.0634 61.9927 11.4662 61.5273 11.9746C61.058 12.483 60.6904 13.0774 60.4167 13.7657C60.1429 14.454 59.9669 15.1736 59.8887 15.9284H71.2259C71.1477 15.201 70.9873 14.4931 70.7409 13.8048C70.4946 13.1166 70.1426 12.5182 69.689 12.0137C69.2353 11.5053 68.6683 11.0986 67.9956 10.7858C67.3191 10.4729 66.5291 10.3165 65.6179 10.3165V10.3204Z" fill="#114F9E"/>
+                </svg>
+            </div>
+            <p style="color: #64748b; margin-top: 4px;">Sistema de Seguimiento Médico</p>
+        </div>
+        
+        <div style="background: white; padding: 24px; border-radius: 8px; border: 1px solid #e2e8f0;">
+            <p style="color: #334155; font-size: 16px;">Hola <strong>{full_name}</strong>,</p>
+            
+            <p style="color: #475569;">Tu código de verificación es:</p>
+            
+            <div style="text-align: center; margin: 24px 0;">
+                <span style="font-size: 36px; font-weight: bold; letter-spacing: 8px; color: #0ea5e9; background: #f0f9ff; padding: 12px 24px; border-radius: 8px; border: 2px dashed #0ea5e9;">
+                    {code}
+                </span>
+            </div>
+            
+            <p style="color: #64748b; font-size: 14px;">
+                Este código expira en <strong>10 minutos</strong>.<br>
+                Si no solicitaste este código, ignora este mensaje.
+            </p>
+        </div>
+        
+        <p style="text-align: center; color: #94a3b8; font-size: 12px; margin-top: 16px;">
+            &copy; 2026 CarePlus. Todos los derechos reservados.
+        </p>
+    </div>
+    """
+
+# Partes estáticas separadas una sola vez al importar: cada envío solo concatena
+_OTP_HEAD, _rest = OTP_TEMPLATE.split('{full_name}')
+_OTP_MIDDLE, _OTP_TAIL = _rest.split('{code}')
+
+
+def render_otp_email(code: str, full_name: str = "Usuario") -> str:
+    """HTML del correo OTP a partir de las partes pre-renderizadas."""
+    return ''.join((_OTP_HEAD, escape(full_name), _OTP_MIDDLE, code, _OTP_TAIL))
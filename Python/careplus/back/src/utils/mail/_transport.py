@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+import time
+
+import resend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmailMessage:
+    to: list[str]
+    subject: str
+    html: str
+    # Texto que se registra si el correo no se puede entregar (p. ej. el código OTP)
+    fallback: str = ''
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class EmailTransport:
+    """Proveedor de envío. ``send`` lanza una excepción si el correo no se entregó."""
+
+    name = 'base'
+
+    async def send(self, message: EmailMessage) -> None:
+        raise NotImplementedError
+
+
+class ResendTransport(EmailTransport):
+    """Envío vía API de Resend (cliente síncrono, se ejecuta en un hilo)."""
+
+    name = 'resend'
+
+    def __init__(self, api_key: str, from_email: str):
+        resend.api_key = api_key
+        self.__sender = f"CarePlus <{from_email}>"
+
+    def __send(self, message: EmailMessage) -> None:
+        resend.Emails.send({
+            "from": self.__sender,
+            "to": message.to,
+            "subject": message.subject,
+            "html": message.html,
+        })
+
+    async def send(self, message: EmailMessage) -> None:
+        await asyncio.to_thread(self.__send, message)
+        logger.info(f"Email sent to {', '.join(message.to)} via Resend")
+
+
+class ConsoleTransport(EmailTransport):
+    """Sin proveedor configurado: el correo solo se registra en el log."""
+
+    name = 'console'
+
+    async def send(self, message: EmailMessage) -> None:
+        logger.warning(f"RESEND_API_KEY not configured, email to {', '.join(message.to)} not sent")
+
+
+class StubTransport(EmailTransport):
+    """Transporte local para pruebas: guarda los mensajes y puede simular fallos y latencia.
+
+    :param failures: Número de envíos que fallan antes de empezar a entregar
+    :param latency: Segundos que tarda cada envío
+    """
+
+    name = 'stub'
+
+    def __init__(self, failures: int = 0, latency: float = 0.0):
+        self.failures = failures
+        self.latency = latency
+        self.attempts = 0
+        self.sent: list[EmailMessage] = []
+
+    async def send(self, message: EmailMessage) -> None:
+        self.attempts += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("stub transport failure")
+        self.sent.append(message)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from . import EmailDispatcher, EmailMessage, StubTransport, render_otp_email
+
+
+def _message(to: str = 'user@careplus.test') -> EmailMessage:
+    return EmailMessage(to=[to], subject='OTP', html=render_otp_email('123456'), fallback='fallback')
+
+
+def test_enqueue_does_not_wait_for_the_provider():
+
+    transport = StubTransport(latency=0.2)
+    dispatcher = EmailDispatcher(transport, workers=1, backoff_seconds=0)
+
+    async def scenario():
+        await dispatcher.start()
+
+        started = time.perf_counter()
+        assert await dispatcher.enqueue(_message())
+        assert time.perf_counter() - started < 0.05
+        assert dispatcher.metrics()['queue_depth'] + len(transport.sent) <= 1
+
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+
+    metrics = dispatcher.metrics()
+    assert len(transport.sent) == 1
+    assert metrics['sent'] == 1
+    assert metrics['latency_p50_ms'] >= 200
+
+
+def test_failed_sends_are_retried_with_backoff():
+
+    transport = StubTransport(failures=2)
+    dispatcher = EmailDispatcher(transport, workers=1, max_retries=3, backoff_seconds=0.01)
+
+    assert asyncio.run(dispatcher.deliver(_message()))
+    assert transport.attempts == 3
+    assert dispatcher.metrics()['retries'] == 2
+
+    transport.failures = 10
+    assert not asyncio.run(dispatcher.deliver(_message()))
+    assert dispatcher.metrics()['failed'] == 1
+
+
+def test_full_queue_drops_messages():
+
+    transport = StubTransport(latency=0.05)
+    dispatcher = EmailDispatcher(transport, max_size=2, workers=1)
+
+    async def scenario():
+        await dispatcher.start()
+        results = [await dispatcher.enqueue(_message(f'{i}@careplus.test')) for i in range(5)]
+        await dispatcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert results.count(False) == dispatcher.metrics()['dropped'] > 0
+    assert len(transport.sent) == results.count(True)
+
+
+def test_otp_template_is_rendered_from_static_parts():
+
+    html = render_otp_email('987654', '<Ana>')
+
+    assert '987654' in html
+    assert '&lt;Ana&gt;' in html
+    assert '{code}' not in html and '{full_name}' not in html
@@ -0,0 +1,35 @@
+import logging
+from typing import Optional
+
+from src._cache import get_redis
+from src._settings import settings
+from ._base import OtpStore, OtpVerification
+from ._table import TableOtpStore
+from ._memory import MemoryOtpStore
+from ._redis import RedisOtpStore
+from ._purge import VerificationCodePurger, verification_code_purger
+
+logger = logging.getLogger(__name__)
+
+_store: Optional[OtpStore] = None
+
+
+def get_otp_store() -> OtpStore:
+    """Almacén OTP configurado con OTP_BACKEND ('table', 'memory' o 'redis')."""
+    global _store
+
+    if _store is None:
+        if settings.otp_backend == 'memory':
+            _store = MemoryOtpStore()
+        elif settings.otp_backend == 'redis':
+            redis = get_redis()
+            if redis is None:
+                # Sin Redis se usa la tabla, que sí es compartida entre instancias
+                logger.warning("OTP_BACKEND=redis without APP_REDIS_REDIS_URL, using table store")
+                _store = TableOtpStore()
+            else:
+                _store = RedisOtpStore(redis)
+        else:
+            _store = TableOtpStore()
+
+    return _store
@@ -0,0 +1,61 @@
+from typing import Optional, TypedDict
+
+
+class OtpVerification(TypedDict):
+    '''Resultado de verificar un código
+
+    status: 'valid' | 'invalid' | 'locked' | 'not_found'
+    '''
+
+    status: str
+    remaining_attempts: int
+    access_token: Optional[str]
+    refresh_token: Optional[str]
+
+
+def outcome(status: str, remaining_attempts: int = 0, access_token: Optional[str] = None,
+            refresh_token: Optional[str] = None) -> OtpVerification:
+    return {
+        'status': status,
+        'remaining_attempts': remaining_attempts,
+        'access_token': access_token,
+        'refresh_token': refresh_token,
+    }
+
+
+class OtpStore:
+    """Almacén de códigos OTP pendientes.
+
+    Todas las implementaciones comparten la misma semántica que
+    ``verify_verification_code``: cada verificación consume un intento antes de
+    comparar, un código correcto solo se acepta una vez y, agotados los intentos,
+    el código se descarta.
+    """
+
+    name = 'base'
+
+    async def store(self, user_id: str, email: str, code: str, access_token: str, refresh_token: str,
+                    ttl_seconds: int, max_attempts: int) -> None:
+        '''Replace the pending code of the user
+
+        :param user_id: Owner of the code
+        :param email: Address the code is sent to
+        :param code: OTP code
+        :param access_token: Session token returned once the code is verified
+        :param refresh_token: Session refresh token
+        :param ttl_seconds: Seconds until the code expires
+        :param max_attempts: Allowed verification attempts
+        '''
+
+        raise NotImplementedError
+
+    async def verify(self, user_id: str, code: str) -> OtpVerification:
+        '''Consume one attempt and check the code
+
+        :param user_id: Owner of the code
+        :param code: Code sent by the user
+        :return: Verification outcome
+        :rtype: OtpVerification
+        '''
+
+        raise NotImplementedError
@@ -0,0 +1,49 @@
+import hmac
+import threading
+
+from src._cache import TTLCache
+from ._base import OtpStore, OtpVerification, outcome
+
+
+class MemoryOtpStore(OtpStore):
+    """Códigos en memoria del proceso, con expiración por entrada.
+
+    Solo sirve con una única instancia de la API: otro proceso no ve los códigos.
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_size: int = 10_000):
+        self.__codes = TTLCache(ttl_seconds=600, max_size=max_size)
+        self.__lock = threading.Lock()
+
+    async def store(self, user_id: str, email: str, code: str, access_token: str, refresh_token: str,
+                    ttl_seconds: int, max_attempts: int) -> None:
+        record = {
+            'email': email,
+            'code': code,
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'attempts': 0,
+            'max_attempts': max_attempts,
+        }
+        self.__codes.set(user_id, record, ttl_seconds=ttl_seconds)
+
+    async def verify(self, user_id: str, code: str) -> OtpVerification:
+        with self.__lock:
+            record = self.__codes.get(user_id)
+            if record is None:
+                return outcome('not_found')
+
+            if record['attempts'] >= record['max_attempts']:
+                self.__codes.delete(user_id)
+                return outcome('locked')
+
+            record['attempts'] += 1
+            remaining = record['max_attempts'] - record['attempts']
+
+            if not hmac.compare_digest(record['code'].encode(), code.encode()):
+                return outcome('invalid', remaining)
+
+            self.__codes.delete(user_id)
+            return outcome('valid', remaining, record['access_token'], record['refresh_token'])
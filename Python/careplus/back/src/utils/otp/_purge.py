@@ -0,0 +1,112 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from supabase import AsyncClient
+
+from src.database import SupabaseClient
+from src.utils.scheduler import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationCodePurger(ScheduledJob):
+    """Purga programada de ``verification_codes`` (reemplaza al trigger por INSERT).
+
+    Cada ``interval`` segundos borra los códigos usados o expirados en lotes de
+    ``batch_size`` filas (``purge_verification_codes``, una transacción corta por
+    lote) hasta que un lote sale incompleto o se alcanzan ``max_batches``; lo que
+    quede se borra en el turno siguiente. Cada ejecución queda registrada en
+    ``purge_runs`` con las filas borradas.
+    """
+
+    name = 'Verification code purge'
+    JOB = 'verification_codes'
+
+    def __init__(self):
+        super().__init__()
+        self.batch_size = 1000
+        self.max_batches = 50
+        self.last_deleted = 0
+        self.last_batches = 0
+        self.deleted = 0
+
+    async def purge(self, client: Optional[AsyncClient] = None) -> int:
+        '''Delete used and expired codes now, in bounded batches
+
+        :param client: Client to use (service_role by default)
+        :return: Rows deleted in this run
+        :rtype: int
+        '''
+
+        client = client or SupabaseClient.generate_admin_client()
+
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        deleted, batches, error = 0, 0, None
+        try:
+            while batches < self.max_batches:
+                response = await client.rpc('purge_verification_codes', {'p_batch_size': self.batch_size}).execute()
+                batches += 1
+                count = response.data or 0
+                deleted += count
+                if count < self.batch_size:
+                    break
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self._record_run(started)
+            self.last_deleted = deleted
+            self.last_batches = batches
+            self.deleted += deleted
+            await self.__record(client, started_at, deleted, batches, error)
+
+        return deleted
+
+    async def __record(self, client: AsyncClient, started_at: datetime, deleted: int, batches: int,
+                       error: Optional[str]) -> None:
+        try:
+            await client.table('purge_runs').insert({
+                'job': self.JOB,
+                'started_at': started_at.isoformat(),
+                'deleted': deleted,
+                'batches': batches,
+                'error': error,
+            }, returning='minimal').execute()
+        except Exception as e:
+            # El registro no debe ocultar el resultado de la purga
+            logger.warning(f"Could not record verification code purge: {e}")
+
+    async def run(self) -> int:
+        return await self.purge()
+
+    async def start(self, interval: int, batch_size: int = 1000, max_batches: int = 50) -> None:
+        '''Schedule the purge (interval <= 0 disables it); the first run starts right
+        away, since inserts no longer clean the table
+
+        :param interval: Seconds between runs
+        :param batch_size: Rows deleted per transaction
+        :param max_batches: Batches per run at most
+        '''
+
+        if interval <= 0 or self.scheduled:
+            return
+
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        await super().start(interval)
+
+    def metrics(self) -> dict:
+        return {
+            **super().metrics(),
+            'batch_size': self.batch_size,
+            'max_batches': self.max_batches,
+            'last_deleted': self.last_deleted,
+            'last_batches': self.last_batches,
+            'deleted': self.deleted,
+        }
+
+
+verification_code_purger = VerificationCodePurger()
@@ -0,0 +1,73 @@
+import hmac
+
+import redis.asyncio as asyncredis
+from ._base import OtpStore, OtpVerification, outcome
+
+KEY_PREFIX = 'careplus:otp:'
+
+
+class RedisOtpStore(OtpStore):
+    """Códigos en Redis: la expiración es el TTL de la clave y los intentos un ``INCR``.
+
+    Por usuario se guardan dos claves con el mismo TTL:
+    ``careplus:otp:<user_id>`` (hash con código y tokens) y
+    ``careplus:otp:<user_id>:attempts`` (contador). No se toca Postgres.
+    """
+
+    name = 'redis'
+
+    def __init__(self, redis: asyncredis.Redis):
+        self.__redis = redis
+
+    @staticmethod
+    def _keys(user_id: str) -> tuple[str, str]:
+        key = KEY_PREFIX + user_id
+        return key, key + ':attempts'
+
+    async def store(self, user_id: str, email: str, code: str, access_token: str, refresh_token: str,
+                    ttl_seconds: int, max_attempts: int) -> None:
+        key, attempts_key = self._keys(user_id)
+
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={
+                'email': email,
+                'code': code,
+                'access_token': access_token,
+                'refresh_token': refresh_token or '',
+                'max_attempts': max_attempts,
+            })
+            pipe.expire(key, ttl_seconds)
+            pipe.set(attempts_key, 0, ex=ttl_seconds)
+            await pipe.execute()
+
+    async def verify(self, user_id: str, code: str) -> OtpVerification:
+        key, attempts_key = self._keys(user_id)
+
+        # INCR y lectura en el mismo MULTI: cada petición obtiene un número de intento distinto
+        async with self.__redis.pipeline(transaction=True) as pipe:
+            pipe.incr(attempts_key)
+            pipe.hgetall(key)
+            attempts, record = await pipe.execute()
+
+        if not record:
+            # El código expiró: el INCR recreó el contador sin TTL
+            await self.__redis.delete(attempts_key)
+            return outcome('not_found')
+
+        max_attempts = int(record['max_attempts'])
+        if attempts > max_attempts:
+            await self.__redis.delete(key, attempts_key)
+            return outcome('locked')
+
+        remaining = max_attempts - attempts
+
+        if not hmac.compare_digest(record['code'].encode(), code.encode()):
+            return outcome('invalid', remaining)
+
+        # Un código correcto se acepta una sola vez: gana quien borra la clave
+        if not await self.__redis.delete(key):
+            return outcome('not_found')
+        await self.__redis.delete(attempts_key)
+
+        return outcome('valid', remaining, record['access_token'], record['refresh_token'] or None)
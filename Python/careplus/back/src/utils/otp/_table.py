@@ -0,0 +1,51 @@
+from typing import Optional
+
+from supabase import AsyncClient
+from src.database import SupabaseClient
+from ._base import OtpStore, OtpVerification, outcome
+
+
+class TableOtpStore(OtpStore):
+    """Códigos en la tabla ``verification_codes`` mediante las funciones
+    ``store_verification_code`` / ``verify_verification_code`` (una llamada cada una).
+    """
+
+    name = 'table'
+
+    def __init__(self, client: Optional[AsyncClient] = None):
+        # Cliente para verificar; por defecto el anon compartido
+        self.__client = client
+
+    async def store(self, user_id: str, email: str, code: str, access_token: str, refresh_token: str,
+                    ttl_seconds: int, max_attempts: int) -> None:
+        # La inserción se hace con el token del usuario (RLS: user_id = auth.uid())
+        client = self.__client or SupabaseClient(access_token).client
+
+        await client.rpc('store_verification_code', {
+            'p_user_id': user_id,
+            'p_email': email,
+            'p_code': code,
+            'p_access_token': access_token,
+            'p_refresh_token': refresh_token,
+            'p_ttl_seconds': ttl_seconds,
+            'p_max_attempts': max_attempts,
+        }).execute()
+
+    async def verify(self, user_id: str, code: str) -> OtpVerification:
+        client = self.__client or SupabaseClient.generate_client()
+
+        result = await client.rpc('verify_verification_code', {
+            'p_user_id': user_id,
+            'p_code': code,
+        }).execute()
+
+        if not result.data:
+            return outcome('not_found')
+
+        record = result.data[0]
+        return outcome(
+            record['status'],
+            record.get('remaining_attempts') or 0,
+            record.get('access_token'),
+            record.get('refresh_token'),
+        )
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import httpx
+from src.database import SupabaseClientFactory
+from ._purge import VerificationCodePurger
+
+
+def test_purge_stops_at_partial_batch_and_records_the_run():
+    batches = [3, 3, 1]
+    calls: list[tuple[str, dict]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.url.path, json.loads(request.content)))
+        if request.url.path.endswith('/rpc/purge_verification_codes'):
+            count = batches[sum(path.endswith('/rpc/purge_verification_codes') for path, _ in calls) - 1]
+            return httpx.Response(200, content=json.dumps(count), headers={'content-type': 'application/json'})
+        return httpx.Response(201)
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    purger = VerificationCodePurger()
+    purger.batch_size = 3
+
+    assert asyncio.run(purger.purge(client=factory.anon)) == 7
+
+    rpc_calls = [body for path, body in calls if path.endswith('/rpc/purge_verification_codes')]
+    assert rpc_calls == [{'p_batch_size': 3}] * 3
+
+    path, record = calls[-1]
+    assert path.endswith('/purge_runs')
+    assert record['job'] == 'verification_codes' and record['deleted'] == 7 and record['batches'] == 3
+    assert record['error'] is None
+
+    metrics = purger.metrics()
+    assert metrics['last_deleted'] == 7 and metrics['deleted'] == 7 and metrics['runs'] == 1
+
+
+def test_purge_is_bounded_by_max_batches():
+    calls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith('/purge_runs'):
+            return httpx.Response(201)
+        return httpx.Response(200, content='2', headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    purger = VerificationCodePurger()
+    purger.batch_size, purger.max_batches = 2, 4
+
+    # Lotes siempre llenos: el resto queda para el turno siguiente
+    assert asyncio.run(purger.purge(client=factory.anon)) == 8
+    assert sum(path.endswith('/rpc/purge_verification_codes') for path in calls) == 4
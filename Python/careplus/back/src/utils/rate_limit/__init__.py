@@ -0,0 +1,2 @@
+from ._backends import RateLimitBackend, MemoryRateLimitBackend, RedisRateLimitBackend
+from ._dependency import rate_limit, api_identifier, body_identifier, get_rate_limit_backend
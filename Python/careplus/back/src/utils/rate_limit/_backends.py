@@ -0,0 +1,107 @@
+import logging
+import time
+from collections import OrderedDict
+
+import redis.asyncio as asyncredis
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend:
+    """Almacén de token buckets.
+
+    ``hit`` consume un token del bucket ``key`` (capacidad ``capacity``, recarga de
+    ``refill_rate`` tokens por segundo) y retorna ``(permitido, segundos hasta el
+    próximo token)``.
+    """
+
+    name = 'base'
+
+    async def hit(self, key: str, capacity: int, refill_rate: float) -> tuple[bool, float]:
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Buckets en memoria del proceso.
+
+    No usa locks: todos los handlers son ``async`` y ``hit`` no cede el control del
+    event loop entre la lectura y la escritura, así que cada actualización es atómica.
+
+    :param max_keys: Buckets guardados como máximo (se descartan los menos usados)
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.__buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, capacity: int, refill_rate: float) -> tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self.__buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self.__buckets[key] = (tokens, now)
+        self.__buckets.move_to_end(key)
+        if len(self.__buckets) > self.max_keys:
+            self.__buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_rate
+
+
+# Recarga y consumo en un solo paso atómico dentro de Redis (reloj del servidor)
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+
+if allowed == 1 then
+    return {1, '0'}
+end
+return {0, tostring((1 - tokens) / rate)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets compartidos entre instancias en Redis (un script Lua por petición).
+
+    Si Redis no responde la petición se deja pasar: el límite es una protección, no
+    una dependencia del login.
+    """
+
+    name = 'redis'
+    KEY_PREFIX = 'careplus:ratelimit:'
+
+    def __init__(self, redis: asyncredis.Redis):
+        self.__script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, capacity: int, refill_rate: float) -> tuple[bool, float]:
+        try:
+            allowed, retry_after = await self.__script(
+                keys=[self.KEY_PREFIX + key],
+                args=[capacity, refill_rate],
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit: Redis unavailable ({e})")
+            return True, 0.0
+
+        return bool(int(allowed)), float(retry_after)
@@ -0,0 +1,118 @@
+import logging
+import math
+from typing import Awaitable, Callable, Optional
+
+from fastapi import HTTPException, Request
+from src._cache import get_redis
+from src._settings import settings
+from ._backends import RateLimitBackend, MemoryRateLimitBackend, RedisRateLimitBackend
+
+logger = logging.getLogger(__name__)
+
+Identifier = Callable[[Request], Awaitable[Optional[str]]]
+
+RATE_LIMIT_DETAIL = "Demasiadas solicitudes. Intenta de nuevo más tarde."
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """Backend configurado con RATE_LIMIT_BACKEND ('memory' o 'redis')."""
+    global _backend
+
+    if _backend is None:
+        redis = get_redis() if settings.rate_limit_backend == 'redis' else None
+        if settings.rate_limit_backend == 'redis' and redis is None:
+            logger.warning("RATE_LIMIT_BACKEND=redis without APP_REDIS_REDIS_URL, using memory backend")
+
+        _backend = RedisRateLimitBackend(redis) if redis is not None else MemoryRateLimitBackend()
+
+    return _backend
+
+
+async def api_identifier(request: Request) -> Optional[str]:
+    """IP del cliente.
+
+    Por defecto la dirección de la conexión: X-Forwarded-For lo escribe el cliente y
+    un valor nuevo en cada petición tendría un bucket nuevo. Detrás de
+    RATE_LIMIT_TRUSTED_PROXIES proxies se toma el salto que agregó el más externo de
+    ellos (el N-ésimo desde la derecha); lo que esté a su izquierda no es confiable.
+    """
+
+    client = request.client.host if request.client else None
+    trusted = settings.rate_limit_trusted_proxies
+    if trusted <= 0:
+        return client
+
+    hops = [hop.strip() for hop in request.headers.get('x-forwarded-for', '').split(',') if hop.strip()]
+    if not hops:
+        return client
+    return hops[-min(trusted, len(hops))]
+
+
+def body_identifier(field: str) -> Identifier:
+    '''Identify requests by a field of the JSON body (email, user_id...)
+
+    :param field: Body field
+    :return: Identifier that returns the normalized value, or None if missing
+    :rtype: Identifier
+    '''
+
+    async def identifier(request: Request) -> Optional[str]:
+        try:
+            body = await request.json()
+        except Exception:
+            return None
+
+        value = body.get(field) if isinstance(body, dict) else None
+        return str(value).strip().lower() if value else None
+
+    return identifier
+
+
+def parse_limit(spec: str) -> tuple[int, float]:
+    '''Parse a "<times>/<seconds>" limit
+
+    :param spec: Limit, e.g. "5/60"
+    :return: (times, seconds)
+    :rtype: tuple[int, float]
+    '''
+
+    times, seconds = spec.split('/')
+    return int(times), float(seconds)
+
+
+def rate_limit(name: str, times: int, seconds: float, identifier: Identifier = api_identifier) -> Callable:
+    '''Token bucket dependency: ``times`` requests every ``seconds`` per identifier
+
+    The limit can be overridden per rule with RATE_LIMITS, e.g.
+    ``RATE_LIMITS='{"auth.login:ip": "20/60"}'``. Throttled requests get a 429 with
+    ``Retry-After`` before the handler (and any upstream call) runs.
+
+    :param name: Rule name, unique per route and identifier
+    :param times: Requests allowed in the window (bucket capacity)
+    :param seconds: Window length
+    :param identifier: Function that extracts the key from the request
+    :return: FastAPI dependency
+    :rtype: Callable
+    '''
+
+    async def dependency(request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+
+        key = await identifier(request)
+        if key is None:
+            return
+
+        capacity, window = parse_limit(settings.rate_limits[name]) if name in settings.rate_limits else (times, seconds)
+        allowed, retry_after = await get_rate_limit_backend().hit(f'{name}:{key}', capacity, capacity / window)
+
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=RATE_LIMIT_DETAIL,
+                headers={'Retry-After': str(max(1, math.ceil(retry_after)))},
+            )
+
+    return dependency
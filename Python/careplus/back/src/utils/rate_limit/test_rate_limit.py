@@ -0,0 +1,91 @@
+import asyncio
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from src._settings import settings
+from . import MemoryRateLimitBackend, body_identifier, rate_limit
+
+
+def test_memory_bucket_refills_over_time():
+
+    backend = MemoryRateLimitBackend()
+
+    async def scenario():
+        results = [await backend.hit('key', capacity=3, refill_rate=20) for _ in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert 0 < results[-1][1] <= 0.05
+
+        await asyncio.sleep(0.06)
+        assert (await backend.hit('key', capacity=3, refill_rate=20))[0]
+        # Otra clave tiene su propio bucket
+        assert (await backend.hit('other', capacity=3, refill_rate=20))[0]
+
+    asyncio.run(scenario())
+
+
+def test_throttled_requests_never_reach_the_handler():
+
+    calls = []
+    app = FastAPI()
+
+    @app.post('/login', dependencies=[
+        Depends(rate_limit('test.login:ip', times=100, seconds=60)),
+        Depends(rate_limit('test.login:email', times=2, seconds=60, identifier=body_identifier('email'))),
+    ])
+    async def login(body: dict):
+        calls.append(body['email'])
+        return {'ok': True}
+
+    client = TestClient(app)
+
+    statuses = [client.post('/login', json={'email': 'A@careplus.test'}).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert calls == ['A@careplus.test'] * 2
+
+    throttled = client.post('/login', json={'email': 'a@careplus.test '})
+    assert throttled.status_code == 429
+    assert int(throttled.headers['retry-after']) >= 1
+
+    # Otro email no comparte bucket
+    assert client.post('/login', json={'email': 'b@careplus.test'}).status_code == 200
+
+
+def test_limits_can_be_overridden_per_rule():
+
+    app = FastAPI()
+
+    @app.get('/ping', dependencies=[Depends(rate_limit('test.ping:ip', times=100, seconds=60))])
+    async def ping():
+        return {'ok': True}
+
+    settings.rate_limits['test.ping:ip'] = '1/60'
+    try:
+        client = TestClient(app)
+        assert [client.get('/ping').status_code for _ in range(2)] == [200, 429]
+    finally:
+        del settings.rate_limits['test.ping:ip']
+
+
+def test_spoofed_forwarded_for_does_not_reset_the_bucket():
+
+    app = FastAPI()
+
+    @app.get('/otp', dependencies=[Depends(rate_limit('test.otp:ip', times=2, seconds=60))])
+    async def otp():
+        return {'ok': True}
+
+    client = TestClient(app)
+
+    # Sin proxies de confianza la cabecera se ignora
+    statuses = [client.get('/otp', headers={'X-Forwarded-For': f'10.0.0.{i}'}).status_code for i in range(3)]
+    assert statuses == [200, 200, 429]
+
+    # Con un proxy, cuenta el salto que agregó el proxy (el de la derecha)
+    settings.rate_limit_trusted_proxies = 1
+    try:
+        statuses = [
+            client.get('/otp', headers={'X-Forwarded-For': f'10.1.0.{i}, 203.0.113.7'}).status_code for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+    finally:
+        settings.rate_limit_trusted_proxies = 0
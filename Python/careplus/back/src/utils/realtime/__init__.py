@@ -0,0 +1 @@
+from ._hub import RealtimeHub, realtime, NAMESPACE, RESOURCES, resource_room, patient_room
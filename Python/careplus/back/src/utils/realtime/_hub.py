@@ -0,0 +1,233 @@
+import logging
+from collections import defaultdict
+from typing import Literal, Optional
+
+import socketio
+from fastapi import FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi_socketio import SocketManager
+
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.utils import get_auth_context, get_user_role, reference_catalog
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = '/realtime'
+EVENT = 'changes'
+
+ChangeOp = Literal['insert', 'update', 'delete']
+
+# Recursos a los que se puede suscribir un cliente (salas resource:<nombre>) y el
+# permiso del rol que lo exige; el historial médico no tiene flag propio y es parte
+# del expediente del paciente
+RESOURCES: dict[str, str] = {
+    'patients': 'can_manage_patients',
+    'consultations': 'can_manage_consultations',
+    'diagnostics': 'can_manage_diagnostics',
+    'treatments': 'can_manage_treatments',
+    'medical_history': 'can_manage_patients',
+}
+
+# Cambios por mensaje en las altas masivas
+MAX_BATCH = 500
+
+
+def resource_room(resource: str) -> str:
+    return f'resource:{resource}'
+
+
+def patient_room(patient_id: str) -> str:
+    return f'patient:{patient_id}'
+
+
+def _bearer(environ: dict, auth: Optional[dict]) -> Optional[str]:
+    '''Token from the socket.io ``auth`` payload or the Authorization header'''
+
+    if isinstance(auth, dict) and auth.get('token'):
+        return auth['token']
+    header = environ.get('HTTP_AUTHORIZATION', '')
+    scheme, _, token = header.partition(' ')
+    return token if scheme.lower() == 'bearer' and token else None
+
+
+async def _can_manage(auth: AuthContext, resource: str) -> bool:
+    '''Whether the user's role has the permission flag of ``resource`` (see ``RESOURCES``)'''
+
+    user_id = auth.user.user.id if auth.user and auth.user.user else None
+    role = await get_user_role(auth, user_id) if user_id else None
+    row = await reference_catalog.lookup_role(auth, role) if role else None
+    return bool(row and row.get(RESOURCES[resource]))
+
+
+class RealtimeNamespace(socketio.AsyncNamespace):
+    """Namespace ``/realtime``: conexión autenticada con el mismo token de la API y
+    suscripción a salas por recurso (``{"resource": "consultations"}``, según los
+    permisos ``can_manage_*`` del rol) o por paciente (``{"patient_id": "..."}``, según
+    RLS). Los mensajes ``changes`` solo traen la referencia del cambio; el cliente
+    vuelve a pedir el registro por la API si lo necesita."""
+
+    def __init__(self, hub: 'RealtimeHub'):
+        super().__init__(NAMESPACE)
+        self.hub = hub
+
+    async def on_connect(self, sid: str, environ: dict, auth: Optional[dict] = None):
+        token = _bearer(environ, auth)
+        if not token:
+            raise socketio.exceptions.ConnectionRefusedError("Token requerido")
+
+        try:
+            context = await get_auth_context(HTTPAuthorizationCredentials(scheme='Bearer', credentials=token))
+        except HTTPException as e:
+            raise socketio.exceptions.ConnectionRefusedError(e.detail)
+
+        await self.save_session(sid, {'auth': context})
+        self.hub.connections += 1
+
+    async def on_disconnect(self, sid: str, *args):
+        self.hub.connections = max(0, self.hub.connections - 1)
+
+    async def __room(self, sid: str, data) -> tuple[Optional[str], Optional[str]]:
+        '''(room, error) for a subscribe/unsubscribe payload'''
+
+        data = data if isinstance(data, dict) else {}
+        auth: AuthContext = (await self.get_session(sid))['auth']
+
+        if data.get('resource'):
+            if data['resource'] not in RESOURCES:
+                return None, f"Recurso no válido: {data['resource']}"
+            # La sala del recurso recibe todos los cambios, incluidos los de filas que RLS
+            # no le mostraría: solo para los roles con el permiso del recurso
+            if not await _can_manage(auth, data['resource']):
+                return None, f"Sin permiso para {data['resource']}"
+            return resource_room(data['resource']), None
+
+        if data.get('patient_id'):
+            # Solo los pacientes que el usuario puede leer (RLS)
+            response = await auth.client.table('patients').select('id').eq('id', data['patient_id']).limit(1).execute()
+            if not response.data:
+                return None, "Paciente no encontrado"
+            return patient_room(data['patient_id']), None
+
+        return None, "Se requiere resource o patient_id"
+
+    async def on_subscribe(self, sid: str, data=None) -> dict:
+        try:
+            room, error = await self.__room(sid, data)
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+        if error:
+            return {'ok': False, 'error': error}
+
+        await self.enter_room(sid, room)
+        return {'ok': True, 'room': room}
+
+    async def on_unsubscribe(self, sid: str, data=None) -> dict:
+        data = data if isinstance(data, dict) else {}
+        room = (
+            resource_room(data['resource']) if data.get('resource')
+            else patient_room(data['patient_id']) if data.get('patient_id')
+            else None
+        )
+        if room is None:
+            return {'ok': False, 'error': "Se requiere resource o patient_id"}
+
+        await self.leave_room(sid, room)
+        return {'ok': True, 'room': room}
+
+
+class RealtimeHub:
+    """Publicación de cambios de los recursos clínicos por socket.io.
+
+    Los routers de escritura llaman a ``publish`` después de confirmar el cambio. Cada
+    cambio es compacto (recurso, id, operación, ``updated_at`` y paciente) y va a la
+    sala del recurso y a la del paciente. Con ``REALTIME_BACKEND=redis`` los mensajes
+    pasan por el pub/sub de Redis, así cada proceso de la API entrega a sus propios
+    sockets los cambios hechos en cualquiera de ellos. Un fallo al publicar nunca
+    hace fallar la escritura.
+    """
+
+    def __init__(self):
+        self.server: Optional[socketio.AsyncServer] = None
+        self.connections = 0
+        self.published = 0
+        self.failures = 0
+
+    def mount(self, app: FastAPI, cors_allowed_origins: list[str]) -> None:
+        '''Mount the socket.io server on ``/ws`` (path ``/ws/socket.io``)
+
+        :param app: FastAPI application
+        :param cors_allowed_origins: Same origins as the HTTP API
+        '''
+
+        if not settings.realtime_enabled or self.server is not None:
+            return
+
+        manager = None
+        if settings.realtime_backend == 'redis':
+            if settings.app_redis_redis_url:
+                manager = socketio.AsyncRedisManager(
+                    settings.app_redis_redis_url, channel=settings.realtime_redis_channel
+                )
+            else:
+                logger.warning("REALTIME_BACKEND=redis without APP_REDIS_REDIS_URL, events stay in this process")
+
+        SocketManager(
+            app,
+            mount_location='/ws',
+            # Starlette pasa la ruta completa a las apps montadas: el path incluye el prefijo
+            socketio_path='ws/socket.io',
+            cors_allowed_origins=cors_allowed_origins,
+            client_manager=manager,
+        )
+        self.server = app.sio
+        self.server.register_namespace(RealtimeNamespace(self))
+
+    async def publish(self, resource: str, op: ChangeOp, *rows: dict) -> None:
+        '''Push the change of ``rows`` to the resource room and to each patient room
+
+        :param resource: Table written ('consultations', 'patients'...)
+        :param op: insert, update or delete
+        :param rows: Rows written (``id`` and, when present, ``updated_at`` and ``patient_id``)
+        '''
+
+        if self.server is None or not rows:
+            return
+
+        by_patient: dict[str, list[dict]] = defaultdict(list)
+        changes: list[dict] = []
+
+        for row in rows:
+            patient_id = row['id'] if resource == 'patients' else row.get('patient_id')
+            change = {
+                'resource': resource,
+                'id': row['id'],
+                'op': op,
+                'updated_at': row.get('updated_at'),
+                'patient_id': patient_id,
+            }
+            changes.append(change)
+            if patient_id:
+                by_patient[patient_id].append(change)
+
+        try:
+            for start in range(0, len(changes), MAX_BATCH):
+                await self.server.emit(EVENT, changes[start:start + MAX_BATCH], to=resource_room(resource), namespace=NAMESPACE)
+            for patient_id, patient_changes in by_patient.items():
+                await self.server.emit(EVENT, patient_changes, to=patient_room(patient_id), namespace=NAMESPACE)
+            self.published += len(changes)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Realtime publish of {resource} failed: {e}")
+
+    def metrics(self) -> dict:
+        return {
+            'enabled': self.server is not None,
+            'backend': type(self.server.manager).__name__ if self.server is not None else None,
+            'connections': self.connections,
+            'published': self.published,
+            'failures': self.failures,
+        }
+
+
+realtime = RealtimeHub()
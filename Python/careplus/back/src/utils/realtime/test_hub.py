@@ -0,0 +1,99 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+import socketio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from supabase_auth import User, UserResponse
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from ._hub import RealtimeHub, RealtimeNamespace, NAMESPACE, MAX_BATCH
+
+
+def test_publish_sends_compact_changes_to_resource_and_patient_rooms():
+    hub = RealtimeHub()
+    hub.server = socketio.AsyncServer(async_mode='asgi')
+    emitted: list[tuple[str, list[dict]]] = []
+
+    async def emit(event, data=None, to=None, namespace=None, **kwargs):
+        assert event == 'changes' and namespace == NAMESPACE
+        emitted.append((to, data))
+
+    hub.server.emit = emit
+
+    rows = [
+        {'id': f'c{i}', 'patient_id': 'p1' if i < 2 else 'p2', 'updated_at': '2026-02-01T10:00:00+00:00', 'reason': 'x'}
+        for i in range(3)
+    ]
+    asyncio.run(hub.publish('consultations', 'insert', *rows))
+
+    rooms = {room: data for room, data in emitted}
+    assert set(rooms) == {'resource:consultations', 'patient:p1', 'patient:p2'}
+    assert [change['id'] for change in rooms['patient:p1']] == ['c0', 'c1']
+    # Solo la referencia del cambio, no el registro
+    assert rooms['patient:p2'] == [{
+        'resource': 'consultations', 'id': 'c2', 'op': 'insert',
+        'updated_at': '2026-02-01T10:00:00+00:00', 'patient_id': 'p2',
+    }]
+
+    # Altas masivas: la sala del recurso recibe los cambios en mensajes de MAX_BATCH
+    emitted.clear()
+    asyncio.run(hub.publish('patients', 'insert', *[{'id': f'p{i}'} for i in range(MAX_BATCH + 1)]))
+    batches = [data for room, data in emitted if room == 'resource:patients']
+    assert [len(data) for data in batches] == [MAX_BATCH, 1]
+    assert hub.metrics()['published'] == 3 + MAX_BATCH + 1
+
+
+def test_connect_requires_token():
+    namespace = RealtimeNamespace(RealtimeHub())
+    with pytest.raises(socketio.exceptions.ConnectionRefusedError):
+        asyncio.run(namespace.on_connect('sid', {}, None))
+
+
+def test_resource_rooms_require_the_role_permission():
+    user_id = str(uuid.uuid4())
+    role = {'id': 'role-recepcion', 'name': f'recepcion-{user_id}', 'can_manage_patients': True, 'can_manage_diagnostics': False}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/user_roles'):
+            rows = [{'user_id': user_id, 'roles': {'name': role['name']}}]
+        else:
+            rows = [role]
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    auth = AuthContext(client=factory.for_token("token"), user=UserResponse(user=User.model_construct(id=user_id)), token="token")
+
+    namespace = RealtimeNamespace(RealtimeHub())
+    joined: list[str] = []
+
+    async def get_session(sid):
+        return {'auth': auth}
+
+    async def enter_room(sid, room):
+        joined.append(room)
+
+    namespace.get_session = get_session
+    namespace.enter_room = enter_room
+
+    async def scenario():
+        assert (await namespace.on_subscribe('sid', {'resource': 'patients'}))['ok'] is True
+        refused = await namespace.on_subscribe('sid', {'resource': 'diagnostics'})
+        assert refused == {'ok': False, 'error': 'Sin permiso para diagnostics'}
+        # El historial médico exige el permiso de pacientes
+        assert (await namespace.on_subscribe('sid', {'resource': 'medical_history'}))['ok'] is True
+
+    asyncio.run(scenario())
+    assert joined == ['resource:patients', 'resource:medical_history']
+
+
+def test_mount_serves_socketio_handshake_under_ws():
+    app = FastAPI()
+    RealtimeHub().mount(app, ['http://localhost:3000'])
+
+    response = TestClient(app).get('/ws/socket.io/', params={'EIO': 4, 'transport': 'polling'})
+    assert response.status_code == 200
+    assert response.text.startswith('0{"sid"')
@@ -0,0 +1,3 @@
+from ._backends import ResponseCacheBackend, MemoryResponseCacheBackend, RedisResponseCacheBackend
+from ._cache import ResponseCache, response_cache, cache_scope
+from ._conditional import fetch_row, row_etag, list_validators, list_not_modified, not_modified
@@ -0,0 +1,116 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis.asyncio as asyncredis
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheBackend:
+    """Almacén de respuestas cacheadas agrupadas en hashes.
+
+    Cada ``key`` agrupa variantes (``field``) que se invalidan juntas con ``delete``:
+    todos los listados de un recurso, o todas las vistas de un registro. Los valores
+    son JSON ya serializado y cada variante expira por separado.
+    """
+
+    name = 'base'
+
+    async def get(self, key: str, field: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, field: str, value: str, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    """Respuestas en memoria del proceso (un solo nodo y tests).
+
+    No usa locks por el mismo motivo que ``MemoryRateLimitBackend``: ninguna operación
+    cede el event loop. Con varios workers cada uno invalida solo su propia caché.
+
+    :param max_keys: Hashes guardados como máximo (se descartan los menos usados)
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_keys: int = 4096):
+        self.max_keys = max_keys
+        self.__data: "OrderedDict[str, dict[str, tuple[float, str]]]" = OrderedDict()
+
+    async def get(self, key: str, field: str) -> Optional[str]:
+        fields = self.__data.get(key)
+        entry = fields.get(field) if fields else None
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del fields[field]
+            return None
+
+        self.__data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, field: str, value: str, ttl_seconds: float) -> None:
+        self.__data.setdefault(key, {})[field] = (time.monotonic() + ttl_seconds, value)
+        self.__data.move_to_end(key)
+        if len(self.__data) > self.max_keys:
+            self.__data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.__data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+
+class RedisResponseCacheBackend(ResponseCacheBackend):
+    """Respuestas compartidas entre instancias en hashes de Redis.
+
+    La expiración de cada variante va al inicio del valor (``<epoch>:<json>``); el
+    ``EXPIRE`` del hash solo libera memoria. Si Redis falla se comporta como un fallo
+    de caché y la petición va a la base de datos.
+    """
+
+    name = 'redis'
+    KEY_PREFIX = 'careplus:response:'
+
+    def __init__(self, redis: asyncredis.Redis):
+        self.__redis = redis
+
+    async def get(self, key: str, field: str) -> Optional[str]:
+        try:
+            raw = await self.__redis.hget(self.KEY_PREFIX + key, field)
+        except Exception as e:
+            logger.warning(f"Response cache: Redis unavailable ({e})")
+            return None
+
+        if raw is None:
+            return None
+
+        expires_at, _, value = raw.partition(':')
+        return value if float(expires_at) > time.time() else None
+
+    async def set(self, key: str, field: str, value: str, ttl_seconds: float) -> None:
+        try:
+            async with self.__redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self.KEY_PREFIX + key, field, f'{time.time() + ttl_seconds:.3f}:{value}')
+                pipe.expire(self.KEY_PREFIX + key, int(ttl_seconds) + 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Response cache: Redis unavailable ({e})")
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.__redis.delete(*[self.KEY_PREFIX + key for key in keys])
+        except Exception as e:
+            logger.warning(f"Response cache: Redis unavailable ({e})")
@@ -0,0 +1,187 @@
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlencode
+
+from src._cache import get_redis
+from src._settings import settings
+from src.database.classes import AuthContext
+from src.utils._roles import get_user_role
+from ._backends import ResponseCacheBackend, MemoryResponseCacheBackend, RedisResponseCacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+async def cache_scope(auth: AuthContext) -> Optional[str]:
+    """Parte de la clave que depende del llamante: su rol (cacheado en ``_roles``).
+
+    Retorna None (no cachear) si la caché está deshabilitada o el usuario no tiene rol.
+    """
+
+    if not settings.response_cache_enabled:
+        return None
+
+    user_id = auth.user.user.id if auth.user and auth.user.user else None
+    if not user_id:
+        return None
+
+    return await get_user_role(auth, user_id)
+
+
+class ResponseCache:
+    """Caché de respuestas de los GET con invalidación en las escrituras.
+
+    Claves por recurso (``namespace``):
+
+    - ``<namespace>:list``: todos los listados; la variante es rol + query params.
+    - ``<namespace>:item:<id>``: un registro y sus vistas (p. ej. la ficha del paciente).
+
+    Los POST/PUT/DELETE llaman a ``invalidate`` con los ids afectados (se borran sus
+    hashes y el de listados) y a ``prime`` con la fila recién escrita. El TTL acota el
+    tiempo que puede sobrevivir una respuesta cargada en paralelo a una escritura.
+    """
+
+    def __init__(self, backend: Optional[ResponseCacheBackend] = None):
+        self.backend = backend
+        self.__hits: "defaultdict[str, int]" = defaultdict(int)
+        self.__misses: "defaultdict[str, int]" = defaultdict(int)
+        self.__invalidations: "defaultdict[str, int]" = defaultdict(int)
+        self.__primes: "defaultdict[str, int]" = defaultdict(int)
+
+    def get_backend(self) -> ResponseCacheBackend:
+        """Backend configurado con RESPONSE_CACHE_BACKEND ('memory' o 'redis')."""
+
+        if self.backend is None:
+            redis = get_redis() if settings.response_cache_backend == 'redis' else None
+            if settings.response_cache_backend == 'redis' and redis is None:
+                logger.warning("RESPONSE_CACHE_BACKEND=redis without APP_REDIS_REDIS_URL, using memory backend")
+
+            self.backend = (
+                RedisResponseCacheBackend(redis)
+                if redis is not None
+                else MemoryResponseCacheBackend(settings.response_cache_max_keys)
+            )
+
+        return self.backend
+
+    @staticmethod
+    def _key(namespace: str, item_id: Optional[str]) -> str:
+        return f'{namespace}:item:{item_id}' if item_id else f'{namespace}:list'
+
+    @staticmethod
+    def _field(scope: str, params: Optional[dict]) -> str:
+        query = urlencode(sorted((k, str(v)) for k, v in (params or {}).items() if v is not None))
+        return f'{scope}|{query}'
+
+    async def fetch(
+        self,
+        namespace: str,
+        scope: Optional[str],
+        loader: Callable[[], Awaitable[Any]],
+        item_id: Optional[str] = None,
+        params: Optional[dict] = None,
+    ) -> Any:
+        '''Return the cached response, or load it and cache it
+
+        :param namespace: Resource ('patients', 'consultations', 'users'...)
+        :param scope: Caller scope from ``cache_scope``; None skips the cache
+        :param loader: Coroutine function that queries the database
+        :param item_id: Record id for single-record reads; None for listings
+        :param params: Query parameters that change the response
+        :return: JSON-compatible response (dict or list)
+        '''
+
+        if scope is None or not settings.response_cache_enabled:
+            return await loader()
+
+        backend = self.get_backend()
+        key, field = self._key(namespace, item_id), self._field(scope, params)
+
+        cached = await backend.get(key, field)
+        if cached is not None:
+            self.__hits[namespace] += 1
+            return json.loads(cached)
+
+        self.__misses[namespace] += 1
+        value = await loader()
+        await backend.set(key, field, json.dumps(value, default=str), settings.response_cache_ttl_seconds)
+        return value
+
+    async def peek(self, namespace: str, scope: Optional[str], item_id: Optional[str] = None) -> Any:
+        '''Return the cached response without loading it (None on a miss)
+
+        :param namespace: Resource
+        :param scope: Caller scope from ``cache_scope``; None skips the cache
+        :param item_id: Record id; None for the listing without params
+        :return: Cached response or None
+        '''
+
+        if scope is None or not settings.response_cache_enabled:
+            return None
+
+        cached = await self.get_backend().get(self._key(namespace, item_id), self._field(scope, None))
+        if cached is None:
+            return None
+
+        self.__hits[namespace] += 1
+        return json.loads(cached)
+
+    async def prime(self, namespace: str, scope: Optional[str], row: dict) -> None:
+        '''Store a freshly written row as its ``GET /<namespace>/{id}`` response
+
+        :param namespace: Resource
+        :param scope: Caller scope from ``cache_scope``; None skips the cache
+        :param row: Row returned by PostgREST (must include ``id``)
+        '''
+
+        if scope is None or not settings.response_cache_enabled or not row.get('id'):
+            return
+
+        await self.get_backend().set(
+            self._key(namespace, row['id']), self._field(scope, None),
+            json.dumps(row, default=str), settings.response_cache_ttl_seconds,
+        )
+        self.__primes[namespace] += 1
+
+    async def invalidate(self, namespace: str, *item_ids: Optional[str], lists: bool = True) -> None:
+        '''Drop the cached responses affected by a write
+
+        :param namespace: Resource
+        :param item_ids: Records written (all their cached views are dropped)
+        :param lists: Also drop every cached listing of the resource
+        '''
+
+        keys = [self._key(namespace, item_id) for item_id in item_ids if item_id]
+        if lists:
+            keys.append(self._key(namespace, None))
+
+        await self.get_backend().delete(*keys)
+        self.__invalidations[namespace] += len(keys)
+
+    def metrics(self) -> dict:
+        namespaces = sorted({*self.__hits, *self.__misses, *self.__invalidations, *self.__primes})
+        by_namespace = {}
+        for namespace in namespaces:
+            hits, misses = self.__hits[namespace], self.__misses[namespace]
+            by_namespace[namespace] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                'invalidations': self.__invalidations[namespace],
+                'primes': self.__primes[namespace],
+            }
+
+        hits, misses = sum(self.__hits.values()), sum(self.__misses.values())
+        return {
+            'enabled': settings.response_cache_enabled,
+            'backend': self.get_backend().name,
+            'ttl_seconds': settings.response_cache_ttl_seconds,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            'namespaces': by_namespace,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from src.database.classes import AuthContext
+from ._cache import response_cache, cache_scope
+
+logger = logging.getLogger(__name__)
+
+# Datos clínicos: solo caché del navegador y siempre revalidando
+CACHE_CONTROL = 'private, no-cache'
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def row_etag(row: dict) -> str:
+    '''Strong ETag of a row (``id`` + ``updated_at``, maintained by triggers)
+
+    :param row: Row with at least ``id`` and ``updated_at``
+    :return: Quoted ETag
+    :rtype: str
+    '''
+
+    return _etag(row['id'], row.get('updated_at'))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    '''``If-None-Match`` contains the ETag (weak comparison, RFC 9110 §13.1.2)'''
+
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+
+    tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return '*' in tags or etag in tags
+
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    '''``If-Modified-Since`` is not older than ``last_modified``
+
+    Se ignora si la petición trae ``If-None-Match`` o la fecha no es válida.
+    Las fechas HTTP tienen precisión de segundos: para una validación exacta hay que
+    usar el ETag.
+    '''
+
+    header = request.headers.get('if-modified-since')
+    if not header or request.headers.get('if-none-match'):
+        return False
+
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+async def fetch_row(
+    request: Request,
+    response: Response,
+    auth: AuthContext,
+    table: str,
+    row_id: str,
+) -> Any:
+    '''``GET /<table>/{id}`` with ETag / ``If-None-Match``
+
+    Con ``If-None-Match`` el ETag se calcula con la fila en caché o, si no está, con
+    una consulta de solo ``id, updated_at``; si coincide se responde 304 sin leer ni
+    serializar la fila completa.
+
+    :param request: Incoming request (conditional headers)
+    :param response: Route response (receives the ETag header)
+    :param auth: Caller context
+    :param table: Table (also the response cache namespace)
+    :param row_id: Row id
+    :return: The row, or a 304 response
+    :raises APIError: If the row does not exist (``single()``)
+    '''
+
+    scope = await cache_scope(auth)
+
+    if request.headers.get('if-none-match'):
+        probe = await response_cache.peek(table, scope, row_id)
+        if probe is None:
+            probe = (await auth.client.table(table).select('id, updated_at').eq('id', row_id).single().execute()).data
+
+        etag = row_etag(probe)
+        if etag_matches(request, etag):
+            return not_modified({'ETag': etag, 'Cache-Control': CACHE_CONTROL})
+
+    async def load() -> dict:
+        return (await auth.client.table(table).select('*').eq('id', row_id).single().execute()).data
+
+    row = await response_cache.fetch(table, scope, load, item_id=row_id)
+    response.headers['ETag'] = row_etag(row)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return row
+
+
+async def _load_watermark(auth: AuthContext, table: str) -> Optional[str]:
+    try:
+        # max(updated_at) de las filas visibles y último DELETE de la tabla
+        response = await auth.client.rpc('table_watermark', {'p_table': table}).execute()
+    except Exception as e:
+        # Sin la marca el listado se sirve igual, solo que sin validadores
+        logger.warning(f"Conditional GET: table_watermark unavailable ({e})")
+        return None
+
+    return response.data or None
+
+
+async def list_validators(auth: AuthContext, table: str, scope: Optional[str], params: dict) -> dict[str, str]:
+    '''ETag / Last-Modified headers of a listing, from ``table_watermark``
+
+    La marca se guarda en el hash de listados de la caché de respuestas, así que se
+    invalida con las mismas escrituras que las páginas cacheadas.
+
+    :param auth: Caller context
+    :param table: Listed table (also the response cache namespace)
+    :param scope: Caller scope from ``cache_scope``
+    :param params: Query params of the listing (part of the ETag)
+    :return: Headers for the response (empty if the table has no watermark)
+    '''
+
+    async def load() -> Optional[str]:
+        return await _load_watermark(auth, table)
+
+    watermark = await response_cache.fetch(table, scope, load, params={'watermark': 1})
+    if not watermark:
+        return {}
+
+    changed_at = datetime.fromisoformat(watermark)
+    return {
+        'ETag': _etag(table, watermark, scope, sorted((k, str(v)) for k, v in params.items() if v is not None)),
+        'Last-Modified': format_datetime(changed_at.astimezone(timezone.utc).replace(microsecond=0), usegmt=True),
+        'Cache-Control': CACHE_CONTROL,
+    }
+
+
+def list_not_modified(request: Request, validators: dict[str, str]) -> bool:
+    '''The client copy of the listing is current (``If-None-Match`` or ``If-Modified-Since``)'''
+
+    if not validators:
+        return False
+    if etag_matches(request, validators['ETag']):
+        return True
+    return not_modified_since(request, parsedate_to_datetime(validators['Last-Modified']))
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from src.utils import get_auth_context
+from . import MemoryResponseCacheBackend, ResponseCache, response_cache
+
+PATIENT = {
+    'id': 'p1', 'first_name': 'Ana', 'last_name': 'Pérez', 'date_of_birth': '1990-01-01',
+    'gender': 'femenino', 'document_type': 'cedula', 'document_number': '001',
+}
+
+
+def test_variants_expire_and_invalidate_together():
+
+    async def scenario():
+        cache = ResponseCache(MemoryResponseCacheBackend())
+        calls = []
+
+        async def load():
+            calls.append(1)
+            return {'items': [], 'next_cursor': None}
+
+        await cache.fetch('patients', 'medico', load, params={'limit': 50})
+        await cache.fetch('patients', 'medico', load, params={'limit': 50})
+        await cache.fetch('patients', 'admin', load, params={'limit': 50})
+        await cache.fetch('patients', 'medico', load, params={'limit': 10})
+        assert len(calls) == 3
+
+        await cache.invalidate('patients')
+        await cache.fetch('patients', 'medico', load, params={'limit': 50})
+        assert len(calls) == 4
+
+        # Sin scope (usuario sin rol) no se cachea
+        await cache.fetch('patients', None, load)
+        await cache.fetch('patients', None, load)
+        assert len(calls) == 6
+
+        metrics = cache.metrics()['namespaces']['patients']
+        assert metrics['hits'] == 1 and metrics['misses'] == 4
+
+    asyncio.run(scenario())
+
+
+def test_writes_invalidate_and_prime_the_cache():
+    from routers.patients import PATIENTS_ROUTER
+
+    requests: list[httpx.Request] = []
+    patient = dict(PATIENT)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith('/user_roles'):
+            body = [{'user_id': 'u1', 'roles': {'name': 'medico'}}]
+        elif request.method == 'PATCH':
+            patient.update(json.loads(request.content))
+            body = [patient]
+        else:
+            body = patient
+        return httpx.Response(200, content=json.dumps(body), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    app = FastAPI()
+    app.include_router(PATIENTS_ROUTER)
+    user = SimpleNamespace(user=SimpleNamespace(id='u1'))
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(client=factory.for_token("token"), user=user, token="token")
+    client = TestClient(app)
+
+    response_cache.backend = MemoryResponseCacheBackend()
+    try:
+        def patient_reads() -> int:
+            return sum(1 for r in requests if r.method == 'GET' and r.url.path.endswith('/patients'))
+
+        assert client.get('/patients/p1').json()['first_name'] == 'Ana'
+        assert client.get('/patients/p1').json()['first_name'] == 'Ana'
+        assert patient_reads() == 1
+
+        assert client.put('/patients/p1', json={'first_name': 'Ana María'}).status_code == 200
+
+        # La fila escrita queda en caché: la lectura siguiente no va a la base de datos
+        assert client.get('/patients/p1').json()['first_name'] == 'Ana María'
+        assert patient_reads() == 1
+    finally:
+        response_cache.backend = None
@@ -0,0 +1 @@
+from ._job import ScheduledJob
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import schedule
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    """Trabajo periódico de la API, programado con ``schedule`` dentro del event loop.
+
+    Las subclases implementan ``run()`` (una ejecución) y registran sus turnos con
+    ``start()``. Si la ejecución anterior sigue en curso el turno se salta; los
+    errores se cuentan en ``failures`` y se registran, sin detener el programador.
+    """
+
+    # Nombre en los logs
+    name = 'Scheduled job'
+
+    def __init__(self):
+        self._scheduler = schedule.Scheduler()
+        self.__task: Optional[asyncio.Task] = None
+        self.__running: Optional[asyncio.Task] = None
+        self.last_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+
+    async def run(self, **kwargs) -> object:
+        '''Run the job once (implemented by each job)'''
+
+        raise NotImplementedError
+
+    def _record_run(self, started: float) -> None:
+        '''Count one run that began at ``started`` (``time.perf_counter()``)'''
+
+        self.runs += 1
+        self.last_run = time.time()
+        self.last_duration = round(time.perf_counter() - started, 3)
+
+    @property
+    def scheduled(self) -> bool:
+        return self.__task is not None
+
+    def _trigger(self, **kwargs) -> None:
+        # Lo llama schedule.run_pending() dentro del event loop
+        if self.__running is not None and not self.__running.done():
+            self.skipped += 1
+            return
+        self.__running = asyncio.create_task(self.__safe_run(kwargs))
+
+    async def __safe_run(self, kwargs: dict) -> None:
+        try:
+            await self.run(**kwargs)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"{self.name} failed: {e}")
+
+    async def __loop(self) -> None:
+        while True:
+            self._scheduler.run_pending()
+            await asyncio.sleep(max(0.5, min(self._scheduler.idle_seconds or 1.0, 5.0)))
+
+    async def start(self, interval: int = 0, at: str = '', run_now: bool = True) -> None:
+        '''Schedule the job every ``interval`` seconds and/or daily at ``at``
+        (neither one disables the scheduler)
+
+        :param interval: Seconds between runs (<= 0 = no interval)
+        :param at: Daily run time, "HH:MM" server time ('' = none)
+        :param run_now: Also run once right away, without waiting for the first turn
+        '''
+
+        if self.__task is not None or (interval <= 0 and not at):
+            return
+
+        if interval > 0:
+            self._scheduler.every(interval).seconds.do(self._trigger)
+        if at:
+            self._scheduler.every().day.at(at).do(self._trigger)
+
+        if run_now:
+            self._trigger()
+        self.__task = asyncio.create_task(self.__loop())
+
+    async def stop(self) -> None:
+        self._scheduler.clear()
+        for task in (self.__task, self.__running):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.__task = None
+        self.__running = None
+
+    def metrics(self) -> dict:
+        return {
+            'scheduled': self.scheduled,
+            'next_run': self._scheduler.next_run.timestamp() if self._scheduler.jobs else None,
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'runs': self.runs,
+            'skipped': self.skipped,
+            'failures': self.failures,
+        }
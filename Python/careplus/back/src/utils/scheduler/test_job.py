@@ -0,0 +1,38 @@
+import asyncio
+
+from ._job import ScheduledJob
+
+
+class _SlowJob(ScheduledJob):
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.calls: list[dict] = []
+
+    async def run(self, **kwargs) -> None:
+        self.calls.append(kwargs)
+        await self.release.wait()
+        raise RuntimeError('boom')
+
+
+def test_turns_are_skipped_while_a_run_is_in_progress():
+    job = _SlowJob()
+
+    async def scenario():
+        await job.start(interval=3600)
+        await asyncio.sleep(0)
+        # El turno llega con la ejecución inicial en curso
+        job._trigger(full=True)
+        assert job.calls == [{}] and job.skipped == 1
+
+        job.release.set()
+        await asyncio.sleep(0.01)
+        assert job.failures == 1
+
+        metrics = job.metrics()
+        assert metrics['scheduled'] and metrics['next_run'] is not None
+        await job.stop()
+        assert not job.metrics()['scheduled'] and job.metrics()['next_run'] is None
+
+    asyncio.run(scenario())
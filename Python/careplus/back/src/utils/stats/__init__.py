@@ -0,0 +1,3 @@
+from ._refresher import DashboardStatsRefresher, dashboard_stats
+from ._counters import PatientCountersReconciler, patient_counters
+from ._period import stats_period, DEFAULT_RANGE_DAYS
@@ -0,0 +1,71 @@
+import logging
+import time
+from typing import Optional
+
+from supabase import AsyncClient
+
+from src.database import SupabaseClient
+from src.utils.scheduler import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+
+class PatientCountersReconciler(ScheduledJob):
+    """Reconciliación diaria de ``patient_counters`` (``reconcile_patient_counters``).
+
+    Los triggers mantienen los totales al día; la reconciliación recalcula todo y
+    corrige los desvíos (TRUNCATE, triggers deshabilitados, restauraciones
+    parciales...). Toma un lock SHARE sobre las tablas clínicas mientras dura, por
+    eso corre una vez al día y no al arrancar. Un desvío distinto de cero se
+    registra como advertencia: los triggers perdieron algún cambio.
+    """
+
+    name = 'Patient counters reconciliation'
+
+    def __init__(self):
+        super().__init__()
+        self.last_fixed: Optional[int] = None
+        self.fixed = 0
+
+    async def reconcile(self, client: Optional[AsyncClient] = None) -> int:
+        '''Recompute the counters now
+
+        :param client: Client to use (service_role by default)
+        :return: Patients whose counters were corrected
+        :rtype: int
+        '''
+
+        client = client or SupabaseClient.generate_admin_client()
+
+        started = time.perf_counter()
+        response = await client.rpc('reconcile_patient_counters', {}).execute()
+        self._record_run(started)
+        if response.data is None:
+            # Otro proceso está reconciliando
+            self.skipped += 1
+            return 0
+
+        self.last_fixed = response.data
+        self.fixed += self.last_fixed
+        if self.last_fixed:
+            logger.warning(f"Patient counters drifted: {self.last_fixed} patients corrected")
+        else:
+            logger.info(f"Patient counters reconciled in {self.last_duration}s, no drift")
+        return self.last_fixed
+
+    async def run(self) -> int:
+        return await self.reconcile()
+
+    async def start(self, at: str) -> None:
+        '''Schedule the daily reconciliation
+
+        :param at: Daily run time, "HH:MM" server time ('' disables it)
+        '''
+
+        await super().start(at=at, run_now=False)
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), 'last_fixed': self.last_fixed, 'fixed': self.fixed}
+
+
+patient_counters = PatientCountersReconciler()
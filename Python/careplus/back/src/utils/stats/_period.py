@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+
+from src._settings import settings
+
+# Periodo por defecto: los últimos 30 días (incluido hoy)
+DEFAULT_RANGE_DAYS = 30
+
+
+def stats_period(date_from: Optional[date], date_to: Optional[date]) -> tuple[date, date]:
+    '''Validated inclusive period, defaulting to the last ``DEFAULT_RANGE_DAYS`` days
+
+    :param date_from: First day (defaults to ``DEFAULT_RANGE_DAYS - 1`` days before ``date_to``)
+    :param date_to: Last day (defaults to today)
+    :return: ``(date_from, date_to)``
+    :raises HTTPException: 400 when the period is reversed or longer than ``stats_max_range_days``
+    '''
+
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from no puede ser posterior a date_to")
+    if (date_to - date_from).days + 1 > settings.stats_max_range_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El periodo no puede superar {settings.stats_max_range_days} días"
+        )
+    return date_from, date_to
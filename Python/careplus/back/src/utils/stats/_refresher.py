@@ -0,0 +1,76 @@
+import time
+from typing import Optional
+
+from supabase import AsyncClient
+
+from src._settings import settings
+from src.database import SupabaseClient
+from src.utils.response_cache import response_cache
+from src.utils.scheduler import ScheduledJob
+
+
+class DashboardStatsRefresher(ScheduledJob):
+    """Programador del refresco de los rollups del dashboard (``refresh_dashboard_stats``).
+
+    Cada ``interval`` segundos pide a la base de datos un refresco incremental (solo
+    los días modificados desde la última marca) y una vez al día, a la hora
+    ``full_rebuild_at``, una reconstrucción completa que corrige cualquier desvío. Si
+    el refresco anterior sigue en curso el turno se salta; con varios procesos de la
+    API la función toma un advisory lock y solo uno de ellos recalcula.
+    """
+
+    name = 'Dashboard stats refresh'
+
+    def __init__(self):
+        super().__init__()
+        self.last_result: Optional[dict] = None
+
+    async def refresh(self, full: bool = False, client: Optional[AsyncClient] = None) -> Optional[dict]:
+        '''Refresh the rollups now
+
+        :param full: Rebuild every day instead of only the modified ones
+        :param client: Client to use (service_role by default)
+        :return: Days recomputed per source, or None if another refresh was running
+        :rtype: Optional[dict]
+        '''
+
+        client = client or SupabaseClient.generate_admin_client()
+
+        started = time.perf_counter()
+        response = await client.rpc('refresh_dashboard_stats', {
+            'p_lookback': f'{settings.stats_refresh_lookback_seconds} seconds',
+            'p_full': full,
+        }).execute()
+
+        self._record_run(started)
+        if response.data is None:
+            self.skipped += 1
+        else:
+            self.last_result = response.data
+
+        # También cuando refrescó otro proceso: sus cifras ya son más nuevas que las cacheadas
+        await response_cache.invalidate('stats')
+        return response.data
+
+    async def run(self, full: bool = False) -> Optional[dict]:
+        return await self.refresh(full)
+
+    async def start(self, interval: int, full_rebuild_at: str = '') -> None:
+        '''Schedule the incremental refresh (interval <= 0 disables the scheduler)
+
+        :param interval: Seconds between incremental refreshes
+        :param full_rebuild_at: Daily full rebuild time, "HH:MM" server time ('' = none)
+        '''
+
+        if interval <= 0 or self.scheduled:
+            return
+
+        if full_rebuild_at:
+            self._scheduler.every().day.at(full_rebuild_at).do(self._trigger, full=True)
+        await super().start(interval)
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), 'last_result': self.last_result}
+
+
+dashboard_stats = DashboardStatsRefresher()
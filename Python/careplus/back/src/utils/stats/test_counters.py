@@ -0,0 +1,28 @@
+import asyncio
+import json
+
+import httpx
+from src.database import SupabaseClientFactory
+from ._counters import PatientCountersReconciler
+
+
+def test_reconcile_counts_corrected_patients_and_concurrent_runs():
+    results = [3, None]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith('/rpc/reconcile_patient_counters')
+        return httpx.Response(200, content=json.dumps(results.pop(0)), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    reconciler = PatientCountersReconciler()
+
+    async def scenario():
+        assert await reconciler.reconcile(client=factory.anon) == 3
+        # NULL: otro proceso tiene el advisory lock
+        assert await reconciler.reconcile(client=factory.anon) == 0
+
+    asyncio.run(scenario())
+
+    metrics = reconciler.metrics()
+    assert metrics['runs'] == 2 and metrics['skipped'] == 1
+    assert metrics['last_fixed'] == 3 and metrics['fixed'] == 3
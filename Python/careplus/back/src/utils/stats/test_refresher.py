@@ -0,0 +1,30 @@
+import asyncio
+import json
+
+import httpx
+from src.database import SupabaseClientFactory
+from ._refresher import DashboardStatsRefresher
+
+
+def test_refresh_reports_skipped_when_another_process_holds_the_lock():
+    results = [{'consultations': 2, 'diagnostics': 0, 'treatments': 1, 'patients': 1}, None]
+    calls: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, content=json.dumps(results[len(calls) - 1]), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    refresher = DashboardStatsRefresher()
+
+    async def scenario():
+        assert await refresher.refresh(client=factory.anon) == results[0]
+        # NULL: otro proceso está refrescando (advisory lock)
+        assert await refresher.refresh(full=True, client=factory.anon) is None
+
+    asyncio.run(scenario())
+
+    assert calls[1]['p_full'] is True
+    metrics = refresher.metrics()
+    assert metrics['runs'] == 2 and metrics['skipped'] == 1
+    assert metrics['last_result'] == results[0]
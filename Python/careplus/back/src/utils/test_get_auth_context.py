@@ -0,0 +1,11 @@
+from ._get_auth_context import _user_from_claims
+
+
+def test_user_from_claims_does_not_use_token_issue_time_as_creation_date():
+    user = _user_from_claims({
+        'sub': '00000000-0000-0000-0000-000000000001', 'aud': 'authenticated', 'role': 'authenticated',
+        'email': 'medico@careplus.test', 'iat': 1_700_000_000,
+    }).user
+
+    assert user.id == '00000000-0000-0000-0000-000000000001' and user.email == 'medico@careplus.test'
+    assert 'created_at' not in user.__dict__
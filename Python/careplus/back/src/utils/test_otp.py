@@ -0,0 +1,135 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+from pydantic import ValidationError
+from src._settings import settings
+from src.database import SupabaseClient, SupabaseClientFactory
+from src.database.classes import VerifyOtpRequest
+from ._otp import OTP_MAX_ATTEMPTS, store_otp, verify_otp
+from .otp import MemoryOtpStore, RedisOtpStore, TableOtpStore
+
+
+def _table_store(requests: list[httpx.Request], rows: list[dict]):
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    return TableOtpStore(factory.anon)
+
+
+def test_verify_otp_is_a_single_round_trip():
+
+    requests: list[httpx.Request] = []
+    store = _table_store(requests, [{'status': 'invalid', 'remaining_attempts': 3, 'access_token': None, 'refresh_token': None}])
+
+    result = asyncio.run(verify_otp('user', '000000', store))
+
+    assert len(requests) == 1
+    assert requests[0].url.path.endswith('/rpc/verify_verification_code')
+    assert json.loads(requests[0].content) == {'p_user_id': 'user', 'p_code': '000000'}
+    assert result == {'valid': False, 'status': 'invalid', 'error': 'Código incorrecto. 3 intentos restantes.'}
+
+
+def test_verify_otp_returns_stored_tokens():
+
+    requests: list[httpx.Request] = []
+    store = _table_store(requests, [{'status': 'valid', 'remaining_attempts': 4, 'access_token': 'at', 'refresh_token': 'rt'}])
+
+    result = asyncio.run(verify_otp('user', '123456', store))
+
+    assert result['valid'] is True
+    assert (result['access_token'], result['refresh_token']) == ('at', 'rt')
+
+
+async def _parallel_guesses(store) -> None:
+    await store_otp('user', 'user@careplus.test', '123456', 'access', 'refresh', store=store)
+
+    results = await asyncio.gather(*(verify_otp('user', '000000', store) for _ in range(OTP_MAX_ATTEMPTS * 4)))
+    statuses = [result['status'] for result in results]
+
+    assert statuses.count('invalid') == OTP_MAX_ATTEMPTS
+    assert 'valid' not in statuses
+    assert (await verify_otp('user', '123456', store))['valid'] is False
+
+    # Un código nuevo reinicia los intentos y solo se acepta una vez
+    await store_otp('user', 'user@careplus.test', '654321', 'access', 'refresh', store=store)
+    assert (await verify_otp('user', '000000', store))['status'] == 'invalid'
+    first, second = await asyncio.gather(verify_otp('user', '654321', store), verify_otp('user', '654321', store))
+    assert [first['valid'], second['valid']].count(True) == 1
+    assert (first if first['valid'] else second)['access_token'] == 'access'
+
+
+def test_non_ascii_codes_are_rejected_without_errors():
+    with pytest.raises(ValidationError):
+        VerifyOtpRequest(user_id='user', code='１２３４５６')
+
+    async def scenario():
+        store = MemoryOtpStore()
+        await store_otp('user', 'user@careplus.test', '123456', 'access', 'refresh', store=store)
+        # Las rutas validan antes; el store tampoco falla con texto no ASCII
+        assert (await verify_otp('user', 'ñ23456', store))['status'] == 'invalid'
+
+    asyncio.run(scenario())
+
+
+def test_memory_store_limits_parallel_guesses():
+    asyncio.run(_parallel_guesses(MemoryOtpStore()))
+
+
+@pytest.mark.skipif(not settings.app_redis_redis_url, reason="Requiere APP_REDIS_REDIS_URL")
+def test_redis_store_limits_parallel_guesses():
+    import redis.asyncio as asyncredis
+
+    async def scenario():
+        redis = asyncredis.from_url(settings.app_redis_redis_url, decode_responses=True)
+        try:
+            await _parallel_guesses(RedisOtpStore(redis))
+        finally:
+            await redis.aclose()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(
+    not (settings.supabase_url and settings.supabase_service_role_key),
+    reason="Requiere una instancia de Supabase (supabase start) con las migraciones aplicadas",
+)
+def test_parallel_guesses_cannot_exceed_max_attempts():
+
+    async def scenario():
+        user = await SupabaseClient.admin_create_user(f"otp-{uuid.uuid4().hex[:8]}@careplus.test", uuid.uuid4().hex)
+        admin = SupabaseClient.generate_admin_client()
+
+        try:
+            await admin.rpc('store_verification_code', {
+                'p_user_id': user.user_id,
+                'p_email': user.email,
+                'p_code': '123456',
+                'p_access_token': 'access',
+                'p_refresh_token': 'refresh',
+                'p_max_attempts': OTP_MAX_ATTEMPTS,
+            }).execute()
+
+            # Ráfaga de intentos incorrectos en paralelo
+            results = await asyncio.gather(*(verify_otp(user.user_id, '000000', TableOtpStore()) for _ in range(OTP_MAX_ATTEMPTS * 4)))
+            statuses = [result['status'] for result in results]
+
+            assert statuses.count('invalid') == OTP_MAX_ATTEMPTS
+            assert 'valid' not in statuses
+
+            # Agotados los intentos, ni el código correcto es aceptado
+            assert (await verify_otp(user.user_id, '123456', TableOtpStore()))['valid'] is False
+
+            record = await admin.table('verification_codes').select('attempts, max_attempts').eq(
+                'user_id', user.user_id
+            ).execute()
+            assert all(row['attempts'] <= row['max_attempts'] for row in record.data)
+        finally:
+            await SupabaseClient.admin_delete_user(user.user_id)
+
+    asyncio.run(scenario())
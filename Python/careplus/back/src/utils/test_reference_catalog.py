@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+import httpx
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from ._reference_catalog import ReferenceCatalog
+
+
+ROLES = [
+    {'id': 'role-admin', 'name': 'admin', 'can_manage_users': True},
+    {'id': 'role-medico', 'name': 'medico', 'can_manage_users': False},
+]
+
+
+def test_catalog_serves_lookups_from_memory():
+
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith('/roles'):
+            name = request.url.params.get('name')
+            rows = [r for r in ROLES + [{'id': 'role-nuevo', 'name': 'nuevo'}] if not name or f"eq.{r['name']}" == name]
+            return httpx.Response(200, content=json.dumps(rows if name else ROLES), headers={'content-type': 'application/json'})
+        return httpx.Response(404, json={'message': 'relation "document_types" does not exist'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    auth = AuthContext(client=factory.for_token("token"), user=None, token="token")
+    catalog = ReferenceCatalog()
+
+    async def scenario():
+        await catalog.refresh(factory.anon)
+        loaded = len(requests)
+
+        assert await catalog.role_id(auth, 'medico') == 'role-medico'
+        assert catalog.role('admin')['can_manage_users'] is True
+        assert {'name': 'cedula'} in catalog.document_types
+        assert len(requests) == loaded
+
+        # Un rol desconocido se consulta una vez y queda en el catálogo
+        assert await catalog.role_id(auth, 'nuevo') == 'role-nuevo'
+        assert await catalog.role_id(auth, 'nuevo') == 'role-nuevo'
+        assert len(requests) == loaded + 1
+
+        assert catalog.metrics()['hits'] == 3
+
+    asyncio.run(scenario())
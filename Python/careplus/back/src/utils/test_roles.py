@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import httpx
+from src.database import SupabaseClientFactory
+from src.database.classes import AuthContext
+from ._roles import get_user_roles, invalidate_user_roles
+
+
+def _auth(requests: list[httpx.Request]) -> AuthContext:
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        rows = [
+            {'user_id': 'caller', 'roles': {'name': 'admin'}},
+            {'user_id': 'target', 'roles': {'name': 'medico'}},
+        ]
+        return httpx.Response(200, content=json.dumps(rows), headers={'content-type': 'application/json'})
+
+    factory = SupabaseClientFactory("http://localhost:54321", "anon-key", transport=httpx.MockTransport(handler))
+    return AuthContext(client=factory.for_token("token"), user=None, token="token")
+
+
+def test_roles_are_batched_cached_and_invalidated():
+
+    requests: list[httpx.Request] = []
+    auth = _auth(requests)
+
+    async def scenario():
+        roles = await get_user_roles(auth, ['caller', 'target'])
+        assert roles == {'caller': 'admin', 'target': 'medico'}
+        assert len(requests) == 1
+        assert 'in.(caller,target)' in requests[0].url.params['user_id']
+
+        # Segunda resolución: desde caché, sin consultas
+        await get_user_roles(auth, ['caller', 'target'])
+        assert len(requests) == 1
+
+        # Tras invalidar solo se consulta el usuario modificado
+        await invalidate_user_roles('target')
+        await get_user_roles(auth, ['caller', 'target'])
+        assert len(requests) == 2
+        assert requests[1].url.params['user_id'] == 'in.(target)'
+
+    asyncio.run(scenario())
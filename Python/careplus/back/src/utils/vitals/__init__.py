@@ -0,0 +1 @@
+from ._vitals import VITAL_RANGES, VITALS_SELECT, CohortGroup, vitals_frame, load_vitals, derive_vitals, patient_vitals, cohort_vitals
@@ -0,0 +1,205 @@
+from datetime import date
+from typing import Callable, Literal, Optional
+
+import polars as pl
+
+from src._settings import settings
+from src.utils.database import iter_pages
+
+CohortGroup = Literal['gender', 'age_band']
+
+# Columnas de consultations que se leen (y su tipo en el frame)
+VITALS_SCHEMA: dict[str, pl.DataType] = {
+    'id': pl.String,
+    'patient_id': pl.String,
+    'consultation_date': pl.String,
+    'weight_kg': pl.Float64,
+    'height_cm': pl.Float64,
+    'heart_rate': pl.Int64,
+    'temperature_c': pl.Float64,
+    'blood_pressure': pl.String,
+}
+VITALS_SELECT = ', '.join(VITALS_SCHEMA)
+
+# Filas por página: paginate() pide una de más y PostgREST corta en max_rows
+VITALS_CHUNK_SIZE = settings.postgrest_max_rows - 1
+
+METRICS = ('weight_kg', 'bmi', 'heart_rate', 'temperature_c', 'systolic', 'diastolic')
+
+# Rangos de referencia para adultos (inclusive); fuera de ellos se marca <métrica>_low/_high
+VITAL_RANGES: dict[str, tuple[float, float]] = {
+    'bmi': (18.5, 24.9),
+    'heart_rate': (60, 100),
+    'temperature_c': (36.0, 37.5),
+    'systolic': (90, 139),
+    'diastolic': (60, 89),
+}
+
+AGE_BANDS = ('0-17', '18-39', '40-64', '65+')
+
+# "120/80", "120 / 80 mmHg"...
+BLOOD_PRESSURE_PATTERN = r'^\s*(\d{2,3})\s*/\s*(\d{2,3})'
+
+
+def vitals_frame(rows: list[dict]) -> pl.DataFrame:
+    '''Build a frame with every ``VITALS_SCHEMA`` column from PostgREST rows'''
+
+    frame = pl.DataFrame(rows, schema_overrides=VITALS_SCHEMA, strict=False, infer_schema_length=None)
+    return frame.with_columns(
+        pl.lit(None, dtype=dtype).alias(column) for column, dtype in VITALS_SCHEMA.items() if column not in frame.columns
+    )
+
+
+async def load_vitals(build_query: Callable[[], object]) -> pl.DataFrame:
+    '''Read the vitals of a consultations query as a single columnar frame
+
+    Pages of ``VITALS_CHUNK_SIZE`` rows, the largest that PostgREST returns whole.
+
+    :param build_query: Returns a fresh query selecting ``VITALS_SELECT`` (plus any
+        embedded column) with the filters applied
+    :return: Frame with ``VITALS_SCHEMA`` (and the extra columns of the query)
+    '''
+
+    frames = [vitals_frame(rows) async for rows in iter_pages(build_query, 'consultation_date', VITALS_CHUNK_SIZE)]
+    if not frames:
+        return pl.DataFrame(schema=VITALS_SCHEMA)
+    return pl.concat(frames, how='diagonal_relaxed')
+
+
+def derive_vitals(frame: pl.DataFrame, window: int) -> pl.DataFrame:
+    """Agrega a cada consulta las métricas derivadas, por paciente y en orden cronológico.
+
+    - ``bmi``: con la última talla registrada del paciente (la talla rara vez se mide
+      en todas las consultas).
+    - ``systolic``/``diastolic``: del texto libre ``blood_pressure``.
+    - ``<métrica>_avg``: media de los valores de las últimas ``window`` consultas.
+    - ``<métrica>_delta``: diferencia con la medición anterior del paciente.
+    - ``flags``: ``<métrica>_low``/``<métrica>_high`` según ``VITAL_RANGES``.
+    """
+
+    pressure = pl.col('blood_pressure').str.extract_groups(BLOOD_PRESSURE_PATTERN)
+    height = pl.col('height_cm').forward_fill().over('patient_id')
+
+    frame = frame.with_columns(
+        pl.col('consultation_date').str.to_datetime('%Y-%m-%dT%H:%M:%S%.f%:z', time_zone='UTC'),
+    ).sort('patient_id', 'consultation_date').with_columns(
+        pl.when(height > 0).then(pl.col('weight_kg') / (height / 100) ** 2).round(1).alias('bmi'),
+        pressure.struct.field('1').cast(pl.Int64).alias('systolic'),
+        pressure.struct.field('2').cast(pl.Int64).alias('diastolic'),
+    )
+
+    flags = []
+    for metric, (low, high) in VITAL_RANGES.items():
+        flags.append(pl.when(pl.col(metric) < low).then(pl.lit(f'{metric}_low'))
+                     .when(pl.col(metric) > high).then(pl.lit(f'{metric}_high')))
+
+    return frame.with_columns(
+        *[pl.col(m).rolling_mean(window, min_samples=1).over('patient_id').round(2).alias(f'{m}_avg') for m in METRICS],
+        *[(pl.col(m) - pl.col(m).forward_fill().shift(1).over('patient_id')).round(2).alias(f'{m}_delta') for m in METRICS],
+        pl.concat_list(flags).list.drop_nulls().alias('flags'),
+    )
+
+
+def patient_vitals(frame: pl.DataFrame, window: int) -> dict:
+    '''``PatientVitals`` payload of one patient's consultations
+
+    :param frame: Output of ``load_vitals`` for one patient
+    :param window: Consultations in each rolling average
+    :return: Points in chronological order, latest point and reference ranges
+    '''
+
+    derived = derive_vitals(frame, window)
+    points = derived.select(
+        pl.col('id').alias('consultation_id'),
+        pl.col('consultation_date').dt.to_string('%Y-%m-%dT%H:%M:%S%.f%:z'),
+        'weight_kg', 'height_cm', *METRICS[1:],
+        pl.struct([pl.col(f'{m}_avg').alias(m) for m in METRICS]).alias('averages'),
+        pl.struct([pl.col(f'{m}_delta').alias(m) for m in METRICS]).alias('deltas'),
+        'flags',
+    ).to_dicts()
+
+    return {
+        'window': window,
+        'count': len(points),
+        'latest': points[-1] if points else None,
+        'points': points,
+        'ranges': {metric: {'low': low, 'high': high} for metric, (low, high) in VITAL_RANGES.items()},
+    }
+
+
+def _stats(metric: str) -> list[pl.Expr]:
+    column = pl.col(metric)
+    expressions = [
+        column.count().alias(f'{metric}|count'),
+        column.mean().round(2).alias(f'{metric}|mean'),
+        column.median().round(2).alias(f'{metric}|median'),
+        column.quantile(0.1).round(2).alias(f'{metric}|p10'),
+        column.quantile(0.9).round(2).alias(f'{metric}|p90'),
+        column.min().cast(pl.Float64).alias(f'{metric}|min'),
+        column.max().cast(pl.Float64).alias(f'{metric}|max'),
+    ]
+    if metric in VITAL_RANGES:
+        low, high = VITAL_RANGES[metric]
+        expressions += [
+            (column < low).sum().alias(f'{metric}|low'),
+            (column > high).sum().alias(f'{metric}|high'),
+        ]
+    return expressions
+
+
+def _nest(row: dict) -> dict:
+    '''{"bmi|mean": 24.1, ...} -> {"bmi": {"mean": 24.1, ...}}'''
+
+    metrics: dict[str, dict] = {}
+    for column, value in row.items():
+        metric, _, stat = column.partition('|')
+        if stat:
+            metrics.setdefault(metric, {})[stat] = value
+    return metrics
+
+
+def cohort_vitals(frame: pl.DataFrame, group_by: Optional[CohortGroup] = None, today: Optional[date] = None) -> dict:
+    """Resumen de signos vitales de una cohorte (payload de ``CohortVitals``).
+
+    Cada paciente aporta su último valor de cada métrica, así un paciente con muchas
+    consultas no pesa más que uno con una sola. ``low``/``high`` cuentan pacientes
+    fuera de ``VITAL_RANGES``.
+
+    :param frame: Output of ``load_vitals``; grouping needs the embedded
+        ``patients(gender, date_of_birth)``
+    :param group_by: Also summarize per gender or age band
+    :param today: Reference date for the age bands
+    """
+
+    if 'patients' in frame.columns:
+        # Datos del paciente embebidos: patients(gender, date_of_birth)
+        frame = frame.unnest('patients')
+    derived = derive_vitals(frame, window=1)
+
+    group: Optional[pl.Expr] = None
+    if group_by == 'gender':
+        group = pl.col('gender').fill_null('sin_dato')
+    elif group_by == 'age_band':
+        born = pl.col('date_of_birth').str.to_date(strict=False)
+        age = (pl.lit(today or date.today()) - born).dt.total_days() // 365.25
+        group = age.cut([17, 39, 64], labels=list(AGE_BANDS)).cast(pl.String).fill_null('sin_dato')
+
+    latest = derived.group_by('patient_id').agg(
+        *[pl.col(m).drop_nulls().last() for m in METRICS],
+        *([group.first().alias('group')] if group is not None else []),
+    )
+
+    stats = [expression for metric in METRICS for expression in _stats(metric)]
+    summary = latest.select(pl.len().alias('patients'), *stats).row(0, named=True)
+
+    groups = []
+    if group is not None:
+        for row in latest.group_by('group').agg(pl.len().alias('patients'), *stats).sort('group').iter_rows(named=True):
+            groups.append({'group': row['group'], 'patients': row['patients'], 'metrics': _nest(row)})
+
+    return {
+        'patients': summary['patients'],
+        'consultations': derived.height,
+        'metrics': _nest(summary),
+        'groups': groups,
+    }
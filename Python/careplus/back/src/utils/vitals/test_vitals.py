@@ -0,0 +1,53 @@
+from datetime import date
+
+from . import vitals_frame, patient_vitals, cohort_vitals
+
+
+def _consultation(id: str, patient: str, day: int, **vitals) -> dict:
+    return {'id': id, 'patient_id': patient, 'consultation_date': f'2026-02-{day:02d}T10:00:00+00:00', **vitals}
+
+
+def test_patient_trend_is_chronological_with_rolling_averages_and_flags():
+    frame = vitals_frame([
+        # Desordenadas, como llegan de la paginación (más recientes primero)
+        _consultation('c3', 'p1', 13, weight_kg=72.5, temperature_c=38.2, blood_pressure='x'),
+        _consultation('c2', 'p1', 12, heart_rate=110, blood_pressure=' 150 / 95 mmHg'),
+        _consultation('c1', 'p1', 11, weight_kg=70, height_cm=170, heart_rate=72, temperature_c=36.5, blood_pressure='120/80'),
+    ])
+
+    vitals = patient_vitals(frame, window=2)
+    first, second, third = vitals['points']
+
+    assert [p['consultation_id'] for p in vitals['points']] == ['c1', 'c2', 'c3']
+    assert vitals['latest'] == third
+
+    assert (first['bmi'], first['systolic'], first['diastolic'], first['flags']) == (24.2, 120, 80, [])
+    assert (second['systolic'], second['diastolic']) == (150, 95)
+    assert second['flags'] == ['heart_rate_high', 'systolic_high', 'diastolic_high']
+    assert second['averages']['heart_rate'] == 91.0
+    assert second['deltas']['heart_rate'] == 38
+
+    # IMC con la última talla conocida; la presión ilegible queda vacía
+    assert third['bmi'] == 25.1 and third['systolic'] is None
+    assert third['deltas']['weight_kg'] == 2.5
+    assert third['flags'] == ['bmi_high', 'temperature_c_high']
+
+
+def test_cohort_uses_the_latest_value_of_each_patient():
+    patient = {'gender': 'femenino', 'date_of_birth': '1990-01-01'}
+    elder = {'gender': 'masculino', 'date_of_birth': '1950-06-01'}
+    frame = vitals_frame([
+        _consultation('c1', 'p1', 11, heart_rate=120, patients=patient),
+        _consultation('c2', 'p1', 12, heart_rate=70, patients=patient),
+        _consultation('c3', 'p2', 12, heart_rate=50, weight_kg=80, patients=elder),
+    ])
+
+    cohort = cohort_vitals(frame, group_by='age_band', today=date(2026, 2, 20))
+
+    assert (cohort['patients'], cohort['consultations']) == (2, 3)
+    heart_rate = cohort['metrics']['heart_rate']
+    assert (heart_rate['count'], heart_rate['mean'], heart_rate['low'], heart_rate['high']) == (2, 60.0, 1, 0)
+    assert 'low' not in cohort['metrics']['weight_kg']
+
+    assert [(g['group'], g['patients']) for g in cohort['groups']] == [('18-39', 1), ('65+', 1)]
+    assert cohort['groups'][1]['metrics']['heart_rate']['low'] == 1
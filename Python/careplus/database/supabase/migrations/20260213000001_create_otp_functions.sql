@@ -0,0 +1,112 @@
+-- ============================================
+-- CarePlus - Funciones atómicas para códigos OTP (2FA)
+-- ============================================
+-- store_verification_code: invalida los códigos pendientes e inserta el nuevo
+-- verify_verification_code: consume un intento y valida el código en una sola
+--                           transacción (la fila se bloquea con FOR UPDATE, así
+--                           que intentos concurrentes no superan max_attempts)
+
+CREATE OR REPLACE FUNCTION store_verification_code(
+    p_user_id       UUID,
+    p_email         VARCHAR,
+    p_code          VARCHAR,
+    p_access_token  TEXT,
+    p_refresh_token TEXT,
+    p_ttl_seconds   INT DEFAULT 600,
+    p_max_attempts  INT DEFAULT 5
+)
+RETURNS UUID AS $$
+DECLARE
+    v_id UUID;
+BEGIN
+    -- Solo el propio usuario (o el service_role) puede generar sus códigos
+    IF auth.role() IS DISTINCT FROM 'service_role' AND auth.uid() IS DISTINCT FROM p_user_id THEN
+        RAISE EXCEPTION 'No autorizado' USING ERRCODE = '42501';
+    END IF;
+
+    -- Invalidar códigos anteriores del usuario
+    UPDATE verification_codes
+    SET used = TRUE
+    WHERE user_id = p_user_id AND used = FALSE;
+
+    INSERT INTO verification_codes (
+        user_id, email, code, access_token, refresh_token, expires_at, attempts, max_attempts
+    )
+    VALUES (
+        p_user_id, p_email, p_code, p_access_token, COALESCE(p_refresh_token, ''),
+        NOW() + make_interval(secs => p_ttl_seconds), 0, p_max_attempts
+    )
+    RETURNING id INTO v_id;
+
+    RETURN v_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Resultado: status = 'valid' | 'invalid' | 'locked' | 'not_found'
+CREATE OR REPLACE FUNCTION verify_verification_code(
+    p_user_id UUID,
+    p_code    VARCHAR
+)
+RETURNS TABLE (
+    status             TEXT,
+    remaining_attempts INT,
+    access_token       TEXT,
+    refresh_token      TEXT
+) AS $$
+#variable_conflict use_column
+DECLARE
+    v_record verification_codes%ROWTYPE;
+BEGIN
+    -- Código más reciente no usado y no expirado; bloquea la fila hasta el commit
+    SELECT * INTO v_record
+    FROM verification_codes
+    WHERE user_id = p_user_id
+      AND used = FALSE
+      AND expires_at >= NOW()
+    ORDER BY created_at DESC
+    LIMIT 1
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found'::TEXT, 0, NULL::TEXT, NULL::TEXT;
+        RETURN;
+    END IF;
+
+    IF v_record.attempts >= v_record.max_attempts THEN
+        UPDATE verification_codes SET used = TRUE WHERE id = v_record.id;
+        RETURN QUERY SELECT 'locked'::TEXT, 0, NULL::TEXT, NULL::TEXT;
+        RETURN;
+    END IF;
+
+    IF v_record.code IS DISTINCT FROM p_code THEN
+        UPDATE verification_codes SET attempts = attempts + 1 WHERE id = v_record.id;
+        RETURN QUERY SELECT
+            'invalid'::TEXT,
+            v_record.max_attempts - v_record.attempts - 1,
+            NULL::TEXT,
+            NULL::TEXT;
+        RETURN;
+    END IF;
+
+    UPDATE verification_codes
+    SET attempts = attempts + 1, used = TRUE
+    WHERE id = v_record.id;
+
+    RETURN QUERY SELECT
+        'valid'::TEXT,
+        v_record.max_attempts - v_record.attempts - 1,
+        v_record.access_token,
+        v_record.refresh_token;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE ALL ON FUNCTION store_verification_code(UUID, VARCHAR, VARCHAR, TEXT, TEXT, INT, INT) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION store_verification_code(UUID, VARCHAR, VARCHAR, TEXT, TEXT, INT, INT) TO authenticated, service_role;
+
+REVOKE ALL ON FUNCTION verify_verification_code(UUID, VARCHAR) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION verify_verification_code(UUID, VARCHAR) TO anon, authenticated, service_role;
+
+-- El paso de verificación ya no lee ni actualiza la tabla directamente:
+-- se retira el acceso anónimo (exponía códigos y tokens de todos los usuarios)
+DROP POLICY IF EXISTS "Anon can read verification codes" ON verification_codes;
+DROP POLICY IF EXISTS "Anon can update verification codes" ON verification_codes;
@@ -0,0 +1,24 @@
+-- ============================================
+-- CarePlus - Índices para paginación por cursor (keyset)
+-- ============================================
+-- Los listados ordenan por (timestamp DESC, id DESC) y filtran por las filas
+-- posteriores al cursor; con estos índices cada página es un recorrido acotado
+-- del índice, sin ordenar la tabla completa ni saltar filas con OFFSET.
+
+CREATE INDEX IF NOT EXISTS idx_patients_active_created_id
+    ON patients(is_active, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_consultations_date_id
+    ON consultations(consultation_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_consultations_patient_date_id
+    ON consultations(patient_id, consultation_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_diagnostics_created_id
+    ON diagnostics(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_diagnostics_patient_created_id
+    ON diagnostics(patient_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_treatments_created_id
+    ON treatments(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_treatments_patient_created_id
+    ON treatments(patient_id, created_at DESC, id DESC);
@@ -0,0 +1,85 @@
+-- ============================================
+-- CarePlus - Búsqueda de pacientes con trigramas
+-- ============================================
+-- ILIKE '%texto%' no puede usar índices btree: cada búsqueda recorría la tabla.
+-- patient_search_text() normaliza nombre + apellido + documento (minúsculas, sin
+-- acentos) y un índice GIN de trigramas sobre esa expresión resuelve similitud y
+-- subcadenas. Índice de expresión y no columna generada: una columna en patients
+-- viajaría en cada select('*') (fichas, caché de respuestas, exportaciones).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA extensions;
+
+-- unaccent() es STABLE; el envoltorio IMMUTABLE permite usarlo en índices de expresión
+CREATE OR REPLACE FUNCTION immutable_unaccent(TEXT)
+RETURNS TEXT AS $$
+    SELECT extensions.unaccent('extensions.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+CREATE OR REPLACE FUNCTION normalize_search_text(TEXT)
+RETURNS TEXT AS $$
+    SELECT lower(immutable_unaccent(trim($1)))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+CREATE OR REPLACE FUNCTION patient_search_text(p_first_name TEXT, p_last_name TEXT, p_document_number TEXT)
+RETURNS TEXT AS $$
+    SELECT normalize_search_text(p_first_name || ' ' || p_last_name || ' ' || p_document_number)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+-- Las consultas deben repetir la misma expresión para que el planner use el índice
+CREATE INDEX IF NOT EXISTS idx_patients_search_trgm
+    ON patients USING gin (
+        patient_search_text(first_name, last_name, document_number) extensions.gin_trgm_ops
+    );
+
+-- ============================================
+-- search_patients: top-N por similitud
+-- ============================================
+-- 1. Número de documento exacto: índice único (btree), sin tocar el índice GIN.
+-- 2. Si no hay coincidencia exacta: palabras similares (<%) o subcadena (LIKE),
+--    ambos resueltos con el índice de trigramas, ordenados por similitud.
+-- SECURITY INVOKER: se aplican las políticas RLS de patients.
+-- p_limit se acota a 200, el mismo máximo que settings.pagination_max_limit en la API.
+
+CREATE OR REPLACE FUNCTION search_patients(
+    p_query     TEXT,
+    p_limit     INT     DEFAULT 20,
+    p_is_active BOOLEAN DEFAULT TRUE
+)
+RETURNS SETOF patients AS $$
+DECLARE
+    v_query   TEXT := normalize_search_text(p_query);
+    v_pattern TEXT;
+BEGIN
+    IF v_query IS NULL OR v_query = '' THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT * FROM patients
+    WHERE document_number = trim(p_query) AND is_active = p_is_active;
+
+    IF FOUND THEN
+        RETURN;
+    END IF;
+
+    -- Escapar comodines de LIKE en el texto del usuario
+    v_pattern := '%' || replace(replace(replace(v_query, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+
+    RETURN QUERY
+    SELECT p.*
+    FROM patients p
+    WHERE p.is_active = p_is_active
+      AND (
+        v_query <% patient_search_text(p.first_name, p.last_name, p.document_number)
+        OR patient_search_text(p.first_name, p.last_name, p.document_number) LIKE v_pattern
+      )
+    ORDER BY
+        word_similarity(v_query, patient_search_text(p.first_name, p.last_name, p.document_number)) DESC,
+        similarity(v_query, patient_search_text(p.first_name, p.last_name, p.document_number)) DESC,
+        p.created_at DESC
+    LIMIT LEAST(GREATEST(p_limit, 1), 200);
+END;
+$$ LANGUAGE plpgsql STABLE SET search_path = public, extensions;
+
+GRANT EXECUTE ON FUNCTION search_patients(TEXT, INT, BOOLEAN) TO authenticated;
@@ -0,0 +1,17 @@
+-- ============================================
+-- CarePlus - Índice de la línea de tiempo del historial médico
+-- ============================================
+-- GET /medical-history filtra por paciente (y opcionalmente tipo de evento / rango
+-- de fechas) y pagina por cursor sobre (event_date DESC, id DESC). Con este índice
+-- cada página es un recorrido acotado del índice aunque el paciente tenga miles de
+-- eventos; el rango de fechas se resuelve sobre la misma clave.
+
+CREATE INDEX IF NOT EXISTS idx_medical_history_patient_date_id
+    ON medical_history(patient_id, event_date DESC, id DESC);
+
+-- Línea de tiempo global (sin filtro de paciente)
+CREATE INDEX IF NOT EXISTS idx_medical_history_date_id
+    ON medical_history(event_date DESC, id DESC);
+
+-- El índice compuesto cubre las búsquedas por patient_id (prefijo)
+DROP INDEX IF EXISTS idx_medical_history_patient;
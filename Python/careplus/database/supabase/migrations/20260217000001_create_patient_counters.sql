@@ -0,0 +1,189 @@
+-- ============================================
+-- CarePlus - Contadores por paciente para v_patient_summary
+-- ============================================
+-- v_patient_summary hacía LEFT JOIN de consultations, diagnostics y treatments a la
+-- vez y contaba con COUNT(DISTINCT): antes de agrupar se generaban
+-- consultas × diagnósticos × tratamientos filas por paciente (un paciente crónico
+-- con 300 × 100 × 200 registros producía 6M de filas intermedias).
+--
+-- patient_counters guarda los totales y se mantiene con triggers por sentencia
+-- (tablas de transición): un INSERT masivo actualiza cada paciente una sola vez.
+-- reconcile_patient_counters() recalcula los totales y corrige cualquier desvío
+-- (TRUNCATE, triggers deshabilitados, restauraciones parciales...); la API la
+-- ejecuta una vez al día y publica el resultado en /metrics/patient-counters.
+
+CREATE TABLE IF NOT EXISTS patient_counters (
+    patient_id          UUID        PRIMARY KEY REFERENCES patients(id) ON DELETE CASCADE,
+    total_consultations BIGINT      NOT NULL DEFAULT 0,
+    total_diagnostics   BIGINT      NOT NULL DEFAULT 0,
+    total_treatments    BIGINT      NOT NULL DEFAULT 0,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE patient_counters ENABLE ROW LEVEL SECURITY;
+
+-- Solo lectura para usuarios; las escrituras las hacen los triggers (SECURITY DEFINER)
+DROP POLICY IF EXISTS "Authenticated users can read patient_counters" ON patient_counters;
+CREATE POLICY "Authenticated users can read patient_counters"
+    ON patient_counters FOR SELECT TO authenticated USING (true);
+
+-- ============================================
+-- Trigger: aplica el delta de la sentencia al contador TG_ARGV[0]
+-- ============================================
+CREATE OR REPLACE FUNCTION bump_patient_counters()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_column TEXT := TG_ARGV[0];
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        EXECUTE format(
+            'UPDATE patient_counters pc
+                SET %1$I = pc.%1$I - o.n, updated_at = NOW()
+               FROM (SELECT patient_id, COUNT(*) AS n FROM old_rows GROUP BY patient_id) o
+              WHERE pc.patient_id = o.patient_id',
+            v_column
+        );
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        -- JOIN patients: ignora pacientes borrados en la misma sentencia (cascada)
+        EXECUTE format(
+            'INSERT INTO patient_counters AS pc (patient_id, %1$I)
+             SELECT n.patient_id, COUNT(*)
+               FROM new_rows n
+               JOIN patients p ON p.id = n.patient_id
+              GROUP BY n.patient_id
+             ON CONFLICT (patient_id) DO UPDATE
+                SET %1$I = pc.%1$I + EXCLUDED.%1$I, updated_at = NOW()',
+            v_column
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Un trigger por evento: las tablas de transición no admiten varios eventos
+DO $$
+DECLARE
+    v_table   TEXT;
+    v_column  TEXT;
+BEGIN
+    FOR v_table, v_column IN
+        SELECT * FROM (VALUES
+            ('consultations', 'total_consultations'),
+            ('diagnostics',   'total_diagnostics'),
+            ('treatments',    'total_treatments')
+        ) AS t(table_name, column_name)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_counters_insert ON %1$I', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%1$s_counters_insert AFTER INSERT ON %1$I
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_patient_counters(%2$L)',
+            v_table, v_column
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_counters_delete ON %1$I', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%1$s_counters_delete AFTER DELETE ON %1$I
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_patient_counters(%2$L)',
+            v_table, v_column
+        );
+
+        -- Reasignar un registro a otro paciente
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_counters_update ON %1$I', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%1$s_counters_update AFTER UPDATE OF patient_id ON %1$I
+                REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_patient_counters(%2$L)',
+            v_table, v_column
+        );
+    END LOOP;
+END;
+$$;
+
+-- ============================================
+-- Reconciliación: recalcula los totales y corrige los desvíos
+-- ============================================
+-- Cada tabla se agrega por separado (sin el producto del JOIN). El LOCK SHARE
+-- bloquea escrituras mientras dura el recálculo para no perder deltas concurrentes.
+-- Devuelve el número de pacientes corregidos, o NULL si otra reconciliación está en
+-- curso (cada proceso de la API tiene su programador).
+
+CREATE OR REPLACE FUNCTION reconcile_patient_counters()
+RETURNS INT AS $$
+DECLARE
+    v_fixed INT;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('reconcile_patient_counters')) THEN
+        RETURN NULL;
+    END IF;
+
+    LOCK TABLE consultations, diagnostics, treatments IN SHARE MODE;
+
+    WITH actual AS (
+        SELECT
+            p.id                   AS patient_id,
+            COALESCE(c.n, 0)       AS total_consultations,
+            COALESCE(d.n, 0)       AS total_diagnostics,
+            COALESCE(t.n, 0)       AS total_treatments
+        FROM patients p
+        LEFT JOIN (SELECT patient_id, COUNT(*) AS n FROM consultations GROUP BY patient_id) c ON c.patient_id = p.id
+        LEFT JOIN (SELECT patient_id, COUNT(*) AS n FROM diagnostics   GROUP BY patient_id) d ON d.patient_id = p.id
+        LEFT JOIN (SELECT patient_id, COUNT(*) AS n FROM treatments    GROUP BY patient_id) t ON t.patient_id = p.id
+    ),
+    fixed AS (
+        INSERT INTO patient_counters AS pc (patient_id, total_consultations, total_diagnostics, total_treatments)
+        SELECT a.patient_id, a.total_consultations, a.total_diagnostics, a.total_treatments
+        FROM actual a
+        LEFT JOIN patient_counters cur ON cur.patient_id = a.patient_id
+        WHERE (COALESCE(cur.total_consultations, 0), COALESCE(cur.total_diagnostics, 0), COALESCE(cur.total_treatments, 0))
+              IS DISTINCT FROM (a.total_consultations, a.total_diagnostics, a.total_treatments)
+        ON CONFLICT (patient_id) DO UPDATE
+            SET total_consultations = EXCLUDED.total_consultations,
+                total_diagnostics   = EXCLUDED.total_diagnostics,
+                total_treatments    = EXCLUDED.total_treatments,
+                updated_at          = NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO v_fixed FROM fixed;
+
+    RETURN v_fixed;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION reconcile_patient_counters() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reconcile_patient_counters() TO service_role;
+
+-- Carga inicial; la reconciliación diaria la programa la API
+-- (PatientCountersReconciler, PATIENT_COUNTERS_RECONCILE_AT)
+SELECT reconcile_patient_counters();
+
+-- ============================================
+-- Vista: Resumen de pacientes (mismas columnas, sin el JOIN en abanico)
+-- ============================================
+CREATE OR REPLACE VIEW v_patient_summary AS
+SELECT
+    p.id              AS patient_id,
+    p.first_name,
+    p.last_name,
+    p.first_name || ' ' || p.last_name AS full_name,
+    p.document_type,
+    p.document_number,
+    p.email,
+    p.phone,
+    p.city,
+    p.blood_type,
+    p.allergies,
+    p.date_of_birth,
+    EXTRACT(YEAR FROM AGE(p.date_of_birth))::INT AS age,
+    p.gender,
+    p.is_active,
+    p.created_at,
+    COALESCE(pc.total_consultations, 0) AS total_consultations,
+    COALESCE(pc.total_diagnostics, 0)   AS total_diagnostics,
+    COALESCE(pc.total_treatments, 0)    AS total_treatments
+FROM patients p
+LEFT JOIN patient_counters pc ON pc.patient_id = p.id;
@@ -0,0 +1,87 @@
+-- ============================================
+-- CarePlus - Marca de última modificación por tabla (GET condicionales)
+-- ============================================
+-- Los listados responden Last-Modified / ETag a partir de table_watermark(tabla) y
+-- contestan 304 si no cambió nada. La marca es la mayor de:
+--
+--   max(updated_at)   altas y modificaciones, incluidas las bajas lógicas
+--                     (is_active = false); lectura del extremo del índice de updated_at
+--   max(deleted_at)   de table_deletes: una fila por sentencia DELETE/TRUNCATE, que
+--                     max(updated_at) no puede ver
+--
+-- No hay una fila compartida por tabla: las escrituras solo agregan filas (los
+-- DELETE), así que los escritores concurrentes no se esperan entre sí. updated_at es
+-- el inicio de la transacción: una transacción larga que confirma después de una
+-- lectura puede dejar una marca anterior a ella; las escrituras por la API además
+-- invalidan la marca cacheada (caché de respuestas).
+
+CREATE INDEX IF NOT EXISTS idx_patients_updated_at        ON patients(updated_at);
+CREATE INDEX IF NOT EXISTS idx_consultations_updated_at   ON consultations(updated_at);
+CREATE INDEX IF NOT EXISTS idx_diagnostics_updated_at     ON diagnostics(updated_at);
+CREATE INDEX IF NOT EXISTS idx_treatments_updated_at      ON treatments(updated_at);
+CREATE INDEX IF NOT EXISTS idx_medical_history_updated_at ON medical_history(updated_at);
+
+CREATE TABLE IF NOT EXISTS table_deletes (
+    id          BIGINT      GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    table_name  TEXT        NOT NULL,
+    deleted_at  TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX IF NOT EXISTS idx_table_deletes_table_deleted
+    ON table_deletes(table_name, deleted_at DESC);
+
+ALTER TABLE table_deletes ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Authenticated users can read table_deletes" ON table_deletes;
+CREATE POLICY "Authenticated users can read table_deletes"
+    ON table_deletes FOR SELECT TO authenticated USING (true);
+
+CREATE OR REPLACE FUNCTION log_table_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO table_deletes (table_name) VALUES (TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY['patients', 'consultations', 'diagnostics', 'treatments', 'medical_history']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_table_deletes ON %1$I', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%1$s_table_deletes
+                AFTER DELETE OR TRUNCATE ON %1$I
+                FOR EACH STATEMENT EXECUTE FUNCTION log_table_delete()',
+            v_table
+        );
+    END LOOP;
+END;
+$$;
+
+-- ============================================
+-- Marca de un listado
+-- ============================================
+-- SECURITY INVOKER: max(updated_at) se calcula sobre las filas que el usuario ve (RLS)
+
+CREATE OR REPLACE FUNCTION table_watermark(p_table TEXT)
+RETURNS TIMESTAMPTZ AS $$
+DECLARE
+    v_updated   TIMESTAMPTZ;
+    v_deleted   TIMESTAMPTZ;
+BEGIN
+    IF p_table NOT IN ('patients', 'consultations', 'diagnostics', 'treatments', 'medical_history') THEN
+        RAISE EXCEPTION 'table_watermark: tabla no soportada %', p_table USING ERRCODE = '22023';
+    END IF;
+
+    EXECUTE format('SELECT max(updated_at) FROM %I', p_table) INTO v_updated;
+    SELECT max(deleted_at) INTO v_deleted FROM table_deletes WHERE table_name = p_table;
+
+    -- GREATEST ignora los NULL (tabla vacía o sin borrados)
+    RETURN GREATEST(v_updated, v_deleted);
+END;
+$$ LANGUAGE plpgsql STABLE SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION table_watermark(TEXT) TO authenticated;
@@ -0,0 +1,365 @@
+-- ============================================
+-- CarePlus - Rollups del dashboard (/stats)
+-- ============================================
+-- Los endpoints /stats leen tablas de agregados ya calculados y nunca agregan las
+-- tablas clínicas en la petición.
+--
+-- refresh_dashboard_stats() (lo ejecuta el programador de la API) es incremental:
+-- solo recalcula los días con filas modificadas desde la última marca (updated_at)
+-- y los días marcados por los triggers de DELETE / cambio de fecha, que updated_at
+-- no puede ver. Cada día afectado se recalcula completo, así el resultado no depende
+-- de cuántas veces se procese una fila.
+--
+-- Los días son fechas UTC (las funciones fijan timezone = UTC).
+
+CREATE TABLE IF NOT EXISTS stats_consultations_daily (
+    day             DATE        NOT NULL,
+    status          VARCHAR(30) NOT NULL,
+    doctor_id       UUID,                       -- consultations.created_by
+    consultations   BIGINT      NOT NULL,
+    UNIQUE NULLS NOT DISTINCT (day, status, doctor_id)
+);
+
+CREATE TABLE IF NOT EXISTS stats_diagnoses_daily (
+    day             DATE        NOT NULL,       -- diagnostics.diagnosis_date
+    severity        VARCHAR(20) NOT NULL,
+    diagnosis_type  VARCHAR(30) NOT NULL,
+    diagnoses       BIGINT      NOT NULL,
+    PRIMARY KEY (day, severity, diagnosis_type)
+);
+
+-- Estado actual (no es una serie temporal): se recalcula entero si hubo cambios
+CREATE TABLE IF NOT EXISTS stats_active_treatments (
+    treatment_type      VARCHAR(30) PRIMARY KEY,
+    active_treatments   BIGINT      NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stats_new_patients_daily (
+    day             DATE        NOT NULL,       -- patients.created_at
+    city            VARCHAR(100),
+    new_patients    BIGINT      NOT NULL,
+    UNIQUE NULLS NOT DISTINCT (day, city)
+);
+
+-- Días que dejaron de tener filas (DELETE) o de los que salió una fila (cambio de fecha)
+CREATE TABLE IF NOT EXISTS stats_dirty_days (
+    source  TEXT NOT NULL,
+    day     DATE NOT NULL,
+    PRIMARY KEY (source, day)
+);
+
+CREATE TABLE IF NOT EXISTS stats_watermarks (
+    source          TEXT        PRIMARY KEY,
+    watermark       TIMESTAMPTZ NOT NULL DEFAULT '-infinity',
+    refreshed_at    TIMESTAMPTZ
+);
+
+INSERT INTO stats_watermarks (source)
+VALUES ('consultations'), ('diagnostics'), ('treatments'), ('patients')
+ON CONFLICT DO NOTHING;
+
+-- La búsqueda de filas modificadas desde la marca usa idx_<tabla>_updated_at
+-- (20260218000001)
+-- Recálculo por día
+CREATE INDEX IF NOT EXISTS idx_diagnostics_date         ON diagnostics(diagnosis_date);
+
+ALTER TABLE stats_consultations_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE stats_diagnoses_daily     ENABLE ROW LEVEL SECURITY;
+ALTER TABLE stats_active_treatments   ENABLE ROW LEVEL SECURITY;
+ALTER TABLE stats_new_patients_daily  ENABLE ROW LEVEL SECURITY;
+ALTER TABLE stats_dirty_days          ENABLE ROW LEVEL SECURITY;
+ALTER TABLE stats_watermarks          ENABLE ROW LEVEL SECURITY;
+
+-- Solo lectura para usuarios; escriben los triggers y refresh_dashboard_stats (SECURITY DEFINER).
+-- stats_dirty_days no tiene políticas: es interna
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY[
+        'stats_consultations_daily', 'stats_diagnoses_daily', 'stats_active_treatments',
+        'stats_new_patients_daily', 'stats_watermarks'
+    ]
+    LOOP
+        EXECUTE format('DROP POLICY IF EXISTS "Authenticated users can read %1$s" ON %1$I', v_table);
+        EXECUTE format(
+            'CREATE POLICY "Authenticated users can read %1$s" ON %1$I FOR SELECT TO authenticated USING (true)',
+            v_table
+        );
+    END LOOP;
+END;
+$$;
+
+-- ============================================
+-- Trigger: marca los días anteriores de las filas borradas o movidas de día
+-- ============================================
+CREATE OR REPLACE FUNCTION mark_stats_dirty_days()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'consultations' THEN
+        INSERT INTO stats_dirty_days (source, day)
+        SELECT DISTINCT 'consultations', consultation_date::date FROM old_rows
+        ON CONFLICT DO NOTHING;
+    ELSIF TG_TABLE_NAME = 'diagnostics' THEN
+        INSERT INTO stats_dirty_days (source, day)
+        SELECT DISTINCT 'diagnostics', diagnosis_date FROM old_rows
+        ON CONFLICT DO NOTHING;
+    ELSIF TG_TABLE_NAME = 'patients' THEN
+        INSERT INTO stats_dirty_days (source, day)
+        SELECT DISTINCT 'patients', created_at::date FROM old_rows
+        ON CONFLICT DO NOTHING;
+    ELSE
+        -- treatments: basta con saber que hubo borrados
+        INSERT INTO stats_dirty_days (source, day)
+        VALUES ('treatments', CURRENT_DATE)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public SET timezone = 'UTC';
+
+-- Un trigger por evento: las tablas de transición no admiten varios eventos.
+-- Los UPDATE que no cambian el día los detecta updated_at
+DO $$
+DECLARE
+    v_table       TEXT;
+    v_day_column  TEXT;
+BEGIN
+    FOR v_table, v_day_column IN
+        SELECT * FROM (VALUES
+            ('consultations', 'consultation_date'),
+            ('diagnostics',   'diagnosis_date'),
+            ('treatments',    NULL),
+            ('patients',      'created_at')
+        ) AS t(table_name, day_column)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_stats_delete ON %1$I', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%1$s_stats_delete AFTER DELETE ON %1$I
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION mark_stats_dirty_days()',
+            v_table
+        );
+
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_stats_update ON %1$I', v_table);
+        IF v_day_column IS NOT NULL THEN
+            EXECUTE format(
+                'CREATE TRIGGER trg_%1$s_stats_update AFTER UPDATE OF %2$I ON %1$I
+                    REFERENCING OLD TABLE AS old_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION mark_stats_dirty_days()',
+                v_table, v_day_column
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- ============================================
+-- Refresco incremental
+-- ============================================
+-- p_lookback: margen sobre la marca para las transacciones que confirman después
+-- de iniciado el refresco anterior con un updated_at anterior a él.
+-- p_full: recalcula todo (reconstrucción diaria).
+-- Devuelve los días recalculados por fuente, o NULL si otro refresco está en curso.
+
+CREATE OR REPLACE FUNCTION refresh_dashboard_stats(
+    p_lookback  INTERVAL DEFAULT INTERVAL '5 minutes',
+    p_full      BOOLEAN  DEFAULT FALSE
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_started   TIMESTAMPTZ := now();
+    v_since     TIMESTAMPTZ;
+    v_days      DATE[];
+    v_dirty     INT;
+    v_result    JSONB := '{}';
+BEGIN
+    -- Un solo refresco a la vez: cada proceso de la API tiene su programador
+    IF NOT pg_try_advisory_xact_lock(hashtext('refresh_dashboard_stats')) THEN
+        RETURN NULL;
+    END IF;
+
+    -- Consultas por día, estado y médico
+    SELECT CASE WHEN p_full THEN '-infinity' ELSE watermark - p_lookback END INTO v_since
+      FROM stats_watermarks WHERE source = 'consultations';
+
+    WITH consumed AS (DELETE FROM stats_dirty_days WHERE source = 'consultations' RETURNING day)
+    SELECT COALESCE(array_agg(DISTINCT day), '{}') INTO v_days FROM (
+        SELECT day FROM consumed
+        UNION
+        SELECT consultation_date::date FROM consultations WHERE updated_at > v_since
+    ) d;
+
+    DELETE FROM stats_consultations_daily
+     WHERE day = ANY (v_days) OR (p_full AND day IS NOT NULL);
+    INSERT INTO stats_consultations_daily (day, status, doctor_id, consultations)
+    SELECT c.consultation_date::date, c.status, c.created_by, COUNT(*)
+      FROM unnest(v_days) AS d(day)
+      JOIN consultations c ON c.consultation_date >= d.day AND c.consultation_date < d.day + 1
+     GROUP BY 1, 2, 3;
+
+    UPDATE stats_watermarks SET watermark = v_started, refreshed_at = clock_timestamp()
+     WHERE source = 'consultations';
+    v_result := v_result || jsonb_build_object('consultations', cardinality(v_days));
+
+    -- Diagnósticos por día, severidad y tipo
+    SELECT CASE WHEN p_full THEN '-infinity' ELSE watermark - p_lookback END INTO v_since
+      FROM stats_watermarks WHERE source = 'diagnostics';
+
+    WITH consumed AS (DELETE FROM stats_dirty_days WHERE source = 'diagnostics' RETURNING day)
+    SELECT COALESCE(array_agg(DISTINCT day), '{}') INTO v_days FROM (
+        SELECT day FROM consumed
+        UNION
+        SELECT diagnosis_date FROM diagnostics WHERE updated_at > v_since
+    ) d;
+
+    DELETE FROM stats_diagnoses_daily
+     WHERE day = ANY (v_days) OR (p_full AND day IS NOT NULL);
+    INSERT INTO stats_diagnoses_daily (day, severity, diagnosis_type, diagnoses)
+    SELECT g.diagnosis_date, g.severity, g.diagnosis_type, COUNT(*)
+      FROM diagnostics g
+     WHERE g.diagnosis_date = ANY (v_days)
+     GROUP BY 1, 2, 3;
+
+    UPDATE stats_watermarks SET watermark = v_started, refreshed_at = clock_timestamp()
+     WHERE source = 'diagnostics';
+    v_result := v_result || jsonb_build_object('diagnostics', cardinality(v_days));
+
+    -- Tratamientos activos por tipo (recuento completo si hubo cualquier cambio)
+    SELECT CASE WHEN p_full THEN '-infinity' ELSE watermark - p_lookback END INTO v_since
+      FROM stats_watermarks WHERE source = 'treatments';
+
+    WITH consumed AS (DELETE FROM stats_dirty_days WHERE source = 'treatments' RETURNING 1)
+    SELECT COUNT(*) INTO v_dirty FROM consumed;
+
+    IF v_dirty > 0 OR EXISTS (SELECT 1 FROM treatments WHERE updated_at > v_since) THEN
+        DELETE FROM stats_active_treatments WHERE treatment_type IS NOT NULL;
+        INSERT INTO stats_active_treatments (treatment_type, active_treatments)
+        SELECT treatment_type, COUNT(*)
+          FROM treatments
+         WHERE status = 'activo'
+         GROUP BY treatment_type;
+        v_result := v_result || jsonb_build_object('treatments', 1);
+    ELSE
+        v_result := v_result || jsonb_build_object('treatments', 0);
+    END IF;
+
+    UPDATE stats_watermarks SET watermark = v_started, refreshed_at = clock_timestamp()
+     WHERE source = 'treatments';
+
+    -- Pacientes nuevos por día y ciudad
+    SELECT CASE WHEN p_full THEN '-infinity' ELSE watermark - p_lookback END INTO v_since
+      FROM stats_watermarks WHERE source = 'patients';
+
+    WITH consumed AS (DELETE FROM stats_dirty_days WHERE source = 'patients' RETURNING day)
+    SELECT COALESCE(array_agg(DISTINCT day), '{}') INTO v_days FROM (
+        SELECT day FROM consumed
+        UNION
+        SELECT created_at::date FROM patients WHERE updated_at > v_since
+    ) d;
+
+    DELETE FROM stats_new_patients_daily
+     WHERE day = ANY (v_days) OR (p_full AND day IS NOT NULL);
+    INSERT INTO stats_new_patients_daily (day, city, new_patients)
+    SELECT p.created_at::date, p.city, COUNT(*)
+      FROM unnest(v_days) AS d(day)
+      JOIN patients p ON p.created_at >= d.day AND p.created_at < d.day + 1
+     GROUP BY 1, 2;
+
+    UPDATE stats_watermarks SET watermark = v_started, refreshed_at = clock_timestamp()
+     WHERE source = 'patients';
+    v_result := v_result || jsonb_build_object('patients', cardinality(v_days));
+
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public SET timezone = 'UTC';
+
+REVOKE EXECUTE ON FUNCTION refresh_dashboard_stats(INTERVAL, BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_dashboard_stats(INTERVAL, BOOLEAN) TO service_role;
+
+-- Carga inicial
+SELECT refresh_dashboard_stats(p_full => TRUE);
+
+-- ============================================
+-- Lectura: cada sección del dashboard en una llamada
+-- ============================================
+-- Suman filas de los rollups (a lo sumo días × categorías), con RLS del llamante.
+
+CREATE OR REPLACE FUNCTION dashboard_consultations(p_from DATE, p_to DATE)
+RETURNS JSONB AS $$
+    WITH rows AS (
+        SELECT * FROM stats_consultations_daily WHERE day BETWEEN p_from AND p_to
+    )
+    SELECT jsonb_build_object(
+        'total', (SELECT COALESCE(SUM(consultations), 0) FROM rows),
+        'by_day', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object('day', day, 'count', n) ORDER BY day), '[]')
+              FROM (SELECT day, SUM(consultations) AS n FROM rows GROUP BY day) s
+        ),
+        'by_status', (
+            SELECT COALESCE(jsonb_object_agg(status, n), '{}')
+              FROM (SELECT status, SUM(consultations) AS n FROM rows GROUP BY status) s
+        ),
+        'by_doctor', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object('doctor_id', doctor_id, 'consultations', n) ORDER BY n DESC), '[]')
+              FROM (SELECT doctor_id, SUM(consultations) AS n FROM rows GROUP BY doctor_id) s
+        ),
+        'refreshed_at', (SELECT refreshed_at FROM stats_watermarks WHERE source = 'consultations')
+    );
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+CREATE OR REPLACE FUNCTION dashboard_diagnoses(p_from DATE, p_to DATE)
+RETURNS JSONB AS $$
+    WITH rows AS (
+        SELECT * FROM stats_diagnoses_daily WHERE day BETWEEN p_from AND p_to
+    )
+    SELECT jsonb_build_object(
+        'total', (SELECT COALESCE(SUM(diagnoses), 0) FROM rows),
+        'by_severity', (
+            SELECT COALESCE(jsonb_object_agg(severity, n), '{}')
+              FROM (SELECT severity, SUM(diagnoses) AS n FROM rows GROUP BY severity) s
+        ),
+        'by_type', (
+            SELECT COALESCE(jsonb_object_agg(diagnosis_type, n), '{}')
+              FROM (SELECT diagnosis_type, SUM(diagnoses) AS n FROM rows GROUP BY diagnosis_type) s
+        ),
+        'refreshed_at', (SELECT refreshed_at FROM stats_watermarks WHERE source = 'diagnostics')
+    );
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+CREATE OR REPLACE FUNCTION dashboard_treatments()
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'total', (SELECT COALESCE(SUM(active_treatments), 0) FROM stats_active_treatments),
+        'by_type', (
+            SELECT COALESCE(jsonb_object_agg(treatment_type, active_treatments), '{}')
+              FROM stats_active_treatments
+        ),
+        'refreshed_at', (SELECT refreshed_at FROM stats_watermarks WHERE source = 'treatments')
+    );
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+CREATE OR REPLACE FUNCTION dashboard_patients(p_from DATE, p_to DATE)
+RETURNS JSONB AS $$
+    WITH rows AS (
+        SELECT * FROM stats_new_patients_daily WHERE day BETWEEN p_from AND p_to
+    )
+    SELECT jsonb_build_object(
+        'total', (SELECT COALESCE(SUM(new_patients), 0) FROM rows),
+        'by_day', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object('day', day, 'count', n) ORDER BY day), '[]')
+              FROM (SELECT day, SUM(new_patients) AS n FROM rows GROUP BY day) s
+        ),
+        'by_city', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object('city', city, 'new_patients', n) ORDER BY n DESC), '[]')
+              FROM (SELECT city, SUM(new_patients) AS n FROM rows GROUP BY city) s
+        ),
+        'refreshed_at', (SELECT refreshed_at FROM stats_watermarks WHERE source = 'patients')
+    );
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION dashboard_consultations(DATE, DATE) TO authenticated;
+GRANT EXECUTE ON FUNCTION dashboard_diagnoses(DATE, DATE)     TO authenticated;
+GRANT EXECUTE ON FUNCTION dashboard_treatments()              TO authenticated;
+GRANT EXECUTE ON FUNCTION dashboard_patients(DATE, DATE)      TO authenticated;
@@ -0,0 +1,45 @@
+-- ============================================
+-- CarePlus - Índices según la forma de las consultas
+-- ============================================
+-- Completa los índices de paginación (20260214000001) con las formas que todavía
+-- se resolvían con un índice de una columna más un filtro o un ordenamiento:
+--
+--   GET /consultations?status=...      status = $1 ORDER BY consultation_date DESC, id DESC
+--   GET /treatments?status=...         status = $1 ORDER BY created_at DESC, id DESC
+--   verify_verification_code()         user_id = $1 AND used = FALSE AND expires_at >= NOW()
+--                                      ORDER BY created_at DESC LIMIT 1
+--   refresh_dashboard_stats()          treatments WHERE status = 'activo' GROUP BY treatment_type
+--
+-- Los filtros que llegan por PostgREST son parámetros: con un plan genérico el
+-- planificador no puede usar un índice parcial cuyo predicado depende del valor,
+-- así que para ellos el estado va como primera columna. Los índices parciales quedan
+-- para los predicados literales de las funciones SQL.
+--
+-- Las formas patients(is_active, created_at), consultations(patient_id [, status],
+-- consultation_date) y diagnostics(patient_id, created_at) ya las cubren los índices
+-- compuestos de paginación (el estado por paciente se filtra sobre pocas filas).
+-- La suite src/database/test_query_plans.py verifica todas con EXPLAIN.
+
+CREATE INDEX IF NOT EXISTS idx_consultations_status_date_id
+    ON consultations(status, consultation_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_treatments_status_created_id
+    ON treatments(status, created_at DESC, id DESC);
+
+-- Recuento de tratamientos activos por tipo (solo lee el índice)
+CREATE INDEX IF NOT EXISTS idx_treatments_active_type
+    ON treatments(treatment_type)
+    WHERE status = 'activo';
+
+-- Código vigente del usuario: solo los no usados (una fracción mínima de la tabla)
+CREATE INDEX IF NOT EXISTS idx_verification_codes_pending
+    ON verification_codes(user_id, created_at DESC)
+    WHERE used = FALSE;
+
+-- Índices de una columna que ya son prefijo de un índice compuesto: solo costaban
+-- escrituras. Se conserva idx_verification_codes_user_id (ON DELETE CASCADE desde
+-- auth.users necesita todas las filas del usuario, no solo las pendientes).
+DROP INDEX IF EXISTS idx_consultations_patient;      -- idx_consultations_patient_date_id
+DROP INDEX IF EXISTS idx_consultations_date;         -- idx_consultations_date_id
+DROP INDEX IF EXISTS idx_diagnostics_patient;        -- idx_diagnostics_patient_created_id
+DROP INDEX IF EXISTS idx_treatments_patient;         -- idx_treatments_patient_created_id
@@ -0,0 +1,81 @@
+-- ============================================
+-- CarePlus - Purga programada de verification_codes
+-- ============================================
+-- trg_cleanup_verification_codes borraba los códigos usados o expirados después de
+-- cada INSERT: un recorrido de toda la tabla (no hay índice sobre used) y bloqueos
+-- compartidos entre logins concurrentes. La limpieza pasa a un trabajo de la API
+-- que llama a purge_verification_codes() en lotes acotados; el INSERT del login ya
+-- no depende del tamaño de la tabla.
+--
+-- Las búsquedas del código vigente usan idx_verification_codes_pending
+-- (user_id, created_at DESC) WHERE used = FALSE (20260220000001); la vigencia
+-- (expires_at >= NOW()) no puede ir en el predicado de un índice (NOW() no es
+-- inmutable) y se filtra sobre las pocas filas pendientes del usuario.
+
+DROP TRIGGER IF EXISTS trg_cleanup_verification_codes ON verification_codes;
+DROP FUNCTION IF EXISTS cleanup_expired_verification_codes();
+
+-- Códigos ya usados, los primeros en purgarse (guardan los tokens de la sesión)
+CREATE INDEX IF NOT EXISTS idx_verification_codes_used
+    ON verification_codes(created_at)
+    WHERE used = TRUE;
+
+-- ============================================
+-- Registro de ejecuciones de las purgas
+-- ============================================
+CREATE TABLE IF NOT EXISTS purge_runs (
+    id          BIGINT      GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    job         TEXT        NOT NULL,
+    started_at  TIMESTAMPTZ NOT NULL,
+    finished_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    deleted     INT         NOT NULL,
+    batches     INT         NOT NULL,
+    error       TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_purge_runs_job_started
+    ON purge_runs(job, started_at DESC);
+
+-- Solo service_role (sin políticas)
+ALTER TABLE purge_runs ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- Un lote de la purga
+-- ============================================
+-- Borra hasta p_batch_size códigos usados o expirados y devuelve cuántos. Cada
+-- llamada es una transacción corta; la API repite mientras el lote salga lleno.
+-- SKIP LOCKED: las filas que un verify_verification_code() tiene bloqueadas quedan
+-- para el siguiente lote en lugar de esperar.
+
+CREATE OR REPLACE FUNCTION purge_verification_codes(p_batch_size INT DEFAULT 1000)
+RETURNS INT AS $$
+DECLARE
+    v_used      INT;
+    v_expired   INT;
+BEGIN
+    DELETE FROM verification_codes
+     WHERE id IN (
+        SELECT id FROM verification_codes
+         WHERE used = TRUE
+         ORDER BY created_at
+         LIMIT p_batch_size
+           FOR UPDATE SKIP LOCKED
+     );
+    GET DIAGNOSTICS v_used = ROW_COUNT;
+
+    DELETE FROM verification_codes
+     WHERE id IN (
+        SELECT id FROM verification_codes
+         WHERE expires_at < NOW()
+         ORDER BY expires_at
+         LIMIT GREATEST(p_batch_size - v_used, 0)
+           FOR UPDATE SKIP LOCKED
+     );
+    GET DIAGNOSTICS v_expired = ROW_COUNT;
+
+    RETURN v_used + v_expired;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION purge_verification_codes(INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION purge_verification_codes(INT) TO service_role;
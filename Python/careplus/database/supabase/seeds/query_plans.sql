@@ -0,0 +1,114 @@
+-- ============================================
+-- CarePlus - Volumen para la suite de planes de consulta (solo local)
+-- ============================================
+-- back/src/database/test_query_plans.py ejecuta las consultas reales de los routers
+-- pidiendo a PostgREST el plan (Accept: application/vnd.pgrst.plan+json) y falla
+-- si alguna vuelve a un Seq Scan. Este archivo solo se carga con `supabase db reset`.
+
+-- EXPLAIN por la API (desactivado en producción)
+ALTER ROLE authenticator SET pgrst.db_plan_enabled TO 'true';
+NOTIFY pgrst, 'reload config';
+
+-- Borra el volumen sintético (pacientes PLAN-* y usuarios plan-*@careplus.test)
+CREATE OR REPLACE FUNCTION query_plans_cleanup()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM patients WHERE document_number LIKE 'PLAN-%';
+    DELETE FROM auth.users WHERE email LIKE 'plan-%@careplus.test';
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Genera el volumen una vez (se reutiliza entre ejecuciones) y actualiza las
+-- estadísticas del planificador. Devuelve un paciente y un usuario de muestra.
+CREATE OR REPLACE FUNCTION query_plans_seed(p_patients INT DEFAULT 20000, p_users INT DEFAULT 1000)
+RETURNS JSONB AS $$
+DECLARE
+    v_existing INT;
+BEGIN
+    SELECT COUNT(*) INTO v_existing FROM patients WHERE document_number LIKE 'PLAN-%';
+
+    IF v_existing <> p_patients THEN
+        PERFORM query_plans_cleanup();
+
+        -- 2% inactivos
+        INSERT INTO patients (first_name, last_name, date_of_birth, gender, document_number, city, created_at, is_active)
+        SELECT 'Paciente', 'Plan ' || i,
+               DATE '1940-01-01' + (i % 25000),
+               (ARRAY['masculino', 'femenino', 'otro'])[1 + i % 3],
+               'PLAN-' || i,
+               (ARRAY['Santo Domingo', 'Santiago', 'La Romana', 'Punta Cana'])[1 + i % 4],
+               NOW() - make_interval(mins => i),
+               i % 50 <> 0
+          FROM generate_series(1, p_patients) AS i;
+
+        -- 5 consultas por paciente: 1% en curso, 5% canceladas, 10% programadas
+        INSERT INTO consultations (patient_id, consultation_date, reason, status)
+        SELECT p.id, p.created_at - make_interval(days => k * 30), 'Control',
+               CASE
+                   WHEN h < 1 THEN 'en_curso'
+                   WHEN h < 6 THEN 'cancelada'
+                   WHEN h < 16 THEN 'programada'
+                   ELSE 'completada'
+               END
+          FROM patients p
+         CROSS JOIN generate_series(1, 5) AS k
+         CROSS JOIN LATERAL (SELECT abs(hashtext(p.id::text || k)) % 100 AS h) s
+         WHERE p.document_number LIKE 'PLAN-%';
+
+        INSERT INTO diagnostics (patient_id, name, severity, diagnosis_date, created_at)
+        SELECT p.id, 'Diagnóstico ' || k,
+               (ARRAY['leve', 'moderado', 'grave', 'critico'])[1 + k % 4],
+               (p.created_at - make_interval(days => k * 45))::date,
+               p.created_at - make_interval(days => k * 45)
+          FROM patients p
+         CROSS JOIN generate_series(1, 2) AS k
+         WHERE p.document_number LIKE 'PLAN-%';
+
+        -- 20% activos, 3% suspendidos
+        INSERT INTO treatments (patient_id, name, treatment_type, status, created_at)
+        SELECT p.id, 'Tratamiento ' || k,
+               (ARRAY['medicamento', 'terapia', 'cirugia', 'procedimiento', 'otro'])[1 + k % 5],
+               CASE
+                   WHEN h < 3 THEN 'suspendido'
+                   WHEN h < 23 THEN 'activo'
+                   WHEN h < 30 THEN 'cancelado'
+                   ELSE 'completado'
+               END,
+               p.created_at - make_interval(days => k * 45)
+          FROM patients p
+         CROSS JOIN generate_series(1, 2) AS k
+         CROSS JOIN LATERAL (SELECT abs(hashtext(p.id::text || 't' || k)) % 100 AS h) s
+         WHERE p.document_number LIKE 'PLAN-%';
+
+        INSERT INTO auth.users (instance_id, id, aud, role, email, created_at, updated_at)
+        SELECT '00000000-0000-0000-0000-000000000000', gen_random_uuid(), 'authenticated', 'authenticated',
+               'plan-' || i || '@careplus.test', NOW(), NOW()
+          FROM generate_series(1, p_users) AS i;
+
+        -- 20 códigos por usuario; solo el último queda pendiente. Se insertan vigentes y
+        -- se marcan usados después (el INSERT dispara la limpieza de usados/expirados)
+        INSERT INTO verification_codes (user_id, email, code, access_token, refresh_token, expires_at, created_at)
+        SELECT u.id, u.email, '123456', 'access', 'refresh', NOW() + INTERVAL '1 day', NOW() - make_interval(mins => k)
+          FROM auth.users u
+         CROSS JOIN generate_series(0, 19) AS k
+         WHERE u.email LIKE 'plan-%@careplus.test';
+
+        UPDATE verification_codes v SET used = TRUE
+          FROM auth.users u
+         WHERE v.user_id = u.id AND u.email LIKE 'plan-%@careplus.test'
+           AND v.created_at < NOW() - INTERVAL '30 seconds';
+    END IF;
+
+    ANALYZE patients, consultations, diagnostics, treatments, verification_codes;
+
+    RETURN jsonb_build_object(
+        'patient_id', (SELECT id FROM patients WHERE document_number = 'PLAN-1'),
+        'user_id', (SELECT id FROM auth.users WHERE email = 'plan-1@careplus.test')
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION query_plans_cleanup() FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION query_plans_seed(INT, INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION query_plans_cleanup() TO service_role;
+GRANT EXECUTE ON FUNCTION query_plans_seed(INT, INT) TO service_role;
@@ -162,10 +162,32 @@ export async function deleteUser(token: string, userId: string) {
   );
 }
 
+// ── Paginación ──
+// Los listados se paginan por cursor: se siguen todas las páginas (next_cursor)
+const PAGE_LIMIT = 200;
+
+async function fetchAllPages<T>(endpoint: string, token: string, query: Record<string, string | undefined> = {}): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_LIMIT) });
+    for (const [key, value] of Object.entries(query)) {
+      if (value) params.set(key, value);
+    }
+    if (cursor) params.set("cursor", cursor);
+
+    const page: Page<T> = await fetchAPI<Page<T>>(`${endpoint}?${params}`, { token });
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+
+  return items;
+}
+
 // ── Patients ──
 export async function getPatients(token: string, search?: string) {
-  const params = search ? `?search=${encodeURIComponent(search)}` : "";
-  return fetchAPI<Patient[]>(`/patients/${params}`, { token });
+  return fetchAllPages<Patient>("/patients/", token, { search });
 }
 
 export async function getPatient(token: string, id: string) {
@@ -186,8 +208,7 @@ export async function deletePatient(token: string, id: string) {
 
 // ── Consultations ──
 export async function getConsultations(token: string, patientId?: string) {
-  const params = patientId ? `?patient_id=${patientId}` : "";
-  return fetchAPI<Consultation[]>(`/consultations/${params}`, { token });
+  return fetchAllPages<Consultation>("/consultations/", token, { patient_id: patientId });
 }
 
 export async function getConsultation(token: string, id: string) {
@@ -208,8 +229,7 @@ export async function deleteConsultation(token: string, id: string) {
 
 // ── Diagnostics ──
 export async function getDiagnostics(token: string, patientId?: string) {
-  const params = patientId ? `?patient_id=${patientId}` : "";
-  return fetchAPI<Diagnostic[]>(`/diagnostics/${params}`, { token });
+  return fetchAllPages<Diagnostic>("/diagnostics/", token, { patient_id: patientId });
 }
 
 export async function getDiagnostic(token: string, id: string) {
@@ -230,8 +250,7 @@ export async function deleteDiagnostic(token: string, id: string) {
 
 // ── Treatments ──
 export async function getTreatments(token: string, patientId?: string) {
-  const params = patientId ? `?patient_id=${patientId}` : "";
-  return fetchAPI<Treatment[]>(`/treatments/${params}`, { token });
+  return fetchAllPages<Treatment>("/treatments/", token, { patient_id: patientId });
 }
 
 export async function getTreatment(token: string, id: string) {
@@ -251,6 +270,11 @@ export async function deleteTreatment(token: string, id: string) {
 }
 
 // ── Types ──
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface Patient {
   id: string;
   first_name: string;